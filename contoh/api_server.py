@@ -17,74 +17,526 @@ Endpoint utama:
       "characters": {...},
       "character_data": {...} | null
     }
+    Tambahkan ``?raw=0`` untuk membuang field ``raw`` (payload mentah AMF)
+    dari semua model; berlaku juga untuk endpoint lain di bawah.
+    ``?fields=characters.characters.name,character_data.character.xp``
+    (atau key ``"fields"`` di body) hanya mengirim path yang diminta; list
+    ditelusuri otomatis. Path yang tidak dikenal dijawab 400.
+
+Endpoint yang menjawab JSON juga bisa menjawab AMF3 (format biner yang
+sudah dibaca ``lib/amf/amf3.dart``): kirim ``Accept: application/x-amf``
+atau ``?format=amf3``. String dan daftar key yang berulang dikirim sekali
+lalu dirujuk, sehingga list karakter/inventory/data game jauh lebih kecil.
+
+Semua response JSON 200 membawa ``ETag``; request dengan ``If-None-Match``
+yang cocok dijawab ``304`` tanpa body. Body di atas
+``--compress-min-size`` byte dikompres gzip/deflate sesuai
+``Accept-Encoding`` dan hasil kompresinya di-cache per isi body.
+
+- POST /api/workflow/stream
+    Body sama dengan /api/workflow, tetapi hasil tiap langkah dikirim
+    begitu selesai (chunked). Default NDJSON (``application/x-ndjson``),
+    satu objek per baris: {"step": "version", "data": {...}}; kirim header
+    ``Accept: text/event-stream`` untuk format Server-Sent Events. Baris
+    terakhir adalah {"step": "done"} atau {"step": "error", ...}.
+
+- POST /api/jobs
+    Body sama dengan /api/workflow plus ``"priority"`` (int, makin besar
+    makin didahulukan). Workflow dijalankan di antrean background dan
+    server langsung menjawab 202 {"id": ..., "status": "queued", ...}.
+    Job identik (akun sama) yang masih antre/berjalan tidak diduplikasi.
+- GET /api/jobs/{id}
+    Status job; bila ``succeeded`` berisi ``"result"`` (WorkflowResult,
+    mendukung ``fields``/``raw``). Hasil disimpan ``--job-retention``
+    detik setelah selesai, setelah itu 404.
+
+- GET /api/health
+    Readiness probe. Saat start server menjalankan warm-up secara paralel
+    (unduh & parse ``library.bin``, ukur 15 asset analytics, kompres
+    payload ``Analytics.libraries``, inisialisasi codec Py3AMF/AES, dan
+    buka koneksi TCP/TLS ke server game). Selama itu endpoint ini menjawab
+    503 {"ready": false, "status": "warming"} dan request workflow
+    menunggu (``--warmup-timeout``); sesudahnya 200 dengan durasi tiap
+    langkah (``"status": "degraded"`` bila ada langkah yang gagal).
+    Matikan dengan ``--no-warmup``.
+
+- GET /api/stats
+    Statistik scheduler upstream (kedalaman antrean, waktu tunggu), cache
+    hasil workflow, cache response AMF, cache kompresi dan antrean job.
+
+Semua panggilan ke server game melewati scheduler bersama: maksimal
+``--upstream-max-in-flight`` panggilan sekaligus, ``--upstream-per-account``
+per akun, dan (opsional) ``--upstream-rate`` panggilan/detik. Antrean
+dibagi adil antar akun sehingga satu akun yang sibuk tidak memonopoli
+koneksi upstream.
+
+- GET /api/characters/{id}/history
+    Aktif dengan ``--snapshot-db``: setiap ``getCharacterData`` yang diambil
+    dari server game disimpan sebagai delta terhadap snapshot sebelumnya.
+    Query ``metrics=xp,level,gold,tp`` (juga ``ss``, ``rank``, ``prestige``,
+    ``merit``, ``pvp_points``), ``since``/``until`` (epoch detik) dan
+    ``step`` (satu titik per N detik) untuk grafik progres:
+    {"character_id", "metrics", "points": [{"t", "until", "xp", ...}]}.
+    Riwayat lebih tua dari ``--snapshot-full-days`` dipadatkan berkala ke
+    satu snapshot per ``--snapshot-resolution`` detik.
+- GET /api/characters/{id}/snapshot?at=<epoch>
+    Data karakter lengkap seperti pada waktu ``at`` (default terbaru).
+  Keduanya hanya untuk karakter milik akun yang login: akun config.json
+  untuk GET, atau ``POST`` dengan body {"username", "password"}. ID
+  karakter akun lain dijawab 404.
+
+- GET /api/events
+    Koleksi EventsService.get terakhir (seasonal, permanent, features,
+    packages) dari poller bersama: server memanggil upstream sekali tiap
+    ``--events-interval`` detik untuk semua klien (per proses pada mode
+    ``--processes``), dan workflow memakai hasil yang sama.
+- GET /api/events/stream
+    Server-Sent Events: ``event: events`` dikirim saat terhubung dan setiap
+    kali fingerprint koleksi berubah; ``id`` adalah fingerprint, jadi
+    ``EventSource`` yang tersambung ulang (``Last-Event-ID``) tidak
+    menerima data yang sama lagi. Koneksi dipegang satu thread hub, bukan
+    worker HTTP (maks. ``--events-max-subscribers``).
+
+- GET /api/character/delta?revision=<rev>
+  POST /api/character/delta  {"username", "password", "revision"}
+    Data karakter terpilih sebagai dokumen "view" (``raw`` dibuang, tiap
+    string inventory jadi objek ``{item: jumlah}``). Tanpa ``revision``
+    (atau revisi yang sudah tidak diingat) dijawab
+    {"mode": "full", "revision", "data"}; dengan revisi yang dikenal
+    {"mode": "patch", "base", "revision", "patch": [...]} berisi operasi
+    JSON Patch (RFC 6902) seperti
+    {"op": "replace", "path": "/inventory/materials/material_02", "value": 41}.
+    Simpan ``revision`` dari jawaban dan kirim lagi saat polling berikutnya.
+
+- GET /api/items, /api/skills, /api/enemies, /api/missions
+    Data game read-only dari ``sage_data/*.json`` yang dimuat sekali saat
+    start. Query: filter sama-dengan (``type=wpn,back``, ``premium=true``),
+    rentang (``min_level=10&max_level=40``), ``q`` (cari di nama),
+    ``sort`` (``-level`` untuk menurun), ``limit`` (maks 500) dan
+    ``cursor`` (``next_cursor`` dari halaman sebelumnya). Response:
+    {"table", "total", "limit", "next_cursor", "results": [...]}.
+- GET /api/items/{id} (dan tabel lain)
+    Satu record berdasarkan ``id``.
 
 Selain itu, ada endpoint ringkas:
 - GET /api/characters
     Menjalankan workflow dengan kredensial dari config.json dan hanya
     mengembalikan blok "characters" (GetAllCharactersResponse).
+
+Server melayani banyak koneksi sekaligus lewat worker pool terbatas
+(``--workers``). Koneksi yang melebihi ``--workers + --queue-limit``
+langsung dijawab 503 supaya antrean tidak menumpuk. Koneksi HTTP/1.1
+keep-alive dipertahankan sampai idle ``--keepalive-timeout`` detik; selama
+menganggur koneksi dipegang satu thread selector, bukan worker, jadi
+browser yang diam tidak menghabiskan ``--workers``. Saat dimatikan (Ctrl+C / SIGTERM) server berhenti menerima koneksi baru
+lalu menunggu workflow yang sedang berjalan selesai (``--drain-timeout``).
+
+Data turunan asset CDN (level ``library.bin``, ukuran asset analytics,
+payload ``Analytics.libraries``) disimpan di registry bersama
+(``ninja_sage.assets``): request yang bersamaan menunggu satu unduhan,
+entri diperbarui di background setelah ``--asset-ttl`` detik, dan semuanya
+dibuang bila ``cdn`` dari ``checkVersion`` berubah. ``--asset-cache-dir``
+membagi hasilnya antar proses lewat disk.
+
+Dengan ``--processes N`` server berjalan pre-fork: parent membuka socket,
+memuat data game ke satu mmap read-only, mengisi cache asset, lalu fork N
+worker yang berbagi socket tersebut (dan halaman memori datanya). Worker
+yang mati dijalankan ulang. Cache hasil dan scheduler upstream berlaku per
+proses (batas ``--upstream-*`` dibagi rata); status job dibagi lewat
+direktori spool sehingga ``GET /api/jobs/{id}`` bisa dijawab worker mana saja.
+
+``config.json`` di-parse sekali dan dibaca ulang hanya bila file berubah
+(mtime/ukuran). Client ke server game dibuat sekali dan berbagi pool
+koneksi, jadi koneksi TCP/TLS dipakai ulang antar request; kredensial dari
+body request cukup mengganti field ``credentials`` pada config yang sudah
+di-parse.
+
+Response ``SystemLogin.checkVersion``, ``EventsService.get`` dan
+``Analytics.libraries`` sama untuk semua akun, jadi di-cache di level
+client (``ninja_sage.middleware.ResponseCache``) dan dipakai ulang oleh
+workflow akun lain tanpa memakai slot upstream.
+
+Request identik untuk akun yang sama (username + hash password) digabung:
+hanya satu workflow upstream yang berjalan dan semua pemanggil menerima
+hasil yang sama. Hasilnya disimpan ``--cache-ttl`` detik, lalu masih
+dipakai selama ``--stale-ttl`` detik berikutnya sambil diperbarui di
+background (stale-while-revalidate).
 """
 
 from __future__ import annotations
 
+import argparse
+import dataclasses
+import gc
+import hashlib
 import json
-from dataclasses import asdict
+import os
+import queue
+import selectors
+import signal
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qs, urlsplit
 
-from ninja_sage import NinjaSageClient, NinjaSageWorkflow, WorkflowConfig
+from ninja_sage import Credentials, EventsService, NinjaSageClient, NinjaSageWorkflow, SessionPool, WorkflowConfig
+from ninja_sage.jobs import MAX_PRIORITY, MIN_PRIORITY, SUCCEEDED, JobQueue, QueueFullError
+from ninja_sage.character_diff import CharacterRevisions
+from ninja_sage.assets import AssetRegistry, AssetStore, default_registry, set_default_registry
+from ninja_sage.events_feed import EventsFeed, EventsSnapshot, SharedEventsFile, SseHub
+from ninja_sage.compact_encoding import AMF3_CONTENT_TYPE, JSON_CONTENT_TYPE, encode_amf3, wants_amf3
+from ninja_sage.game_data import GameData, GameDataQueryError
+from ninja_sage.http_cache import CompressedBodyCache, PrecompressedBody, body_digest, etag_matches, make_etag
+from ninja_sage.middleware import ResponseCache
+from ninja_sage.models import GetAllCharactersResponse, WorkflowResult
+from ninja_sage.scheduler import UpstreamScheduler
+from ninja_sage.projection import Projection, ProjectionError, compile_projection
+from ninja_sage.serialization import dumps_bytes
+from ninja_sage.snapshots import SnapshotStore
+from ninja_sage.workflow import WORKFLOW_STEPS
+from ninja_sage.singleflight import TTLCache
+from ninja_sage.warmup import CACHE_STEPS, Warmup, WarmupReport, warm_start
 
 
 CONFIG_PATH = "config.json"
+DEFAULT_SAGE_DATA = Path(__file__).resolve().parent.parent / "sage_data"
+
+# Cache hasil workflow per akun; dikonfigurasi ulang oleh ``run``.
+RESULT_CACHE: TTLCache[WorkflowResult] = TTLCache(ttl=5.0, stale_ttl=30.0)
+# Cache body terkompresi per digest; dikonfigurasi ulang oleh ``run``.
+BODY_CACHE = CompressedBodyCache()
+# Antrean workflow background untuk /api/jobs; dibuat ulang oleh ``run``.
+JOB_QUEUE = JobQueue()
+# Pembatas & penjadwal panggilan ke server game; dibuat ulang oleh ``run``.
+UPSTREAM_SCHEDULER = UpstreamScheduler()
+# Cache response AMF target yang sama untuk semua akun (checkVersion, events,
+# analytics), dipakai bersama oleh semua client.
+RESPONSE_CACHE = ResponseCache()
+# Tabel data game (items, skills, ...) dari sage_data; dimuat oleh ``run``.
+GAME_DATA = GameData({})
+# Data game hanya berubah saat server di-restart; klien boleh memakai
+# salinannya sebentar lalu validasi ulang lewat ETag.
+GAME_DATA_CACHE_CONTROL = "public, max-age=60"
+# Fase warm-up per proses (lihat ninja_sage.warmup); dibuat oleh ``run``.
+WARMUP: Warmup | None = None
+# Batas tunggu request workflow selama warm-up belum selesai (detik).
+WARMUP_TIMEOUT = 30.0
+# Poller EventsService.get bersama + push SSE; dibuat per proses oleh ``run``.
+EVENTS_FEED: EventsFeed | None = None
+EVENTS_HUB: SseHub | None = None
+# (interval polling detik, maks. subscriber SSE); interval 0 = nonaktif.
+EVENTS_SETTINGS = (60.0, 1000)
+# Mode pre-fork: worker 0 menulis snapshot event ke file ini, worker lain membacanya.
+EVENTS_SHARED_FILE: Path | None = None
+# Revisi getCharacterData terakhir per karakter untuk /api/character/delta.
+CHARACTER_REVISIONS = CharacterRevisions()
+# Riwayat snapshot getCharacterData (``--snapshot-db``); None = nonaktif.
+SNAPSHOTS: SnapshotStore | None = None
+# (interval, umur minimum, resolusi) kompaksi snapshot dalam detik.
+SNAPSHOT_COMPACTION = (3600.0, 7 * 86400.0, 3600.0)
+
+
+# Field config yang boleh di-override per request.
+_OVERRIDABLE = frozenset(
+  {
+    "base_url",
+    "channel",
+    "include_events",
+    "analytics_base_url",
+    "library_url",
+    "server_id",
+    "selected_character_index",
+    "character_seed",
+    "character_key",
+    "credentials",
+  }
+)
+
+
+class AppContext:
+  """State yang hidup selama server berjalan: config, pool koneksi, client.
+
+  ``config.json`` hanya di-parse ulang bila mtime/ukurannya berubah. Client
+  (thread-safe) dibuat sekali per ``base_url`` dan semuanya berbagi satu
+  :class:`SessionPool`, sehingga koneksi TCP/TLS ke server game dipakai
+  ulang antar request. Override per request cukup ``dataclasses.replace``.
+  """
+
+  def __init__(
+    self,
+    config_path: str,
+    *,
+    scheduler: UpstreamScheduler | None = None,
+    middleware: list[Any] | None = None,
+    sessions: SessionPool | None = None,
+  ) -> None:
+    self.config_path = config_path
+    self.scheduler = scheduler
+    self.middleware = list(middleware or [])
+    self.sessions = sessions or SessionPool()
+    self.reloads = 0
+    self._loaded: tuple[tuple[int, int], WorkflowConfig] | None = None
+    self._clients: dict[str, NinjaSageClient] = {}
+    self._lock = threading.Lock()
+
+  def config(self) -> WorkflowConfig:
+    stat = os.stat(self.config_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    loaded = self._loaded
+    if loaded is not None and loaded[0] == stamp:
+      return loaded[1]
+    with self._lock:
+      if self._loaded is None or self._loaded[0] != stamp:
+        self._loaded = (stamp, WorkflowConfig.from_file(self.config_path))
+        self.reloads += 1
+      return self._loaded[1]
+
+  def client(self, base_url: str) -> NinjaSageClient:
+    client = self._clients.get(base_url)
+    if client is None:
+      with self._lock:
+        client = self._clients.get(base_url)
+        if client is None:
+          client = self._clients[base_url] = NinjaSageClient(
+            base_url=base_url,
+            scheduler=self.scheduler,
+            middleware=self.middleware,
+            sessions=self.sessions,
+          )
+    return client
+
+  def workflow(self, config_override: dict[str, Any] | None = None) -> NinjaSageWorkflow:
+    cfg = self.config()
+    if config_override:
+      changes = {key: value for key, value in config_override.items() if key in _OVERRIDABLE}
+      if "credentials" in changes:
+        changes["credentials"] = Credentials(**changes["credentials"])
+      cfg = dataclasses.replace(cfg, **changes)
+    # Event koleksi diambil dari poller bersama, bukan per request.
+    events_source = EVENTS_FEED.response if EVENTS_FEED is not None else None
+    return NinjaSageWorkflow(self.client(cfg.base_url), cfg, events_source=events_source)
+
+  def stats(self) -> dict[str, int]:
+    return {"config_reloads": self.reloads, "clients": len(self._clients)}
+
+
+# Dibuat ulang oleh ``run`` setelah scheduler dikonfigurasi.
+APP = AppContext(CONFIG_PATH, scheduler=UPSTREAM_SCHEDULER, middleware=[RESPONSE_CACHE])
 
 
 def _build_workflow(config_override: dict[str, Any] | None = None) -> NinjaSageWorkflow:
-  """Bangun objek workflow dari file config + override opsional."""
+  """Bangun objek workflow dari config (cache) + override opsional.
+
+  Selama warm-up masih berjalan, request menunggu hasilnya (maks.
+  ``WARMUP_TIMEOUT``) alih-alih mengunduh asset yang sama secara paralel.
+  """
+
+  if WARMUP is not None:
+    WARMUP.wait(WARMUP_TIMEOUT)
+  return APP.workflow(config_override)
 
-  base_config = WorkflowConfig.from_file(CONFIG_PATH)
-  if not config_override:
-    cfg = base_config
-  else:
-    payload = {
-      "base_url": config_override.get("base_url", base_config.base_url),
-      "channel": config_override.get("channel", base_config.channel),
-      "include_events": config_override.get("include_events", base_config.include_events),
-      "analytics_base_url": config_override.get("analytics_base_url", base_config.analytics_base_url),
-      "library_url": config_override.get("library_url", base_config.library_url),
-      "loader_info": {
-        "bytes_loaded": base_config.loader.bytes_loaded,
-        "bytes_total": base_config.loader.bytes_total,
-      },
-      "server_id": config_override.get("server_id", base_config.server_id),
-      "selected_character_index": config_override.get(
-        "selected_character_index", base_config.selected_character_index
-      ),
-      "character_seed": config_override.get("character_seed", base_config.character_seed),
-      "character_key": config_override.get("character_key", base_config.character_key),
-      "credentials": config_override.get(
-        "credentials",
-        {
-          "username": getattr(base_config, "credentials").username,
-          "password": getattr(base_config, "credentials").password,
-        },
-      ),
-    }
-    cfg = WorkflowConfig.from_mapping(payload)
 
-  client = NinjaSageClient(base_url=cfg.base_url)
-  return NinjaSageWorkflow(client, cfg)
+def _run_workflow(config_override: dict[str, Any] | None = None) -> WorkflowResult:
+  """Jalankan workflow lewat cache + single-flight per akun.
+
+  Kunci memuat hash password supaya hasil akun tidak pernah bocor ke
+  request dengan password berbeda. ``/api/workflow`` dan
+  ``/api/characters`` memakai kunci yang sama karena keduanya menjalankan
+  workflow penuh yang identik.
+  """
+
+  workflow = _build_workflow(config_override)
+  return RESULT_CACHE.get_or_load(_cache_key(workflow), lambda: _fetch(workflow))
+
+
+def _fetch(workflow: NinjaSageWorkflow) -> WorkflowResult:
+  """Jalankan workflow ke server game dan catat snapshot karakternya."""
+
+  return _record_snapshot(workflow.run())
+
+
+def _record_snapshot(result: WorkflowResult) -> WorkflowResult:
+  # Hanya hasil yang benar-benar diambil dari upstream yang dicatat, bukan
+  # hasil cache; gagal menulis riwayat tidak boleh menggagalkan request.
+  if SNAPSHOTS is not None and result.character_data is not None:
+    try:
+      SNAPSHOTS.append(result.character_data)
+    except Exception as exc:
+      print(f"[!] Snapshot karakter gagal disimpan: {exc}")
+  return result
+
+
+def _owned_character_ids(config_override: dict[str, Any] | None) -> set[int]:
+  """ID karakter milik akun yang login (lewat cache workflow yang sama)."""
+
+  result = _run_workflow(config_override)
+  owned: set[int] = set()
+  if result.characters is not None:
+    owned.update(int(entry.char_id) for entry in result.characters.characters if entry.char_id is not None)
+  character = result.character_data.character if result.character_data is not None else None
+  if character is not None and character.character_id is not None:
+    owned.add(int(character.character_id))
+  return owned
+
+
+def _cache_key(workflow: NinjaSageWorkflow) -> tuple[str, str, str]:
+  credentials = workflow.config.credentials
+  password_digest = hashlib.sha256(credentials.password.encode("utf-8")).hexdigest()
+  return ("workflow", credentials.username, password_digest)
+
+
+def _credentials_override(data: dict[str, Any]) -> dict[str, Any] | None:
+  username = data.get("username")
+  password = data.get("password")
+  if username and password:
+    return {"credentials": {"username": username, "password": password}}
+  return None
 
 
 class NinjaSageHttpHandler(BaseHTTPRequestHandler):
   server_version = "NinjaSageHTTP/0.1"
+  protocol_version = "HTTP/1.1"
+  disable_nagle_algorithm = True
+  # Batas idle koneksi keep-alive; diisi ulang oleh ``run``.
+  timeout = 5.0
+
+  def handle(self) -> None:
+    # Satu request per giliran worker; koneksi keep-alive yang menganggur
+    # dikembalikan ke server (lihat ``NinjaSageHTTPServer.park``).
+    self.close_connection = True
+    self.handle_one_request()
+
+  def handle_next(self) -> None:
+    """Layani request berikutnya di koneksi yang sama (dipanggil server)."""
+
+    try:
+      self.handle()
+    except Exception:
+      self.close_connection = True
+      raise
+    finally:
+      self.finish()
+
+  def finish(self) -> None:
+    if self.close_connection:
+      super().finish()
+    else:
+      # rfile (beserta byte yang sudah di-buffer) dipakai lagi untuk request berikutnya.
+      self.wfile.flush()
+
+  def end_headers(self) -> None:
+    if getattr(self.server, "draining", False):
+      # Server sedang dimatikan: tutup koneksi keep-alive setelah response ini.
+      self.send_header("Connection", "close")
+      self.close_connection = True
+    super().end_headers()
+
+  def _parse_path(self) -> None:
+    parts = urlsplit(self.path)
+    self.route = parts.path
+    self.query = parse_qs(parts.query)
+
+  def _include_raw(self) -> bool:
+    values = self.query.get("raw") or ["1"]
+    return values[-1].lower() not in ("0", "false", "no")
+
+  def _projection(self, root: type, data: dict[str, Any] | None = None) -> Projection | None:
+    """Ambil ``fields`` dari query/body; ``ProjectionError`` jika path salah."""
+
+    values = self.query.get("fields")
+    fields = values[-1] if values else (data or {}).get("fields")
+    if not fields:
+      return None
+    if isinstance(fields, (list, tuple)):
+      fields = ",".join(str(item) for item in fields)
+    return compile_projection(str(fields), root)
+
+  def _wants_amf3(self) -> bool:
+    values = getattr(self, "query", {}).get("format")
+    return wants_amf3(self.headers.get("Accept"), values[-1] if values else None)
 
   def _send_json(self, status: int, payload: Any) -> None:
-    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    """Kirim model/dict sebagai JSON tanpa ``asdict`` (lihat ninja_sage.serialization).
+
+    Klien yang meminta AMF3 (``Accept: application/x-amf`` atau
+    ``?format=amf3``) menerima payload yang sama dalam AMF3.
+    """
+
+    include_raw = getattr(self, "query", None) is None or self._include_raw()
+    if self._wants_amf3():
+      self._send_body(status, encode_amf3(payload, exclude_raw=not include_raw), AMF3_CONTENT_TYPE)
+      return
+    body = dumps_bytes(payload, exclude_raw=not include_raw)
+    self._send_body(status, body, JSON_CONTENT_TYPE)
+
+  def _send_body(
+    self,
+    status: int,
+    body: bytes,
+    content_type: str,
+    *,
+    source: PrecompressedBody | None = None,
+    cache_control: str = "no-cache",
+  ) -> None:
+    """Kirim body dengan ETag/304 dan kompresi untuk response 200.
+
+    ``source`` dipakai untuk body statis yang digest dan versi
+    terkompresinya sudah disiapkan (data game).
+    """
+
+    headers: list[tuple[str, str]] = [("Content-Type", content_type)]
+    if status == 200:
+      digest = source.digest if source is not None else body_digest(body)
+      accept_encoding = self.headers.get("Accept-Encoding")
+      if etag_matches(self.headers.get("If-None-Match"), digest):
+        if source is not None:
+          encoding = source.choose_encoding(accept_encoding)
+        else:
+          encoding = BODY_CACHE.choose_encoding(body, accept_encoding)
+        self.send_response(304)
+        self.send_header("ETag", make_etag(digest, encoding))
+        self.send_header("Vary", "Accept, Accept-Encoding")
+        self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        return
+      if source is not None:
+        encoded = source.encode(accept_encoding)
+      else:
+        encoded = BODY_CACHE.encode(body, accept_encoding, digest=digest)
+      body = encoded.body
+      headers.append(("ETag", encoded.etag))
+      headers.append(("Vary", "Accept, Accept-Encoding"))
+      headers.append(("Cache-Control", cache_control))
+      if encoded.encoding:
+        headers.append(("Content-Encoding", encoded.encoding))
+
     self.send_response(status)
-    self.send_header("Content-Type", "application/json; charset=utf-8")
+    for name, value in headers:
+      self.send_header(name, value)
     self.send_header("Content-Length", str(len(body)))
     self.end_headers()
     self.wfile.write(body)
 
+  def _start_chunked(self, content_type: str) -> None:
+    self.send_response(200)
+    self.send_header("Content-Type", content_type)
+    self.send_header("Cache-Control", "no-cache")
+    self.send_header("Transfer-Encoding", "chunked")
+    self.end_headers()
+
+  def _write_chunk(self, data: bytes) -> None:
+    self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+    self.wfile.flush()
+
+  def _end_chunked(self) -> None:
+    self.wfile.write(b"0\r\n\r\n")
+    self.wfile.flush()
+
   def _read_json_body(self) -> dict[str, Any]:
     length = int(self.headers.get("Content-Length") or "0")
     if length <= 0:
@@ -109,14 +561,42 @@ class NinjaSageHttpHandler(BaseHTTPRequestHandler):
     self.end_headers()
 
   def do_GET(self) -> None:  # type: ignore[override]
-    if self.path == "/api/characters":
+    self._parse_path()
+    if self.route == "/api/characters":
       self._handle_get_characters()
+    elif self.route == "/api/health":
+      self._handle_health()
+    elif self.route == "/api/stats":
+      self._handle_stats()
+    elif self.route.startswith("/api/jobs/"):
+      self._handle_get_job(self.route[len("/api/jobs/") :])
+    elif self.route.startswith("/api/characters/"):
+      self._handle_character_history(self.route[len("/api/characters/") :])
+    elif self.route == "/api/character/delta":
+      self._handle_character_delta({"revision": (self.query.get("revision") or [None])[0]})
+    elif self.route == "/api/events":
+      self._handle_events()
+    elif self.route == "/api/events/stream":
+      self._handle_events_stream()
+    elif self.route.startswith("/api/"):
+      self._handle_game_data(self.route[len("/api/") :])
     else:
       self._send_json(404, {"error": "not_found"})
 
   def do_POST(self) -> None:  # type: ignore[override]
-    if self.path == "/api/workflow":
-      self._handle_workflow()
+    # Body selalu dibaca supaya koneksi keep-alive tetap sinkron.
+    data = self._read_json_body()
+    self._parse_path()
+    if self.route == "/api/workflow":
+      self._handle_workflow(data)
+    elif self.route == "/api/workflow/stream":
+      self._handle_workflow_stream(data)
+    elif self.route == "/api/jobs":
+      self._handle_submit_job(data)
+    elif self.route == "/api/character/delta":
+      self._handle_character_delta(data)
+    elif self.route.startswith("/api/characters/"):
+      self._handle_character_history(self.route[len("/api/characters/") :], data)
     else:
       self._send_json(404, {"error": "not_found"})
 
@@ -124,23 +604,15 @@ class NinjaSageHttpHandler(BaseHTTPRequestHandler):
   # Handlers
   # ------------------------------------------------------------------
 
-  def _handle_workflow(self) -> None:
-    data = self._read_json_body()
-    username = data.get("username")
-    password = data.get("password")
-
-    override: dict[str, Any] | None = None
-    if username and password:
-      override = {
-        "credentials": {
-          "username": username,
-          "password": password,
-        }
-      }
+  def _handle_workflow(self, data: dict[str, Any]) -> None:
+    try:
+      projection = self._projection(WorkflowResult, data)
+    except ProjectionError as exc:
+      self._send_json(400, {"error": "invalid_fields", "detail": str(exc)})
+      return
 
     try:
-      workflow = _build_workflow(override)
-      result = workflow.run()
+      result = _run_workflow(_credentials_override(data))
     except Exception as exc:  # pragma: no cover - debugging helper
       self._send_json(
         502,
@@ -151,22 +623,269 @@ class NinjaSageHttpHandler(BaseHTTPRequestHandler):
       )
       return
 
-    payload = {
-      "version": asdict(result.version),
-      "analytics": asdict(result.analytics),
-      "events": asdict(result.events),
-      "login": asdict(result.login),
-      "characters": asdict(result.characters),
-      "character_data": asdict(result.character_data) if result.character_data is not None else None,
-    }
+    self._send_json(200, projection.apply(result) if projection else result)
+
+  def _handle_workflow_stream(self, data: dict[str, Any]) -> None:
+    """Kirim hasil tiap langkah workflow segera setelah selesai."""
+
+    sse = "text/event-stream" in (self.headers.get("Accept") or "")
+    exclude_raw = not self._include_raw()
+    try:
+      projection = self._projection(WorkflowResult, data)
+    except ProjectionError as exc:
+      self._send_json(400, {"error": "invalid_fields", "detail": str(exc)})
+      return
+
+    def _event(step: str, payload: dict[str, Any]) -> bytes:
+      line = dumps_bytes({"step": step, **payload}, exclude_raw=exclude_raw)
+      if sse:
+        return b"event: " + step.encode("ascii") + b"\ndata: " + line + b"\n\n"
+      return line + b"\n"
+
+    try:
+      workflow = _build_workflow(_credentials_override(data))
+    except Exception as exc:  # pragma: no cover - debugging helper
+      self._send_json(502, {"error": "workflow_failed", "detail": str(exc)})
+      return
+
+    self._start_chunked("text/event-stream; charset=utf-8" if sse else "application/x-ndjson; charset=utf-8")
+    key = _cache_key(workflow)
+    cached = RESULT_CACHE.peek(key)
+    if cached is not None:
+      steps = ((step, getattr(cached, step)) for step in WORKFLOW_STEPS)
+    else:
+      steps = workflow.iter_steps()
+
+    collected: dict[str, Any] = {}
+    try:
+      for step, result in steps:
+        collected[step] = result
+        if projection is None:
+          self._write_chunk(_event(step, {"data": result}))
+          continue
+        selected = projection.select(step)
+        if selected is not None:
+          self._write_chunk(_event(step, {"data": selected.apply(result)}))
+    except (BrokenPipeError, ConnectionResetError):
+      self.close_connection = True
+      return
+    except Exception as exc:  # pragma: no cover - debugging helper
+      self._write_chunk(_event("error", {"error": "workflow_failed", "detail": str(exc)}))
+      self._end_chunked()
+      return
+
+    if cached is None:
+      RESULT_CACHE.put(key, _record_snapshot(WorkflowResult(**collected)))
+    self._write_chunk(_event("done", {}))
+    self._end_chunked()
+
+  def _handle_submit_job(self, data: dict[str, Any]) -> None:
+    try:
+      workflow = _build_workflow(_credentials_override(data))
+      # Prioritas dari klien dibatasi ke rentang yang dikenal antrean.
+      priority = max(MIN_PRIORITY, min(MAX_PRIORITY, int(data.get("priority") or 0)))
+    except Exception as exc:  # pragma: no cover - debugging helper
+      self._send_json(400, {"error": "invalid_job", "detail": str(exc)})
+      return
+
+    key = _cache_key(workflow)
+    try:
+      job, created = JOB_QUEUE.submit(
+        key,
+        lambda: RESULT_CACHE.get_or_load(key, lambda: _fetch(workflow)),
+        priority=priority,
+      )
+    except QueueFullError:
+      self._send_json(503, {"error": "queue_full"})
+      return
+
+    self._send_json(202, {**job.describe(), "deduplicated": not created, "location": f"/api/jobs/{job.id}"})
+
+  def _handle_get_job(self, job_id: str) -> None:
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+      self._send_json(404, {"error": "job_not_found"})
+      return
+
+    payload: dict[str, Any] = job.describe()
+    if job.status == SUCCEEDED:
+      try:
+        projection = self._projection(WorkflowResult)
+      except ProjectionError as exc:
+        self._send_json(400, {"error": "invalid_fields", "detail": str(exc)})
+        return
+      payload["result"] = projection.apply(job.result) if projection else job.result
     self._send_json(200, payload)
 
+  def _handle_health(self) -> None:
+    """503 selama warm-up berjalan, 200 setelah proses siap menerima traffic."""
+
+    status = WARMUP.status() if WARMUP is not None else {"ready": True, "status": "ready"}
+    self._send_json(200 if status["ready"] else 503, {**status, "pid": os.getpid()})
+
+  def _handle_stats(self) -> None:
+    self._send_json(
+      200,
+      {
+        "upstream": UPSTREAM_SCHEDULER.stats(),
+        "result_cache": RESULT_CACHE.stats.as_dict(),
+        "response_cache": RESPONSE_CACHE.stats(),
+        "app": APP.stats(),
+        "http": self.server.stats(),
+        "assets": default_registry().stats(),
+        "body_cache": {"hits": BODY_CACHE.hits, "misses": BODY_CACHE.misses},
+        "jobs": JOB_QUEUE.stats(),
+        "game_data": GAME_DATA.stats(),
+        "warmup": WARMUP.status() if WARMUP is not None else None,
+        "snapshots": SNAPSHOTS.stats() if SNAPSHOTS is not None else None,
+        "character_delta": CHARACTER_REVISIONS.stats(),
+        "events_feed": (
+          {**EVENTS_FEED.stats(), **(EVENTS_HUB.stats() if EVENTS_HUB is not None else {})}
+          if EVENTS_FEED is not None
+          else None
+        ),
+        "pid": os.getpid(),
+      },
+    )
+
+  def _handle_game_data(self, path: str) -> None:
+    """``/api/<tabel>`` (daftar berhalaman) atau ``/api/<tabel>/<id>``."""
+
+    table_name, _, record_id = path.partition("/")
+    table = GAME_DATA.table(table_name)
+    if table is None:
+      self._send_json(404, {"error": "not_found"})
+      return
+    binary = self._wants_amf3()
+    if record_id:
+      source = table.record(record_id, binary=binary)
+      if source is None:
+        self._send_json(404, {"error": "not_found", "detail": record_id})
+        return
+    else:
+      try:
+        source = table.page(self.query, binary=binary)
+      except GameDataQueryError as exc:
+        self._send_json(400, {"error": "invalid_query", "detail": str(exc)})
+        return
+    self._send_body(
+      200,
+      source.body,
+      AMF3_CONTENT_TYPE if binary else JSON_CONTENT_TYPE,
+      source=source,
+      cache_control=GAME_DATA_CACHE_CONTROL,
+    )
+
+  def _handle_events(self) -> None:
+    """Koleksi event terakhir dari poller bersama (tanpa panggilan upstream)."""
+
+    if EVENTS_FEED is None:
+      self._send_json(404, {"error": "events_feed_disabled"})
+      return
+    snapshot = EVENTS_FEED.current()
+    if snapshot is None:
+      self._send_json(503, {"error": "events_not_ready", "detail": EVENTS_FEED.last_error})
+      return
+    self._send_json(200, snapshot.as_dict())
+
+  def _handle_events_stream(self) -> None:
+    """Langganan SSE: socket diserahkan ke :class:`SseHub`, worker langsung bebas."""
+
+    if EVENTS_HUB is None:
+      self._send_json(404, {"error": "events_feed_disabled"})
+      return
+    if EVENTS_HUB.full:
+      self._send_json(503, {"error": "too_many_subscribers"})
+      return
+    self.send_response(200)
+    self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+    self.send_header("Cache-Control", "no-cache")
+    self.send_header("Access-Control-Allow-Origin", "*")
+    # Tanpa Content-Length: stream berakhir saat koneksi ditutup.
+    self.send_header("Connection", "close")
+    self.end_headers()
+    self.wfile.write(b"retry: 5000\n\n")
+    self.wfile.flush()
+    self.close_connection = True
+    if EVENTS_HUB.add(self.connection, self.headers.get("Last-Event-ID")):
+      self.server.detach(self.connection)
+
+  def _handle_character_delta(self, data: dict[str, Any]) -> None:
+    """Perubahan getCharacterData sejak ``revision`` milik klien (JSON Patch)."""
+
+    try:
+      result = _run_workflow(_credentials_override(data))
+    except Exception as exc:  # pragma: no cover - debugging helper
+      self._send_json(502, {"error": "workflow_failed", "detail": str(exc)})
+      return
+    if result.character_data is None or result.character_data.character is None:
+      self._send_json(404, {"error": "no_character_data"})
+      return
+
+    revision = data.get("revision")
+    delta = CHARACTER_REVISIONS.delta(result.character_data, revision if isinstance(revision, str) else None)
+    self._send_json(200, {"character_id": result.character_data.character.character_id, **delta})
+
+  def _handle_character_history(self, path: str, data: dict[str, Any] | None = None) -> None:
+    """``/api/characters/{id}/history`` (deret metrik) atau ``/{id}/snapshot``."""
+
+    if SNAPSHOTS is None:
+      self._send_json(404, {"error": "snapshots_disabled"})
+      return
+    character_id, _, view = path.partition("/")
+    if not character_id.isdigit() or view not in ("history", "snapshot"):
+      self._send_json(404, {"error": "not_found"})
+      return
+    try:
+      owned = _owned_character_ids(_credentials_override(data or {}))
+    except Exception as exc:  # pragma: no cover - debugging helper
+      self._send_json(502, {"error": "workflow_failed", "detail": str(exc)})
+      return
+    if int(character_id) not in owned:
+      # Sama dengan "tidak ada" supaya keberadaan karakter akun lain tidak bocor.
+      self._send_json(404, {"error": "not_found", "detail": character_id})
+      return
+
+    def _number(name: str) -> float | None:
+      values = self.query.get(name)
+      return float(values[0]) if values else None
+
+    try:
+      if view == "snapshot":
+        snapshot = SNAPSHOTS.state_at(int(character_id), _number("at"))
+        if snapshot is None:
+          self._send_json(404, {"error": "not_found", "detail": character_id})
+        else:
+          self._send_json(200, {"character_id": int(character_id), **snapshot})
+        return
+      metrics = ",".join(self.query.get("metrics", [])).split(",")
+      metrics = [name for name in metrics if name] or ["level", "xp", "gold", "tp"]
+      limit = _number("limit")
+      points = SNAPSHOTS.series(
+        int(character_id),
+        metrics,
+        since=_number("since"),
+        until=_number("until"),
+        step=_number("step"),
+        # LIMIT negatif berarti tanpa batas di SQLite.
+        limit=max(1, min(int(limit), 10000)) if limit is not None else 10000,
+      )
+    except ValueError as exc:
+      self._send_json(400, {"error": "invalid_query", "detail": str(exc)})
+      return
+    self._send_json(200, {"character_id": int(character_id), "metrics": metrics, "points": points})
+
   def _handle_get_characters(self) -> None:
     """Endpoint ringkas untuk hanya mengambil daftar karakter."""
 
     try:
-      workflow = _build_workflow(None)
-      result = workflow.run()
+      projection = self._projection(GetAllCharactersResponse)
+    except ProjectionError as exc:
+      self._send_json(400, {"error": "invalid_fields", "detail": str(exc)})
+      return
+
+    try:
+      result = _run_workflow(None)
     except Exception as exc:  # pragma: no cover - debugging helper
       self._send_json(
         502,
@@ -177,20 +896,621 @@ class NinjaSageHttpHandler(BaseHTTPRequestHandler):
       )
       return
 
-    self._send_json(200, asdict(result.characters))
+    self._send_json(200, projection.apply(result.characters) if projection else result.characters)
+
+
+class NinjaSageHTTPServer(HTTPServer):
+  """HTTPServer dengan worker pool terbatas, backpressure 503 dan drain.
+
+  ``workers`` request dilayani bersamaan; ``queue_limit`` lagi boleh
+  menunggu giliran. Di atas itu koneksi baru langsung dijawab 503.
+
+  Worker hanya memegang koneksi selama ada request: koneksi keep-alive
+  yang menganggur "diparkir" di satu thread selector dan baru dikirim ke
+  pool lagi saat klien mengirim request berikutnya, atau ditutup setelah
+  ``keepalive_timeout`` detik.
+  """
+
+  def __init__(
+    self,
+    server_address: tuple[str, int],
+    handler_class: type[BaseHTTPRequestHandler],
+    *,
+    workers: int = 8,
+    queue_limit: int = 32,
+    keepalive_timeout: float | None = None,
+    bind_and_activate: bool = True,
+  ) -> None:
+    super().__init__(server_address, handler_class, bind_and_activate=bind_and_activate)
+    self.workers = workers
+    self.queue_limit = queue_limit
+    self.keepalive_timeout = keepalive_timeout if keepalive_timeout is not None else (handler_class.timeout or 5.0)
+    self.draining = False
+    self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-worker")
+    self._slots = threading.BoundedSemaphore(workers + queue_limit)
+    self._inflight = 0
+    self._idle = threading.Condition()
+    # Socket yang diambil alih (langganan SSE) tidak ditutup setelah handler selesai.
+    self._detached: set[socket.socket] = set()
+    self._detached_lock = threading.Lock()
+    # Koneksi keep-alive menganggur: dikelola thread "api-keepalive" saja.
+    self._parked: dict[socket.socket, tuple[BaseHTTPRequestHandler, float]] = {}
+    self._park_queue: "queue.SimpleQueue[BaseHTTPRequestHandler | None]" = queue.SimpleQueue()
+    self._selector = selectors.DefaultSelector()
+    self._wake_reader, self._wake_writer = socket.socketpair()
+    self._wake_reader.setblocking(False)
+    self._wake_writer.setblocking(False)
+    self._selector.register(self._wake_reader, selectors.EVENT_READ)
+    threading.Thread(target=self._keepalive_loop, name="api-keepalive", daemon=True).start()
+
+  def detach(self, request: socket.socket) -> None:
+    with self._detached_lock:
+      self._detached.add(request)
+
+  def stats(self) -> dict[str, int]:
+    return {"in_flight": self._inflight, "idle_keepalive": len(self._parked)}
+
+  def process_request(self, request: socket.socket, client_address: Any) -> None:  # type: ignore[override]
+    self._dispatch(request, client_address, None)
+
+  def finish_request(self, request: socket.socket, client_address: Any) -> BaseHTTPRequestHandler:  # type: ignore[override]
+    return self.RequestHandlerClass(request, client_address, self)
+
+  def _dispatch(self, request: socket.socket, client_address: Any, handler: BaseHTTPRequestHandler | None) -> None:
+    if self.draining or not self._slots.acquire(blocking=False):
+      if handler is not None:
+        handler.close_connection = True
+        handler.finish()
+      self._reject(request)
+      return
+    with self._idle:
+      self._inflight += 1
+    self._pool.submit(self._process, request, client_address, handler)
+
+  def _process(
+    self, request: socket.socket, client_address: Any, handler: BaseHTTPRequestHandler | None = None
+  ) -> None:
+    try:
+      if handler is None:
+        handler = self.finish_request(request, client_address)
+      else:
+        handler.handle_next()
+      # Request pipelined yang sudah ada di buffer dilayani langsung.
+      while not handler.close_connection and not self.draining and self._buffered(handler):
+        handler.handle_next()
+    except Exception:
+      if handler is not None:
+        handler.close_connection = True
+      self.handle_error(request, client_address)
+    finally:
+      with self._detached_lock:
+        detached = request in self._detached
+        self._detached.discard(request)
+      if detached:
+        pass
+      elif handler is not None and not handler.close_connection and not self.draining:
+        self.park(handler)
+      else:
+        if handler is not None and not handler.rfile.closed:
+          handler.close_connection = True
+          handler.finish()
+        self.shutdown_request(request)
+      self._slots.release()
+      with self._idle:
+        self._inflight -= 1
+        self._idle.notify_all()
+
+  @staticmethod
+  def _buffered(handler: BaseHTTPRequestHandler) -> bool:
+    """Apakah request berikutnya sudah menunggu (tanpa blocking)."""
+
+    sock = handler.connection
+    try:
+      sock.settimeout(0)
+      return bool(handler.rfile.peek(1))
+    except (OSError, ValueError):
+      return False
+    finally:
+      try:
+        sock.settimeout(handler.timeout)
+      except OSError:
+        pass
+
+  def park(self, handler: BaseHTTPRequestHandler) -> None:
+    """Serahkan koneksi keep-alive yang menganggur ke thread selector."""
+
+    self._park_queue.put(handler)
+    self._wake()
+
+  def _wake(self) -> None:
+    try:
+      self._wake_writer.send(b"\0")
+    except OSError:  # buffer wake-up penuh: thread selector toh sudah bangun
+      pass
+
+  def _keepalive_loop(self) -> None:
+    while True:
+      timeout = None
+      if self._parked:
+        oldest = min(parked_at for _, parked_at in self._parked.values())
+        timeout = max(0.0, oldest + self.keepalive_timeout - time.monotonic())
+      for key, _ in self._selector.select(timeout):
+        if key.fileobj is self._wake_reader:
+          try:
+            while self._wake_reader.recv(4096):
+              pass
+          except OSError:
+            pass
+          continue
+        # Klien mengirim request berikutnya (atau menutup koneksi): kembali ke pool.
+        sock = key.fileobj
+        handler, _ = self._parked.pop(sock)
+        self._selector.unregister(sock)
+        self._dispatch(sock, handler.client_address, handler)
+      while True:
+        try:
+          handler = self._park_queue.get_nowait()
+        except queue.Empty:
+          break
+        if handler is None:
+          return
+        try:
+          self._selector.register(handler.connection, selectors.EVENT_READ)
+        except (OSError, ValueError):
+          self._close_parked(handler)
+          continue
+        self._parked[handler.connection] = (handler, time.monotonic())
+      now = time.monotonic()
+      for sock, (handler, parked_at) in list(self._parked.items()):
+        if self.draining or now - parked_at >= self.keepalive_timeout:
+          del self._parked[sock]
+          self._selector.unregister(sock)
+          self._close_parked(handler)
+
+  def _close_parked(self, handler: BaseHTTPRequestHandler) -> None:
+    handler.close_connection = True
+    try:
+      handler.finish()
+    except OSError:
+      pass
+    self.shutdown_request(handler.connection)
+
+  def _reject(self, request: socket.socket) -> None:
+    body = json.dumps({"error": "server_busy"}).encode("utf-8")
+    head = (
+      "HTTP/1.1 503 Service Unavailable\r\n"
+      "Content-Type: application/json; charset=utf-8\r\n"
+      f"Content-Length: {len(body)}\r\n"
+      "Retry-After: 1\r\n"
+      "Connection: close\r\n\r\n"
+    ).encode("ascii")
+    try:
+      request.sendall(head + body)
+    except OSError:
+      pass
+    finally:
+      self.shutdown_request(request)
+
+  def drain(self, timeout: float | None = None) -> bool:
+    """Tunggu koneksi yang sedang diproses selesai; ``False`` jika timeout."""
+
+    self.draining = True
+    # Koneksi keep-alive yang menganggur langsung ditutup.
+    self._wake()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with self._idle:
+      while self._inflight > 0:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+          break
+        self._idle.wait(remaining)
+      drained = self._inflight == 0
+    self._pool.shutdown(wait=drained, cancel_futures=not drained)
+    return drained
 
 
-def run(host: str = "127.0.0.1", port: int = 8080) -> None:
-  server = HTTPServer((host, port), NinjaSageHttpHandler)
-  print(f"[*] Ninja Sage API server berjalan di http://{host}:{port}")
+def run(
+  host: str = "127.0.0.1",
+  port: int = 8080,
+  *,
+  workers: int = 8,
+  queue_limit: int = 32,
+  keepalive_timeout: float = 5.0,
+  drain_timeout: float = 30.0,
+  cache_ttl: float = 5.0,
+  stale_ttl: float = 30.0,
+  compress_min_size: int = 1024,
+  compress_level: int = 6,
+  job_workers: int = 4,
+  job_queue_limit: int = 256,
+  job_retention: float = 300.0,
+  upstream_max_in_flight: int = 16,
+  upstream_per_account: int = 2,
+  upstream_rate: float | None = None,
+  upstream_burst: float | None = None,
+  sage_data: Path = DEFAULT_SAGE_DATA,
+  processes: int = 1,
+  warmup: bool = True,
+  warmup_timeout: float = 30.0,
+  asset_ttl: float = 3600.0,
+  asset_cache_dir: Path | None = None,
+  snapshot_db: Path | None = None,
+  snapshot_compact_interval: float = 3600.0,
+  snapshot_full_days: float = 7.0,
+  snapshot_resolution: float = 3600.0,
+  events_interval: float = 60.0,
+  events_max_subscribers: int = 1000,
+) -> None:
+  global JOB_QUEUE, UPSTREAM_SCHEDULER, GAME_DATA, APP, WARMUP_TIMEOUT, SNAPSHOTS, SNAPSHOT_COMPACTION
+  global EVENTS_SETTINGS, EVENTS_SHARED_FILE
+  EVENTS_SETTINGS = (events_interval, events_max_subscribers)
+  JOB_QUEUE = JobQueue(workers=job_workers, max_pending=job_queue_limit, retention=job_retention)
+  # Batas global upstream dibagi rata ke semua proses worker.
+  UPSTREAM_SCHEDULER = UpstreamScheduler(
+    max_in_flight=max(1, -(-upstream_max_in_flight // max(1, processes))),
+    per_account=upstream_per_account,
+    rate=upstream_rate / max(1, processes) if upstream_rate else None,
+    burst=max(1.0, upstream_burst / max(1, processes)) if upstream_burst else None,
+  )
+  APP = AppContext(
+    CONFIG_PATH,
+    scheduler=UPSTREAM_SCHEDULER,
+    middleware=[RESPONSE_CACHE],
+    sessions=SessionPool(pool_maxsize=max(workers, upstream_max_in_flight), max_retries=1),
+  )
+  WARMUP_TIMEOUT = warmup_timeout
+  spool = tempfile.TemporaryDirectory(prefix="ninja-sage-jobs-") if processes > 1 else None
+  if asset_cache_dir is None and spool is not None:
+    # Worker pre-fork berbagi hasil unduhan asset lewat direktori yang sama.
+    asset_cache_dir = Path(spool.name) / "assets"
+  if spool is not None:
+    EVENTS_SHARED_FILE = Path(spool.name) / "events.json"
+  set_default_registry(
+    AssetRegistry(ttl=asset_ttl, store=AssetStore(asset_cache_dir) if asset_cache_dir is not None else None)
+  )
+  if snapshot_db is not None:
+    # Koneksi SQLite dibuka per proses saat pertama dipakai (aman setelah fork).
+    SNAPSHOTS = SnapshotStore(snapshot_db)
+    SNAPSHOT_COMPACTION = (snapshot_compact_interval, snapshot_full_days * 86400.0, snapshot_resolution)
+    print(f"[*] Snapshot karakter disimpan di {snapshot_db}")
+  RESULT_CACHE.ttl = cache_ttl
+  RESULT_CACHE.stale_ttl = stale_ttl
+  BODY_CACHE.min_size = compress_min_size
+  BODY_CACHE.level = compress_level
+  started = time.perf_counter()
+  GAME_DATA = GameData.load(sage_data, min_size=compress_min_size, level=compress_level)
+  if GAME_DATA.tables:
+    counts = ", ".join(f"{name}={len(table)}" for name, table in GAME_DATA.tables.items())
+    print(f"[*] Data game dimuat dari {sage_data} dalam {time.perf_counter() - started:.2f}s ({counts})")
+  else:
+    print(f"[!] Data game tidak ditemukan di {sage_data}; endpoint /api/items dkk. menjawab 404")
+  handler = type("ConfiguredHttpHandler", (NinjaSageHttpHandler,), {"timeout": keepalive_timeout})
+  server = NinjaSageHTTPServer(
+    (host, port), handler, workers=workers, queue_limit=queue_limit, keepalive_timeout=keepalive_timeout
+  )
+
+  if processes <= 1:
+    print(f"[*] Ninja Sage API server berjalan di http://{host}:{port} (workers={workers}, queue={queue_limit})")
+    if warmup:
+      _start_warmup()
+    _start_snapshot_compaction()
+    _start_events_feed()
+    _serve(server, drain_timeout)
+    return
+
+  shared = GAME_DATA.share()
+  print(f"[*] Data game dibagi ke {processes} proses lewat mmap read-only ({shared / 1e6:.1f} MB)")
+  if warmup:
+    _warm_asset_caches()
+  JOB_QUEUE = JobQueue(
+    workers=job_workers,
+    max_pending=job_queue_limit,
+    retention=job_retention,
+    spool_dir=spool.name,
+  )
+  print(
+    f"[*] Ninja Sage API server berjalan di http://{host}:{port} "
+    f"({processes} proses x workers={workers}, queue={queue_limit})"
+  )
+  try:
+    _supervise(server, processes, drain_timeout, warmup=warmup)
+  finally:
+    spool.cleanup()
+
+
+def _serve(server: NinjaSageHTTPServer, drain_timeout: float) -> None:
+  """Layani request sampai Ctrl+C/SIGTERM, lalu drain."""
+
+  def _request_shutdown(signum: int, frame: Any) -> None:
+    # shutdown() menunggu serve_forever berhenti, jadi panggil dari thread lain.
+    threading.Thread(target=server.shutdown, daemon=True).start()
+
+  if threading.current_thread() is threading.main_thread():
+    signal.signal(signal.SIGTERM, _request_shutdown)
+
   try:
     server.serve_forever()
   except KeyboardInterrupt:  # pragma: no cover - manual shutdown
-    print("\n[*] Mematikan server...")
+    pass
   finally:
+    print(f"\n[*] Mematikan server (pid {os.getpid()}), menunggu workflow yang berjalan...")
+    drain_started = time.monotonic()
+    if not server.drain(drain_timeout):
+      print("[!] Drain timeout, sebagian request dibatalkan.")
+    JOB_QUEUE.shutdown(max(0.0, drain_timeout - (time.monotonic() - drain_started)))
+    if EVENTS_HUB is not None:
+      EVENTS_HUB.close()
     server.server_close()
 
 
-if __name__ == "__main__":
-  run()
+def _warm_asset_caches() -> None:
+  """Jalankan langkah warm-up yang hanya mengisi cache, sebelum fork.
+
+  Worker mewarisi hasilnya; koneksi ke server game dibuka tiap worker
+  sendiri setelah fork (socket tidak boleh dibagi antar proses).
+  """
+
+  try:
+    report = warm_start(APP.config(), steps=CACHE_STEPS)
+  except Exception as exc:
+    print(f"[!] Cache asset belum bisa diisi ({exc}); tiap worker akan mengunduh sendiri.")
+    return
+  _print_warmup(report)
+
+
+def _start_warmup() -> None:
+  """Mulai warm-up di background; /api/health menjawab 503 sampai selesai."""
+
+  global WARMUP
+  try:
+    cfg = APP.config()
+  except Exception as exc:
+    print(f"[!] Warm-up dilewati: config tidak bisa dibaca ({exc})")
+    return
+  WARMUP = Warmup(
+    cfg,
+    APP.client(cfg.base_url),
+    connections=min(4, UPSTREAM_SCHEDULER.max_in_flight),
+    timeout=WARMUP_TIMEOUT,
+    on_ready=_print_warmup,
+  ).start()
+
+
+def _start_events_feed(*, leader: bool = True) -> None:
+  """Mulai poller EventsService.get bersama dan hub SSE untuk proses ini.
+
+  Poller memakai client tanpa ``RESPONSE_CACHE`` supaya tiap polling
+  benar-benar bertanya ke server game; bila isinya berubah, cache response
+  ikut dibuang. Dalam mode pre-fork hanya *leader* yang bertanya ke server
+  game dan menulis ``EVENTS_SHARED_FILE``; worker lain membaca file itu
+  (cukup ``stat`` bila tidak berubah).
+  """
 
+  global EVENTS_FEED, EVENTS_HUB
+  interval, max_subscribers = EVENTS_SETTINGS
+  if interval <= 0:
+    return
+  shared = SharedEventsFile(EVENTS_SHARED_FILE) if EVENTS_SHARED_FILE is not None else None
+  if leader:
+    try:
+      cfg = APP.config()
+    except Exception as exc:
+      print(f"[!] Poller event dilewati: config tidak bisa dibaca ({exc})")
+      return
+    client = NinjaSageClient(base_url=cfg.base_url, scheduler=UPSTREAM_SCHEDULER, sessions=APP.sessions)
+    feed = EventsFeed(EventsService(client).get, interval=interval)
+  else:
+    feed = EventsFeed(shared.read, interval=min(interval, 1.0))
+
+  def _on_change(snapshot: EventsSnapshot) -> None:
+    RESPONSE_CACHE.invalidate("EventsService.get")
+    if leader:
+      print(f"[*] Event berubah ({', '.join(snapshot.changed)}), fingerprint {snapshot.fingerprint}")
+
+  feed.subscribe(_on_change)
+  if leader and shared is not None:
+    feed.subscribe(shared.publish)
+  EVENTS_HUB = SseHub(feed, max_subscribers=max_subscribers).start()
+  EVENTS_FEED = feed.start()
+
+
+def _start_snapshot_compaction() -> None:
+  """Padatkan riwayat snapshot lama secara berkala di thread background."""
+
+  interval, older_than, resolution = SNAPSHOT_COMPACTION
+  if SNAPSHOTS is None or interval <= 0:
+    return
+  store = SNAPSHOTS
+
+  def _loop() -> None:
+    while True:
+      try:
+        report = store.compact(older_than=older_than, resolution=resolution)
+      except Exception as exc:
+        print(f"[!] Kompaksi snapshot gagal: {exc}")
+      else:
+        if report.removed:
+          print(
+            f"[*] Kompaksi snapshot: {report.removed} dibuang, {report.kept} disimpan "
+            f"({report.characters} karakter, {report.elapsed:.2f}s)"
+          )
+      time.sleep(interval)
+
+  threading.Thread(target=_loop, name="snapshot-compaction", daemon=True).start()
+
+
+def _print_warmup(report: WarmupReport) -> None:
+  steps = ", ".join(
+    f"{step.name}={step.elapsed * 1000:.0f}ms" + ("" if step.ok else " (gagal)") for step in report.steps
+  )
+  print(f"[*] Warm-up pid {os.getpid()} selesai dalam {report.elapsed:.2f}s: {steps}")
+  for step in report.steps:
+    if not step.ok:
+      print(f"[!] Warm-up {step.name} gagal: {step.error}")
+
+
+def _supervise(server: NinjaSageHTTPServer, processes: int, drain_timeout: float, *, warmup: bool = True) -> None:
+  """Fork ``processes`` worker yang berbagi socket listen dan jalankan ulang yang mati.
+
+  Parent tidak melayani request. Ctrl+C/SIGTERM diteruskan sebagai SIGTERM
+  ke semua worker, yang lalu drain seperti mode satu proses.
+  """
+
+  children: dict[int, int] = {}
+  started_at: dict[int, float] = {}
+  stopping = False
+
+  def _spawn(index: int) -> None:
+    pid = os.fork()
+    if pid == 0:
+      code = 1
+      try:
+        # Ctrl+C dikirim ke seluruh process group; biarkan parent yang mengatur.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        if warmup:
+          _start_warmup()
+        if index == 0:
+          # Cukup satu proses yang memadatkan file snapshot bersama.
+          _start_snapshot_compaction()
+        # Hanya worker 0 yang bertanya ke server game; sisanya mengikuti filenya.
+        _start_events_feed(leader=index == 0)
+        _serve(server, drain_timeout)
+        code = 0
+      finally:
+        os._exit(code)
+    children[pid] = index
+    started_at[pid] = time.monotonic()
+
+  def _stop(signum: int, frame: Any) -> None:
+    nonlocal stopping
+    stopping = True
+    for pid in list(children):
+      try:
+        os.kill(pid, signal.SIGTERM)
+      except ProcessLookupError:
+        pass
+
+  # Bekukan objek yang sudah ada supaya GC worker tidak menyentuh (dan
+  # menyalin) halaman memori yang diwarisi dari parent.
+  gc.freeze()
+  signal.signal(signal.SIGTERM, _stop)
+  signal.signal(signal.SIGINT, _stop)
+  for index in range(processes):
+    _spawn(index)
+
+  while children:
+    try:
+      pid, status = os.wait()
+    except ChildProcessError:
+      break
+    index = children.pop(pid, None)
+    uptime = time.monotonic() - started_at.pop(pid, 0.0)
+    if index is None or stopping:
+      continue
+    print(f"[!] Worker {index} (pid {pid}) berhenti, exit {os.waitstatus_to_exitcode(status)}; dijalankan ulang")
+    if uptime < 1.0:
+      # Worker langsung mati lagi: beri jeda supaya tidak restart terus-menerus.
+      time.sleep(1.0)
+    if not stopping:
+      _spawn(index)
+  server.server_close()
+
+
+def _at_least_one(value: str) -> float:
+  number = float(value)
+  if number < 1:
+    raise argparse.ArgumentTypeError("harus >= 1")
+  return number
+
+
+def parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="HTTP API untuk workflow Ninja Sage")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=8080)
+  parser.add_argument("--workers", type=int, default=8, help="Jumlah koneksi yang dilayani bersamaan")
+  parser.add_argument("--queue-limit", type=int, default=32, help="Koneksi yang boleh antre sebelum 503")
+  parser.add_argument("--keepalive-timeout", type=float, default=5.0, help="Idle timeout koneksi keep-alive (detik)")
+  parser.add_argument("--drain-timeout", type=float, default=30.0, help="Batas tunggu workflow saat shutdown (detik)")
+  parser.add_argument("--cache-ttl", type=float, default=5.0, help="Umur hasil workflow yang dianggap segar (0 = tanpa cache)")
+  parser.add_argument("--stale-ttl", type=float, default=30.0, help="Jendela stale-while-revalidate setelah TTL (detik)")
+  parser.add_argument("--compress-min-size", type=int, default=1024, help="Ukuran body minimum untuk gzip/deflate (byte)")
+  parser.add_argument("--compress-level", type=int, default=6, help="Level kompresi gzip/deflate (1-9)")
+  parser.add_argument("--job-workers", type=int, default=4, help="Jumlah worker antrean /api/jobs")
+  parser.add_argument("--job-queue-limit", type=int, default=256, help="Job antre maksimum sebelum 503")
+  parser.add_argument("--job-retention", type=float, default=300.0, help="Lama hasil job disimpan setelah selesai (detik)")
+  parser.add_argument("--upstream-max-in-flight", type=int, default=16, help="Panggilan AMF bersamaan ke server game")
+  parser.add_argument("--upstream-per-account", type=int, default=2, help="Panggilan AMF bersamaan per akun")
+  parser.add_argument("--upstream-rate", type=float, help="Batas panggilan AMF per detik (default tanpa batas)")
+  parser.add_argument("--upstream-burst", type=_at_least_one, help="Ukuran burst token bucket, minimal 1 (default = rate)")
+  parser.add_argument("--processes", type=int, default=1, help="Jumlah proses worker pre-fork (Linux/macOS)")
+  parser.add_argument("--sage-data", type=Path, default=DEFAULT_SAGE_DATA, help="Folder JSON data game (sage_data)")
+  parser.add_argument(
+    "--warmup",
+    action=argparse.BooleanOptionalAction,
+    default=True,
+    help="Siapkan asset, payload analytics, codec AMF dan koneksi upstream sebelum melayani workflow",
+  )
+  parser.add_argument("--asset-ttl", type=float, default=3600.0, help="Umur cache asset CDN sebelum diperbarui di background (detik)")
+  parser.add_argument(
+    "--asset-cache-dir",
+    type=Path,
+    help="Direktori cache asset bersama antar proses (default: sementara bila --processes > 1)",
+  )
+  parser.add_argument("--warmup-timeout", type=float, default=30.0, help="Batas tunggu request selama warm-up (detik)")
+  parser.add_argument(
+    "--events-interval",
+    type=float,
+    default=60.0,
+    help="Polling EventsService.get bersama tiap N detik (0 = tiap workflow memanggil sendiri)",
+  )
+  parser.add_argument("--events-max-subscribers", type=int, default=1000, help="Maks. langganan /api/events/stream")
+  parser.add_argument("--snapshot-db", type=Path, help="Simpan riwayat getCharacterData ke file SQLite ini")
+  parser.add_argument(
+    "--snapshot-compact-interval",
+    type=float,
+    default=3600.0,
+    help="Jeda antar kompaksi riwayat snapshot (detik, 0 = mati)",
+  )
+  parser.add_argument("--snapshot-full-days", type=float, default=7.0, help="Riwayat N hari terakhir disimpan utuh")
+  parser.add_argument(
+    "--snapshot-resolution",
+    type=float,
+    default=3600.0,
+    help="Riwayat yang lebih lama dipadatkan jadi satu snapshot per N detik",
+  )
+  return parser.parse_args()
+
+
+if __name__ == "__main__":
+  args = parse_args()
+  run(
+    args.host,
+    args.port,
+    workers=args.workers,
+    queue_limit=args.queue_limit,
+    keepalive_timeout=args.keepalive_timeout,
+    drain_timeout=args.drain_timeout,
+    cache_ttl=args.cache_ttl,
+    stale_ttl=args.stale_ttl,
+    compress_min_size=args.compress_min_size,
+    compress_level=args.compress_level,
+    job_workers=args.job_workers,
+    job_queue_limit=args.job_queue_limit,
+    job_retention=args.job_retention,
+    upstream_max_in_flight=args.upstream_max_in_flight,
+    upstream_per_account=args.upstream_per_account,
+    upstream_rate=args.upstream_rate,
+    upstream_burst=args.upstream_burst,
+    sage_data=args.sage_data,
+    processes=args.processes,
+    warmup=args.warmup,
+    warmup_timeout=args.warmup_timeout,
+    asset_ttl=args.asset_ttl,
+    asset_cache_dir=args.asset_cache_dir,
+    snapshot_db=args.snapshot_db,
+    snapshot_compact_interval=args.snapshot_compact_interval,
+    snapshot_full_days=args.snapshot_full_days,
+    snapshot_resolution=args.snapshot_resolution,
+    events_interval=args.events_interval,
+    events_max_subscribers=args.events_max_subscribers,
+  )
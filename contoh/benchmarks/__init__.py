@@ -0,0 +1 @@
+"""Benchmark & load-generation scripts (run with ``python -m benchmarks.<name>``)."""
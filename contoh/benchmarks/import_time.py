@@ -0,0 +1,158 @@
+"""Import-time budget for :mod:`ninja_sage` (guards the lazy package imports).
+
+Run it from the ``contoh`` folder::
+
+    python3 -m benchmarks.import_time
+    python3 -m benchmarks.import_time --repeat 9 --json
+
+Every case runs in a fresh interpreter under ``python -X importtime``. The
+cost of a case is the cumulative time of the modules it imported beyond a
+bare interpreter (best of ``--repeat`` runs), and it fails when it exceeds
+its budget or pulls in a module it must not need (``requests`` for a
+codec-only script, ``rich`` outside the printing helpers, ...). The exit
+status is 1 when any case fails, so the script can gate CI.
+
+The lazy name map of ``ninja_sage.models`` is written by hand (importing
+the model modules to read their ``__all__`` would defeat the laziness), so
+the script also fails when it disagrees with those ``__all__`` lists.
+
+Py3AMF registers its adapters through ``pkg_resources`` on import, which
+alone costs around 100 ms; the budgets of the cases that need Py3AMF
+include it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass(frozen=True, slots=True)
+class ImportCase:
+    label: str
+    statement: str
+    budget_ms: float
+    forbidden: Tuple[str, ...] = ()
+
+
+CASES = (
+    ImportCase("package", "import ninja_sage", 15.0, ("pyamf", "requests", "rich", "Crypto")),
+    ImportCase(
+        "codec",
+        "from ninja_sage import decode_amf_bytes",
+        250.0,
+        ("requests", "rich", "Crypto", "ninja_sage.client"),
+    ),
+    ImportCase(
+        "characters model",
+        "from ninja_sage.models import GetAllCharactersResponse",
+        25.0,
+        ("pyamf", "requests", "rich", "Crypto"),
+    ),
+    ImportCase("workflow", "from ninja_sage import NinjaSageWorkflow", 400.0, ("rich",)),
+)
+
+
+def _importtime(statement: str) -> Dict[str, int]:
+    """Top-level modules imported by *statement* -> cumulative microseconds."""
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules.setdefault(name, 0)
+        # Only top-level entries: nested ones are already in their parent.
+        if len(indent) == 1:
+            modules[name] += cumulative
+    return modules
+
+
+def measure(case: ImportCase, baseline: set[str], repeat: int) -> Dict[str, object]:
+    best = None
+    imported: List[str] = []
+    for _ in range(max(1, repeat)):
+        modules = _importtime(case.statement)
+        total = sum(us for name, us in modules.items() if name not in baseline) / 1000.0
+        if best is None or total < best:
+            best = total
+            imported = [name for name in modules if name not in baseline]
+    leaked = [
+        prefix
+        for prefix in case.forbidden
+        if any(name == prefix or name.startswith(prefix + ".") for name in imported)
+    ]
+    return {
+        "label": case.label,
+        "statement": case.statement,
+        "ms": round(best or 0.0, 2),
+        "budget_ms": case.budget_ms,
+        "modules": len(imported),
+        "forbidden": leaked,
+        "ok": (best or 0.0) <= case.budget_ms and not leaked,
+    }
+
+
+def lazy_export_problems() -> List[str]:
+    """Differences between ``ninja_sage.models`` and its modules' ``__all__``."""
+
+    from ninja_sage import models
+
+    problems: List[str] = []
+    for module, names in models._MODULES.items():
+        exported = set(importlib.import_module(f"ninja_sage.{module}").__all__)
+        for name in sorted(exported - set(names)):
+            problems.append(f"{module}.{name} tidak di-ekspos ninja_sage.models")
+        for name in sorted(set(names) - exported):
+            problems.append(f"ninja_sage.models menyebut {module}.{name} yang tidak ada di __all__")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Jalankan tiap kasus N kali, ambil yang tercepat")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Kalikan semua budget (mesin lambat/CI)")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    baseline = set(_importtime("pass"))
+    cases = [
+        ImportCase(case.label, case.statement, case.budget_ms * args.budget_scale, case.forbidden) for case in CASES
+    ]
+    results = [measure(case, baseline, args.repeat) for case in cases]
+    exports = lazy_export_problems()
+    ok = all(result["ok"] for result in results) and not exports
+
+    if args.json:
+        print(json.dumps({"ok": ok, "python": sys.version.split()[0], "results": results, "exports": exports}))
+    else:
+        for result in results:
+            status = "ok" if result["ok"] else "GAGAL"
+            print(
+                f"{result['label']:<17} {result['ms']:8.1f} ms / {result['budget_ms']:6.1f} ms  "
+                f"{result['modules']:4d} modul  {status}  ({result['statement']})"
+            )
+            if result["forbidden"]:
+                print(f"  modul terlarang ikut ter-import: {', '.join(result['forbidden'])}")
+        for problem in exports:
+            print(f"ekspor model GAGAL: {problem}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Load generator for NinjaSageClient, NinjaSageWorkflow and the HTTP API.
+
+Run it from the ``contoh`` folder, usually against ``mock_server.py``::
+
+    python3 mock_server.py --port 8090 --latency-ms 50 &
+    python3 -m benchmarks.loadgen client --base-url http://127.0.0.1:8090 -c 32 -n 2000
+    python3 -m benchmarks.loadgen workflow --base-url http://127.0.0.1:8090 -c 16 -d 30
+    python3 -m benchmarks.loadgen http --url http://127.0.0.1:8080/api/characters -c 32 -d 30
+
+Each run reports throughput and p50/p95/p99 latency; ``--json`` prints the
+same numbers as a single JSON object for scripting.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from ninja_sage import NinjaSageClient, NinjaSageWorkflow, WorkflowConfig
+from ninja_sage.sessions import SessionPool
+from ninja_sage.stats import LatencyStats
+
+
+def _session_pool(args: argparse.Namespace) -> SessionPool:
+    return SessionPool(pool_maxsize=max(args.concurrency, 1), per_thread=args.per_thread_sessions)
+
+
+def _client_operation(args: argparse.Namespace) -> Callable[[], None]:
+    # One client for every worker thread; connections come from its pool.
+    client = NinjaSageClient(base_url=args.base_url, sessions=_session_pool(args))
+
+    def _op() -> None:
+        client.invoke(args.target, body=[[args.channel]])
+
+    return _op
+
+
+def _workflow_config(args: argparse.Namespace, index: int) -> WorkflowConfig:
+    base = args.base_url.rstrip("/")
+    return WorkflowConfig.from_mapping(
+        {
+            "base_url": base,
+            "channel": args.channel,
+            "analytics_base_url": args.asset_base_url or f"{base}/static/lib/",
+            "library_url": args.library_url or f"{base}/static/lib/library.bin",
+            "credentials": {"username": f"{args.username}{index}", "password": args.password},
+        }
+    )
+
+
+def _workflow_operation(args: argparse.Namespace) -> Callable[[], None]:
+    local = threading.local()
+    counter = itertools.count()
+    client = NinjaSageClient(base_url=args.base_url, sessions=_session_pool(args))
+
+    def _op() -> None:
+        workflow = getattr(local, "workflow", None)
+        if workflow is None:
+            config = _workflow_config(args, next(counter) % max(args.accounts, 1))
+            workflow = local.workflow = NinjaSageWorkflow(client, config)
+        workflow.run()
+
+    return _op
+
+
+def _http_operation(args: argparse.Namespace) -> Callable[[], None]:
+    data = args.body.encode("utf-8") if args.body else None
+    method = "POST" if data is not None else "GET"
+
+    def _op() -> None:
+        request = urllib.request.Request(
+            args.url,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=args.timeout) as resp:
+            resp.read()
+
+    return _op
+
+
+OPERATIONS = {
+    "client": _client_operation,
+    "workflow": _workflow_operation,
+    "http": _http_operation,
+}
+
+
+def run_load(
+    operation: Callable[[], None],
+    *,
+    concurrency: int,
+    total: int | None,
+    duration: float | None,
+    warmup: int = 0,
+) -> tuple[LatencyStats, float]:
+    """Run *operation* from *concurrency* threads; return stats and wall time."""
+
+    for _ in range(warmup):
+        operation()
+
+    stats = LatencyStats()
+    remaining = itertools.count()
+    deadline = time.perf_counter() + duration if duration else None
+
+    def _worker() -> None:
+        while True:
+            if total is not None and next(remaining) >= total:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            started = time.perf_counter()
+            try:
+                operation()
+            except Exception:
+                stats.record_error()
+                continue
+            stats.record(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(_worker)
+    return stats, time.perf_counter() - started
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load generator Ninja Sage (client/workflow/http)")
+    parser.add_argument("mode", choices=sorted(OPERATIONS))
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-n", "--requests", type=int, help="Total operasi (default 500 bila -d tidak diisi)")
+    parser.add_argument("-d", "--duration", type=float, help="Durasi uji dalam detik")
+    parser.add_argument("--warmup", type=int, default=1, help="Operasi pemanasan sebelum diukur")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+
+    upstream = parser.add_argument_group("client/workflow")
+    upstream.add_argument("--base-url", default="http://127.0.0.1:8090")
+    upstream.add_argument("--asset-base-url")
+    upstream.add_argument("--library-url")
+    upstream.add_argument("--target", default="SystemLogin.checkVersion")
+    upstream.add_argument("--channel", default="Public 0.52")
+    upstream.add_argument("--username", default="loadgen")
+    upstream.add_argument("--password", default="loadgen")
+    upstream.add_argument("--accounts", type=int, default=16, help="Jumlah akun berbeda untuk mode workflow")
+    upstream.add_argument(
+        "--per-thread-sessions",
+        action="store_true",
+        help="Satu requests.Session per thread (pool koneksi tetap dibagi)",
+    )
+
+    http = parser.add_argument_group("http")
+    http.add_argument("--url", default="http://127.0.0.1:8080/api/characters")
+    http.add_argument("--body", help="Body JSON; jika diisi request dikirim sebagai POST")
+    http.add_argument("--timeout", type=float, default=60.0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    total = args.requests if args.requests or args.duration else 500
+    operation = OPERATIONS[args.mode](args)
+    stats, wall = run_load(
+        operation,
+        concurrency=args.concurrency,
+        total=total,
+        duration=args.duration,
+        warmup=args.warmup,
+    )
+    report = {
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "wall_s": wall,
+        "throughput_rps": stats.count / wall if wall > 0 else 0.0,
+        **stats.summary(),
+    }
+    if args.json:
+        print(json.dumps(report))
+        return
+    print(f"mode={report['mode']} concurrency={report['concurrency']} wall={wall:.2f}s")
+    print(f"  ok={report['count']} errors={report['errors']} throughput={report['throughput_rps']:.1f} req/s")
+    if report["count"]:
+        print(
+            "  latency ms: "
+            f"mean={report['mean_ms']:.1f} p50={report['p50_ms']:.1f} "
+            f"p95={report['p95_ms']:.1f} p99={report['p99_ms']:.1f} max={report['max_ms']:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
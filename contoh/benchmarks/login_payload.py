@@ -0,0 +1,133 @@
+"""Compare per-login payload building with :class:`LoginPayloadFactory`.
+
+Run it from the ``contoh`` folder::
+
+    python3 -m benchmarks.login_payload -n 5000 --batch 1000
+
+``legacy`` is what every loginUser used to cost: ``get_specific_item``,
+``get_random_n_seed`` and a fresh AES-CBC cipher. ``factory`` only
+encrypts the password with the cached key schedule; ``factory (cold)``
+includes building the factory itself (first login after a
+``checkVersion``). ``batch`` times ``SystemLoginRequest.batch_from_credentials``
+against the same number of ``from_credentials`` calls on the old path.
+
+``library.bin`` is served from ``sage_data/library.json`` so the benchmark
+runs offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+import zlib
+from pathlib import Path
+
+from ninja_sage import mock_data
+from ninja_sage.login_payload import (
+    DEFAULT_LIBRARY_URL,
+    LoaderInfo,
+    LoginPayloadFactory,
+    build_login_components,
+    encrypt_password,
+    get_random_n_seed,
+    get_specific_item,
+    load_library_levels,
+)
+from ninja_sage.models import CheckVersionResponse, SystemLoginRequest
+from ninja_sage.transport import set_asset_transport
+
+DEFAULT_SAGE_DATA = Path(__file__).resolve().parents[2] / "sage_data"
+
+
+class _SageDataAssets:
+    """Asset transport serving ``<name>.bin`` from the local sage_data JSON."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def fetch(self, url: str) -> bytes:
+        name = url.rsplit("/", 1)[-1].removesuffix(".bin")
+        source = self.directory / f"{name}.json"
+        raw = source.read_bytes() if source.exists() else b"[]"
+        return zlib.compress(raw)
+
+
+def _legacy(username: str, password: str, seed: int, key: str, loader: LoaderInfo, levels) -> dict:
+    return {
+        "username": username,
+        "encrypted_password": encrypt_password(password, key, seed),
+        "specific_item": get_specific_item(loader, seed, levels),
+        "random_seed": get_random_n_seed(seed, loader),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--number", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000, help="Jumlah kredensial untuk batch API")
+    parser.add_argument("--sage-data", type=Path, default=DEFAULT_SAGE_DATA)
+    parser.add_argument("--json", action="store_true", help="Cetak ringkasan JSON di baris terakhir")
+    args = parser.parse_args()
+
+    set_asset_transport(_SageDataAssets(args.sage_data))
+    version = CheckVersionResponse.from_content(mock_data.check_version())
+    seed, key = int(version.character_seed), version.character_key
+    loader = LoaderInfo()
+    levels = load_library_levels(DEFAULT_LIBRARY_URL)
+    factory = LoginPayloadFactory(seed, key, loader=loader, levels=levels)
+
+    expected = _legacy("bench", "hunter22", seed, key, loader, levels)
+    actual = factory.components("bench", "hunter22")
+    assert all(actual[name] == value for name, value in expected.items()), "factory berbeda dari jalur lama"
+
+    n = args.number
+    t_legacy = timeit.timeit(lambda: _legacy("bench", "hunter22", seed, key, loader, levels), number=n) / n
+    t_cold = (
+        timeit.timeit(
+            lambda: LoginPayloadFactory(seed, key, loader=loader, levels=levels).components("bench", "hunter22"),
+            number=n,
+        )
+        / n
+    )
+    t_factory = timeit.timeit(lambda: factory.components("bench", "hunter22"), number=n) / n
+    t_cached = timeit.timeit(lambda: build_login_components("bench", "hunter22", seed, key), number=n) / n
+    print(f"per login ({n}x)")
+    print(f"  legacy                 : {t_legacy * 1e6:8.2f} us")
+    print(f"  factory (cold)         : {t_cold * 1e6:8.2f} us")
+    print(f"  factory                : {t_factory * 1e6:8.2f} us  ({t_legacy / t_factory:.1f}x)")
+    print(f"  build_login_components : {t_cached * 1e6:8.2f} us  ({t_legacy / t_cached:.1f}x)")
+
+    credentials = [(f"user{i}", f"password-{i}") for i in range(args.batch)]
+    t_single = timeit.timeit(
+        lambda: [
+            SystemLoginRequest(
+                **{
+                    **_legacy(username, password, seed, key, loader, levels),
+                    "character_seed": seed,
+                    "bytes_loaded": loader.bytes_loaded,
+                    "bytes_total": loader.bytes_total,
+                    "character_key": key,
+                    "password_length": len(password),
+                }
+            )
+            for username, password in credentials
+        ],
+        number=3,
+    ) / 3
+    t_batch = (
+        timeit.timeit(
+            lambda: SystemLoginRequest.batch_from_credentials(credentials, character_seed=seed, character_key=key),
+            number=3,
+        )
+        / 3
+    )
+    print(f"batch ({args.batch} kredensial)")
+    print(f"  legacy loop            : {t_single * 1e3:8.2f} ms")
+    print(f"  batch_from_credentials : {t_batch * 1e3:8.2f} ms  ({t_single / t_batch:.1f}x)")
+    if args.json:
+        print(json.dumps({"legacy_us": t_legacy * 1e6, "factory_us": t_factory * 1e6, "batch_ms": t_batch * 1e3}))
+
+
+if __name__ == "__main__":
+    main()
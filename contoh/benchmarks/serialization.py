@@ -0,0 +1,72 @@
+"""Compare ``asdict`` + ``json.dumps`` with :mod:`ninja_sage.serialization`.
+
+Run from the ``contoh`` folder::
+
+    python3 -m benchmarks.serialization -n 2000
+
+The payload is a realistic ``GetCharacterDataResponse`` (and the full
+``WorkflowResult`` around it) built from :mod:`ninja_sage.mock_data`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from dataclasses import asdict
+
+from ninja_sage import mock_data
+from ninja_sage.models import (
+    AnalyticsLibrariesResponse,
+    CheckVersionResponse,
+    EventsServiceGetResponse,
+    GetAllCharactersResponse,
+    GetCharacterDataResponse,
+    SystemLoginResponse,
+    WorkflowResult,
+)
+from ninja_sage.serialization import dumps_bytes
+
+
+def build_character_data() -> GetCharacterDataResponse:
+    return GetCharacterDataResponse.from_content(mock_data.character_data(1_000_001))
+
+
+def build_workflow_result() -> WorkflowResult:
+    login = mock_data.login_user("bench")
+    return WorkflowResult(
+        version=CheckVersionResponse.from_content(mock_data.check_version()),
+        analytics=AnalyticsLibrariesResponse.from_content(mock_data.analytics_libraries()),
+        events=EventsServiceGetResponse.from_content(mock_data.events()),
+        login=SystemLoginResponse.from_content(login),
+        characters=GetAllCharactersResponse.from_content(mock_data.all_characters(login["uid"])),
+        character_data=build_character_data(),
+    )
+
+
+def _asdict_dumps(obj) -> bytes:
+    return json.dumps(asdict(obj), ensure_ascii=False).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    for label, obj in (("GetCharacterDataResponse", build_character_data()), ("WorkflowResult", build_workflow_result())):
+        baseline = _asdict_dumps(obj)
+        fast = dumps_bytes(obj)
+        assert json.loads(baseline) == json.loads(fast), "output serializer berbeda dari asdict"
+        slim = dumps_bytes(obj, exclude_raw=True)
+
+        t_asdict = timeit.timeit(lambda: _asdict_dumps(obj), number=args.number) / args.number
+        t_fast = timeit.timeit(lambda: dumps_bytes(obj), number=args.number) / args.number
+        t_slim = timeit.timeit(lambda: dumps_bytes(obj, exclude_raw=True), number=args.number) / args.number
+        print(f"{label} ({len(fast)} bytes, {len(slim)} bytes tanpa raw)")
+        print(f"  asdict+json.dumps : {t_asdict * 1e6:9.1f} us")
+        print(f"  dumps_bytes       : {t_fast * 1e6:9.1f} us  ({t_asdict / t_fast:.1f}x)")
+        print(f"  dumps_bytes(-raw) : {t_slim * 1e6:9.1f} us  ({t_asdict / t_slim:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""Offline benchmark suite for the hot paths, with baseline regression checks.
+
+Run it from the ``contoh`` folder::
+
+    python3 -m benchmarks.suite                          # table
+    python3 -m benchmarks.suite --json -o hasil.json     # machine-readable
+    python3 -m benchmarks.suite --save-baseline          # store benchmarks/baseline.json
+    python3 -m benchmarks.suite --check                  # exit 1 on regression
+    python3 -m benchmarks.suite -k codec --captures ~/charles-export
+
+Cases (``group.name[payload]``):
+
+* ``codec``: ``encode_envelope`` / ``decode_amf_bytes`` of synthetic
+  envelopes built from :mod:`ninja_sage.mock_data` (``--captures DIR`` adds
+  a case decoding the recorded ``.amf`` files of a capture folder);
+* ``parse``: ``normalize_content`` and every ``from_content`` parser, fed
+  with content decoded by Py3AMF (``ASObject`` & co., like production);
+* ``login``: ``build_login_components`` (cached factory) and a cold
+  :class:`LoginPayloadFactory`;
+* ``analytics``: ``build_analytics_payload`` from the registry and the
+  level-9 zlib it caches;
+* ``serialize``: ``asdict`` + ``json.dumps`` (the old ``api_server`` path)
+  and :func:`dumps_bytes` of a full ``WorkflowResult``;
+* ``sage_data``: ``json.load`` of ``library.json`` and ``GameData.load`` of
+  every table.
+
+Each case is calibrated to run at least ``--min-time`` seconds per repeat;
+the best of ``--repeat`` runs (``us``) is what gets compared. A case
+regresses when it is slower than the baseline median times
+``1 + threshold`` (the median, not the baseline's luckiest run, so one
+fast outlier while recording does not fail every later check);
+``--threshold`` is the default and the baseline file may override it per
+case under ``"thresholds"``. A case that looks slower is measured again
+(``--retries``) and only counts as a regression if every attempt is.
+
+Shared CI machines go through periods where *everything* runs slower. Right
+before each case the suite times a fixed pure-Python reference workload
+(``reference_us``); ``--check`` divides the case time by how much slower
+that reference got since the baseline, so a busy host does not look like
+a regression (``--no-normalize`` compares raw times). Baselines are machine
+specific: record one on the machine (or CI runner) that runs ``--check``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import timeit
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.login_payload import DEFAULT_SAGE_DATA, _SageDataAssets
+from benchmarks.serialization import build_workflow_result
+
+from ninja_sage import mock_data
+from ninja_sage.amf_utils import decode_amf_bytes, encode_envelope
+from ninja_sage.analytics_payload import (
+    DEFAULT_ASSET_BASE_URL,
+    _compress_analytics_payload,
+    build_analytics_payload,
+)
+from ninja_sage.game_data import GameData
+from ninja_sage.login_payload import LoaderInfo, LoginPayloadFactory, build_login_components, load_library_levels
+from ninja_sage.models import (
+    AnalyticsLibrariesResponse,
+    CheckVersionResponse,
+    EventsServiceGetResponse,
+    GetAllCharactersResponse,
+    GetCharacterDataResponse,
+    SystemLoginResponse,
+)
+from ninja_sage.response_utils import extract_first_body, normalize_content
+from ninja_sage.serialization import dumps_bytes
+from ninja_sage.transport import set_asset_transport
+from pyamf import remoting
+
+SCHEMA_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+@dataclass(slots=True)
+class Case:
+    name: str
+    func: Callable[[], Any]
+
+
+def _response_bytes(body: Any) -> bytes:
+    envelope = remoting.Envelope(amfVersion=3)
+    envelope["/1/onResult"] = remoting.Response(body)
+    return encode_envelope(envelope)
+
+
+def _payloads() -> Dict[str, Any]:
+    """Mock responses keyed by the short name used in case names."""
+
+    login = mock_data.login_user("bench")
+    return {
+        "checkVersion": (mock_data.check_version(), CheckVersionResponse),
+        "analytics": (mock_data.analytics_libraries(), AnalyticsLibrariesResponse),
+        "events": (mock_data.events(), EventsServiceGetResponse),
+        "loginUser": (login, SystemLoginResponse),
+        "getAllCharacters": (mock_data.all_characters(login["uid"]), GetAllCharactersResponse),
+        "getCharacterData": (mock_data.character_data(1_000_001), GetCharacterDataResponse),
+    }
+
+
+def build_cases(args: argparse.Namespace) -> List[Case]:
+    cases: List[Case] = []
+    payloads = _payloads()
+
+    # codec ----------------------------------------------------------------
+    request = remoting.Envelope(amfVersion=3)
+    request["/1"] = remoting.Request(target="SystemLogin.checkVersion", body=[["x"]])
+    encoded = {name: _response_bytes(content) for name, (content, _) in payloads.items()}
+    envelopes = {name: decode_amf_bytes(data) for name, data in encoded.items()}
+    request_bytes = encode_envelope(request)
+    cases.append(Case("codec.encode_envelope[request]", lambda: encode_envelope(request)))
+    cases.append(Case("codec.decode_amf_bytes[request]", lambda: decode_amf_bytes(request_bytes)))
+    for name in ("getAllCharacters", "getCharacterData"):
+        envelope, data = envelopes[name], encoded[name]
+        cases.append(Case(f"codec.encode_envelope[{name}]", lambda e=envelope: encode_envelope(e)))
+        cases.append(Case(f"codec.decode_amf_bytes[{name}]", lambda d=data: decode_amf_bytes(d)))
+    if args.captures:
+        blobs = [path.read_bytes() for path in sorted(Path(args.captures).expanduser().rglob("*.amf"))]
+        if blobs:
+
+            def _decode_captures() -> None:
+                for blob in blobs:
+                    try:
+                        decode_amf_bytes(blob)
+                    except Exception:
+                        pass
+
+            cases.append(Case(f"codec.decode_captures[{len(blobs)} file]", _decode_captures))
+
+    # parsers --------------------------------------------------------------
+    bodies = {name: extract_first_body(envelope) for name, envelope in envelopes.items()}
+    cases.append(
+        Case("parse.normalize_content[getCharacterData]", lambda b=bodies["getCharacterData"]: normalize_content(b))
+    )
+    for name, (_, model) in payloads.items():
+        content = normalize_content(bodies[name])
+        cases.append(Case(f"parse.{model.__name__}.from_content", lambda m=model, c=content: m.from_content(c)))
+
+    # login & analytics (offline: assets served from sage_data) -----------
+    set_asset_transport(_SageDataAssets(args.sage_data))
+    version = CheckVersionResponse.from_content(mock_data.check_version())
+    seed, key = int(version.character_seed), version.character_key
+    loader = LoaderInfo()
+    levels = load_library_levels()
+    build_login_components("bench", "hunter22", seed, key)
+    cases.append(Case("login.build_login_components", lambda: build_login_components("bench", "hunter22", seed, key)))
+    cases.append(
+        Case(
+            "login.factory_cold",
+            lambda: LoginPayloadFactory(seed, key, loader=loader, levels=levels).components("bench", "hunter22"),
+        )
+    )
+    build_analytics_payload(DEFAULT_ASSET_BASE_URL)
+    cases.append(Case("analytics.build_analytics_payload", lambda: build_analytics_payload(DEFAULT_ASSET_BASE_URL)))
+    cases.append(Case("analytics.compress_payload", lambda: _compress_analytics_payload(DEFAULT_ASSET_BASE_URL)))
+
+    # serialisation --------------------------------------------------------
+    result = build_workflow_result()
+    cases.append(
+        Case(
+            "serialize.asdict_json[WorkflowResult]",
+            lambda: json.dumps(asdict(result), ensure_ascii=False).encode("utf-8"),
+        )
+    )
+    cases.append(Case("serialize.dumps_bytes[WorkflowResult]", lambda: dumps_bytes(result)))
+    cases.append(Case("serialize.dumps_bytes_no_raw[WorkflowResult]", lambda: dumps_bytes(result, exclude_raw=True)))
+
+    # sage_data ------------------------------------------------------------
+    library = args.sage_data / "library.json"
+    if library.exists():
+        cases.append(Case("sage_data.json_load[library]", lambda: json.loads(library.read_bytes())))
+    if args.sage_data.is_dir():
+        cases.append(Case("sage_data.GameData.load", lambda: GameData.load(args.sage_data)))
+
+    if args.filter:
+        cases = [case for case in cases if any(_matches(case.name, pattern) for pattern in args.filter)]
+    return cases
+
+
+def _matches(name: str, pattern: str) -> bool:
+    return fnmatch.fnmatchcase(name, pattern) if any(ch in pattern for ch in "*?[") else pattern in name
+
+
+def _reference_workload() -> None:
+    # Dict/str/list churn similar to the parsers and serialisers.
+    rows = [{"id": index, "name": f"item_{index}", "level": index % 90} for index in range(200)]
+    json.dumps(sorted(rows, key=lambda row: (row["level"], row["name"])))
+
+
+REFERENCE = Case("reference", _reference_workload)
+
+
+def measure(case: Case, *, repeat: int, min_time: float) -> Dict[str, Any]:
+    result = _time(case, repeat=repeat, min_time=min_time)
+    # Machine speed right now, to normalise against the baseline's.
+    result["reference_us"] = _time(REFERENCE, repeat=3, min_time=min(min_time, 0.02))["us"]
+    return result
+
+
+def _time(case: Case, *, repeat: int, min_time: float) -> Dict[str, Any]:
+    timer = timeit.Timer(case.func)
+    number = 1
+    while True:
+        # Calibrate: grow ``number`` until one repeat lasts ``min_time``.
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+    runs = [elapsed / number] + [timer.timeit(number) / number for _ in range(max(1, repeat) - 1)]
+    return {
+        "us": round(min(runs) * 1e6, 3),
+        "median_us": round(statistics.median(runs) * 1e6, 3),
+        "number": number,
+        "repeat": len(runs),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    threshold: float,
+    *,
+    normalize: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """Per-case verdict against *baseline*: ok, regression, faster, new."""
+
+    reference = baseline.get("results", {})
+    overrides = baseline.get("thresholds", {})
+    verdicts: Dict[str, Dict[str, Any]] = {}
+    for name, result in results.items():
+        base = reference.get(name)
+        if base is None:
+            verdicts[name] = {"status": "new"}
+            continue
+        limit = float(overrides.get(name, threshold))
+        speed = 1.0
+        if normalize and result.get("reference_us") and base.get("reference_us"):
+            speed = result["reference_us"] / base["reference_us"]
+        current = result["us"] / speed
+        ratio = current / base["us"] if base["us"] else 1.0
+        typical = base.get("median_us") or base["us"]
+        if current > typical * (1.0 + limit):
+            status = "regression"
+        elif ratio < 1.0 / (1.0 + limit):
+            status = "faster"
+        else:
+            status = "ok"
+        verdicts[name] = {
+            "status": status,
+            "ratio": round(ratio, 3),
+            "baseline_us": base["us"],
+            "machine_speed": round(speed, 3),
+            "threshold": limit,
+        }
+    return verdicts
+
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filter", action="append", help="Hanya kasus yang namanya cocok (substring/glob)")
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah pengulangan per kasus (diambil yang tercepat)")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Durasi minimum satu pengulangan (detik)")
+    parser.add_argument("--sage-data", type=Path, default=DEFAULT_SAGE_DATA)
+    parser.add_argument("--captures", type=Path, help="Folder rekaman .amf untuk kasus decode_captures")
+    parser.add_argument("-o", "--output", type=Path, help="Tulis hasil JSON ke file ini")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="File baseline (default: %(default)s)")
+    parser.add_argument("--check", action="store_true", help="Bandingkan dengan baseline; exit 1 bila ada regresi")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--retries", type=int, default=2, help="Ukur ulang kasus yang tampak melambat N kali")
+    parser.add_argument(
+        "--normalize",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Koreksi perbandingan dengan kecepatan mesin saat ini (workload referensi)",
+    )
+    parser.add_argument("--threshold", type=float, default=0.25, help="Toleransi perlambatan default (0.25 = +25%%)")
+    args = parser.parse_args()
+
+    cases = build_cases(args)
+    results: Dict[str, Dict[str, Any]] = {}
+    for case in cases:
+        results[case.name] = measure(case, repeat=args.repeat, min_time=args.min_time)
+        if not args.json:
+            stats = results[case.name]
+            print(f"{case.name:<48} {stats['us']:>12.2f} us  (median {stats['median_us']:.2f}, n={stats['number']})")
+
+    report: Dict[str, Any] = {
+        "schema": SCHEMA_VERSION,
+        "created": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "results": results,
+    }
+
+    ok = True
+    if args.check:
+        if not args.baseline.exists():
+            print(f"Baseline {args.baseline} belum ada; jalankan dulu dengan --save-baseline", file=sys.stderr)
+            sys.exit(2)
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        verdicts = compare(results, baseline, args.threshold, normalize=args.normalize)
+        by_name = {case.name: case for case in cases}
+        for _ in range(max(0, args.retries)):
+            suspects = [name for name, verdict in verdicts.items() if verdict["status"] == "regression"]
+            if not suspects:
+                break
+            for name in suspects:
+                again = measure(by_name[name], repeat=args.repeat, min_time=args.min_time)
+                if again["us"] < results[name]["us"]:
+                    results[name] = again
+            verdicts = compare(results, baseline, args.threshold, normalize=args.normalize)
+        regressions = sorted(name for name, verdict in verdicts.items() if verdict["status"] == "regression")
+        ok = not regressions
+        report["comparison"] = {
+            "baseline": str(args.baseline),
+            "baseline_environment": baseline.get("environment"),
+            "ok": ok,
+            "regressions": regressions,
+            "cases": verdicts,
+        }
+        if not args.json:
+            print()
+            for name, verdict in verdicts.items():
+                if verdict["status"] == "new":
+                    print(f"{name:<48} baru (tidak ada di baseline)")
+                    continue
+                change = (verdict["ratio"] - 1.0) * 100
+                print(f"{name:<48} {change:+7.1f}%  {verdict['status']}")
+            print(f"\n{len(regressions)} regresi" if regressions else "\nTidak ada regresi")
+
+    if args.save_baseline:
+        previous = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        stored = {key: report[key] for key in ("schema", "created", "environment", "results")}
+        # Per-case thresholds are hand-tuned: keep them across re-recordings.
+        stored["thresholds"] = previous.get("thresholds", {})
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        if not args.json:
+            print(f"Baseline disimpan ke {args.baseline}")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(report))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
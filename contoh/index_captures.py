@@ -0,0 +1,119 @@
+"""Index, search and inspect folders of AMF captures (Charles exports, --record runs)."""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import sys
+
+from ninja_sage.capture_index import build_index, connect, decode_mapped, render_envelope, search, summary
+
+
+def _timestamp(value: str) -> float:
+    """Accept epoch seconds or an ISO date/time (``2026-10-19`` / ``2026-10-19T08:00``)."""
+
+    try:
+        return float(value)
+    except ValueError:
+        return dt.datetime.fromisoformat(value).timestamp()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default="captures.sqlite", help="File indeks SQLite (default: captures.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index = commands.add_parser("index", help="Pindai folder dan decode semua .amf ke indeks")
+    index.add_argument("directory")
+    index.add_argument("--pattern", default="*.amf", help="Pola nama file (default: *.amf)")
+    index.add_argument("--workers", type=int, default=None, help="Jumlah proses decoder (default: jumlah CPU)")
+    index.add_argument("--rebuild", action="store_true", help="Decode ulang file yang tidak berubah")
+
+    find = commands.add_parser("search", help="Cari pesan di indeks")
+    find.add_argument("--target", help="Target AMF, boleh pakai wildcard SQL %% (mis. 'SystemLogin.%%')")
+    find.add_argument("--kind", choices=("request", "response"))
+    find.add_argument("--status", choices=("onResult", "onStatus", "onDebugEvents"))
+    find.add_argument("--body-status", type=int, help="Field 'status' di body game")
+    find.add_argument("--path", help="Path file, boleh pakai wildcard SQL %%")
+    find.add_argument("--since", type=_timestamp, help="Waktu rekam minimum (epoch / ISO)")
+    find.add_argument("--until", type=_timestamp, help="Waktu rekam maksimum (epoch / ISO)")
+    find.add_argument("--min-size", type=int, help="Ukuran file minimum (byte)")
+    find.add_argument("--errors", action="store_true", help="Hanya file yang gagal di-decode")
+    find.add_argument("--limit", type=int, default=50)
+    find.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON lines")
+
+    commands.add_parser("stats", help="Ringkasan jumlah pesan per target")
+
+    show = commands.add_parser("show", help="Tampilkan isi satu file .amf secara bertahap")
+    show.add_argument("file")
+    show.add_argument("--max-string", type=int, default=200, help="Potong string lebih panjang dari N karakter")
+    show.add_argument("--max-items", type=int, default=20, help="Tampilkan paling banyak N item per list/dict")
+    show.add_argument("--depth", type=int, default=4, help="Kedalaman maksimum yang dibuka")
+    show.add_argument("--lines", type=int, default=0, help="Berhenti setelah N baris (0 = semua)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "show":
+        lines = render_envelope(
+            decode_mapped(args.file),
+            max_string=args.max_string,
+            max_items=args.max_items,
+            max_depth=args.depth,
+        )
+        for count, line in enumerate(lines, 1):
+            print(line)
+            if args.lines and count >= args.lines:
+                print("… (dipotong, pakai --lines 0 untuk semua)")
+                break
+        return
+
+    conn = connect(args.db)
+    if args.command == "index":
+        report = build_index(conn, args.directory, pattern=args.pattern, workers=args.workers, rebuild=args.rebuild)
+        print(
+            f"{report.scanned} file dipindai: {report.indexed} di-index, {report.skipped} tidak berubah, "
+            f"{report.failed} gagal, {report.removed} dihapus; {report.messages} pesan dalam {report.elapsed:.2f}s"
+        )
+    elif args.command == "stats":
+        print(json.dumps(summary(conn), indent=2, ensure_ascii=False))
+    else:
+        rows = search(
+            conn,
+            target=args.target,
+            kind=args.kind,
+            status=args.status,
+            body_status=args.body_status,
+            path=args.path,
+            since=args.since,
+            until=args.until,
+            min_size=args.min_size,
+            errors=args.errors,
+            limit=args.limit,
+        )
+        for row in rows:
+            if args.json:
+                print(json.dumps(row, ensure_ascii=False))
+                continue
+            when = dt.datetime.fromtimestamp(row["captured_at"]).isoformat(timespec="seconds")
+            if row["error"]:
+                print(f"{when}  {row['size']:>8}  GAGAL {row['error']}  {row['path']}")
+                continue
+            if row["kind"] is None:
+                # Envelope valid tapi tanpa pesan sama sekali.
+                print(f"{when}  {row['size']:>8}  (tanpa pesan)  {row['path']}")
+                continue
+            status = row["status"] or "-"
+            body_status = "-" if row["body_status"] is None else row["body_status"]
+            print(
+                f"{when}  {row['size']:>8}  {row['kind']:<8} {row['target'] or row['response_path']:<40} "
+                f"{status:<9} status={body_status}  {row['path']}"
+            )
+        if not rows:
+            print("Tidak ada hasil.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Server AMF tiruan untuk uji beban & benchmark tanpa menyentuh server game.
+
+Server ini menjawab:
+- POST /amf
+    ``SystemLogin.checkVersion``, ``SystemLogin.loginUser``,
+    ``SystemLogin.getAllCharacters``, ``SystemLogin.getCharacterData``,
+    ``Analytics.libraries`` dan ``EventsService.get`` dengan payload
+    sintetis berukuran realistis (lihat :mod:`ninja_sage.mock_data`).
+- GET /static/lib/<nama>.bin
+    Asset CDN (``library.bin``, ``skills.bin``, ...) yang dibangun dari
+    ``sage_data/*.json`` lalu dikompres zlib seperti aslinya.
+
+Latensi (``--latency-ms`` + ``--jitter-ms``) dan error (``--error-rate``
+untuk HTTP 500, ``--amf-error-rate`` untuk response ``status=0``) bisa
+diatur supaya perilaku client & api_server di bawah gangguan ikut teruji.
+
+Contoh::
+
+    python3 mock_server.py --port 8090 --latency-ms 80 --jitter-ms 40
+
+lalu arahkan ``config.json`` ke server ini::
+
+    {
+      "base_url": "http://127.0.0.1:8090",
+      "analytics_base_url": "http://127.0.0.1:8090/static/lib/",
+      "library_url": "http://127.0.0.1:8090/static/lib/library.bin",
+      "credentials": {"username": "mock", "password": "mock"}
+    }
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping
+
+from pyamf import remoting
+
+from ninja_sage import mock_data
+from ninja_sage.amf_utils import decode_amf_bytes, encode_envelope, iter_envelope
+from ninja_sage.analytics_payload import ASSET_NAMES
+
+
+DEFAULT_SAGE_DATA = Path(__file__).resolve().parent.parent / "sage_data"
+
+
+def _first_param(body: Any) -> list[Any]:
+    """Flash membungkus parameter dalam array luar: ``[[a, b, ...]]``."""
+
+    if body and isinstance(body[0], (list, tuple)):
+        return list(body[0])
+    return list(body or [])
+
+
+def _login(params: list[Any]) -> Dict[str, Any]:
+    username = str(params[0]) if params else "mock"
+    return mock_data.login_user(username)
+
+
+def _all_characters(params: list[Any]) -> Dict[str, Any]:
+    uid = int(params[0]) if params else 100_000
+    return mock_data.all_characters(uid)
+
+
+def _character_data(params: list[Any]) -> Dict[str, Any]:
+    char_id = int(params[0]) if params else 1_000_000
+    return mock_data.character_data(char_id)
+
+
+HANDLERS: Dict[str, Callable[[list[Any]], Mapping[str, Any]]] = {
+    "SystemLogin.checkVersion": lambda params: mock_data.check_version(),
+    "SystemLogin.loginUser": _login,
+    "SystemLogin.getAllCharacters": _all_characters,
+    "SystemLogin.getCharacterData": _character_data,
+    "Analytics.libraries": lambda params: mock_data.analytics_libraries(),
+    "EventsService.get": lambda params: mock_data.events(),
+}
+
+
+class MockSettings:
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        amf_error_rate: float = 0.0,
+        sage_data: Path = DEFAULT_SAGE_DATA,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.amf_error_rate = amf_error_rate
+        self.sage_data = sage_data
+        self._assets: Dict[str, bytes] = {}
+        self._assets_lock = threading.Lock()
+        self._rng = random.Random()
+
+    def delay(self) -> None:
+        delay_ms = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+    def roll(self, rate: float) -> bool:
+        return rate > 0 and self._rng.random() < rate
+
+    def asset(self, name: str) -> bytes | None:
+        with self._assets_lock:
+            cached = self._assets.get(name)
+            if cached is not None:
+                return cached
+            source = self.sage_data / f"{name}.json"
+            if source.exists():
+                # Kompres ulang JSON ringkas supaya ukuran .bin mendekati aslinya.
+                data = json.loads(source.read_text(encoding="utf-8"))
+                raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            else:
+                raw = b"[]"
+            cached = zlib.compress(raw, level=6)
+            self._assets[name] = cached
+            return cached
+
+
+class MockAmfHandler(BaseHTTPRequestHandler):
+    server_version = "NinjaSageMock/0.1"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    settings: MockSettings = MockSettings()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature from stdlib
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # type: ignore[override]
+        prefix = "/static/lib/"
+        if self.path.startswith(prefix) and self.path.endswith(".bin"):
+            name = self.path[len(prefix) : -len(".bin")]
+            if name in ASSET_NAMES:
+                self.settings.delay()
+                self._send(200, self.settings.asset(name), "application/octet-stream")
+                return
+        self._send(404, b"not found", "text/plain")
+
+    def do_HEAD(self) -> None:  # type: ignore[override]
+        # Used by the client's connection warm-up; keeps the connection open.
+        self.send_response(200 if self.path.startswith("/amf") else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self) -> None:  # type: ignore[override]
+        length = int(self.headers.get("Content-Length") or "0")
+        payload = self.rfile.read(length) if length > 0 else b""
+        if not self.path.startswith("/amf"):
+            self._send(404, b"not found", "text/plain")
+            return
+
+        self.settings.delay()
+        if self.settings.roll(self.settings.error_rate):
+            self._send(500, b"injected error", "text/plain")
+            return
+
+        try:
+            request_envelope = decode_amf_bytes(payload)
+        except Exception:  # pragma: no cover - malformed input
+            self._send(400, b"bad amf", "text/plain")
+            return
+
+        response_envelope = remoting.Envelope(amfVersion=request_envelope.amfVersion)
+        for response_path, message in iter_envelope(request_envelope):
+            handler = HANDLERS.get(message.target)
+            if handler is None:
+                body: Mapping[str, Any] = {"status": 0, "error": 404}
+            elif self.settings.roll(self.settings.amf_error_rate):
+                body = {"status": 0, "error": 1}
+            else:
+                body = handler(_first_param(message.body))
+            response_envelope[f"{response_path}/onResult"] = remoting.Response(body)
+
+        self._send(200, encode_envelope(response_envelope), "application/x-amf")
+
+
+def run(
+    host: str = "127.0.0.1",
+    port: int = 8090,
+    settings: MockSettings | None = None,
+) -> None:
+    handler = type("ConfiguredMockAmfHandler", (MockAmfHandler,), {"settings": settings or MockSettings()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"[*] Mock AMF server berjalan di http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover - manual shutdown
+        print("\n[*] Mematikan server...")
+    finally:
+        server.server_close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mock server AMF Ninja Sage untuk uji beban")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latensi dasar per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Tambahan latensi acak 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Peluang HTTP 500 (0..1)")
+    parser.add_argument("--amf-error-rate", type=float, default=0.0, help="Peluang response status=0 (0..1)")
+    parser.add_argument("--sage-data", type=Path, default=DEFAULT_SAGE_DATA, help="Folder sumber asset JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(
+        args.host,
+        args.port,
+        MockSettings(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            amf_error_rate=args.amf_error_rate,
+            sage_data=args.sage_data,
+        ),
+    )
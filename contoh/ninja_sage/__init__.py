@@ -1,29 +1,100 @@
-"""Client helpers for replaying Ninja Sage AMF requests."""
-
-from .amf_utils import decode_amf_bytes, encode_envelope, iter_envelope, load_amf_from_file
-from .client import NinjaSageClient
-from .models import (
-    AnalyticsLibrariesRequest,
-    AnalyticsLibrariesResponse,
-    CheckVersionRequest,
-    CheckVersionResponse,
-    EventCollections,
-    EventsServiceGetRequest,
-    EventsServiceGetResponse,
-    GetAllCharactersRequest,
-    GetAllCharactersResponse,
-    SystemLoginRequest,
-    SystemLoginResponse,
-    WorkflowResult,
-    CharacterCoreData,
-    CharacterInventory,
-    CharacterPoints,
-    CharacterSets,
-    CharacterSlots,
-    GetCharacterDataResponse,
-)
-from .services import AnalyticsService, EventsService, SystemLoginService
-from .workflow import Credentials, NinjaSageWorkflow, WorkflowConfig, print_summary
+"""Client helpers for replaying Ninja Sage AMF requests.
+
+Public names are loaded lazily on first attribute access (PEP 562), so
+``from ninja_sage import decode_amf_bytes`` only imports Py3AMF and not
+``requests``, ``Crypto`` or ``rich``.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .amf_utils import decode_amf_bytes, encode_envelope, iter_envelope, load_amf_from_file
+    from .client import NinjaSageClient
+    from .models import (
+        AnalyticsLibrariesRequest,
+        AnalyticsLibrariesResponse,
+        CharacterCoreData,
+        CharacterInventory,
+        CharacterPoints,
+        CharacterSets,
+        CharacterSlots,
+        CheckVersionRequest,
+        CheckVersionResponse,
+        EventCollections,
+        EventsServiceGetRequest,
+        EventsServiceGetResponse,
+        GetAllCharactersRequest,
+        GetAllCharactersResponse,
+        GetCharacterDataResponse,
+        SystemLoginRequest,
+        SystemLoginResponse,
+        WorkflowResult,
+    )
+    from .middleware import AmfCall, CachePolicy, ResponseCache
+    from .services import AnalyticsService, EventsService, SystemLoginService
+    from .sessions import SessionPool
+    from .transport import HttpTransport, RecordingTransport, ReplayTransport, set_asset_transport
+    from .workflow import Credentials, NinjaSageWorkflow, WorkflowConfig, print_summary
+
+# Public name -> submodule that defines it.
+_LAZY = {
+    "NinjaSageClient": "client",
+    "decode_amf_bytes": "amf_utils",
+    "encode_envelope": "amf_utils",
+    "iter_envelope": "amf_utils",
+    "load_amf_from_file": "amf_utils",
+    "AnalyticsLibrariesRequest": "models",
+    "AnalyticsLibrariesResponse": "models",
+    "CheckVersionRequest": "models",
+    "CheckVersionResponse": "models",
+    "EventCollections": "models",
+    "EventsServiceGetRequest": "models",
+    "EventsServiceGetResponse": "models",
+    "GetAllCharactersRequest": "models",
+    "GetAllCharactersResponse": "models",
+    "SystemLoginRequest": "models",
+    "SystemLoginResponse": "models",
+    "WorkflowResult": "models",
+    "CharacterCoreData": "models",
+    "CharacterInventory": "models",
+    "CharacterPoints": "models",
+    "CharacterSets": "models",
+    "CharacterSlots": "models",
+    "GetCharacterDataResponse": "models",
+    "AmfCall": "middleware",
+    "CachePolicy": "middleware",
+    "ResponseCache": "middleware",
+    "SessionPool": "sessions",
+    "AnalyticsService": "services",
+    "EventsService": "services",
+    "SystemLoginService": "services",
+    "HttpTransport": "transport",
+    "RecordingTransport": "transport",
+    "ReplayTransport": "transport",
+    "set_asset_transport": "transport",
+    "Credentials": "workflow",
+    "NinjaSageWorkflow": "workflow",
+    "WorkflowConfig": "workflow",
+    "print_summary": "workflow",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cache on the package so the next access skips __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "NinjaSageClient",
@@ -43,6 +114,16 @@ __all__ = [
     "SystemLoginRequest",
     "SystemLoginResponse",
     "WorkflowResult",
+    # Transports
+    "HttpTransport",
+    "RecordingTransport",
+    "ReplayTransport",
+    "set_asset_transport",
+    "SessionPool",
+    # Client middleware
+    "AmfCall",
+    "CachePolicy",
+    "ResponseCache",
     # Service layer
     "AnalyticsService",
     "EventsService",
@@ -55,6 +55,14 @@ def iter_envelope(envelope: remoting.Envelope):
         yield response_path, message
 
 
+def envelope_target(envelope: remoting.Envelope) -> str | None:
+    """Return the ``target`` of the first message in *envelope*, if any."""
+
+    for _, message in iter_envelope(envelope):
+        return getattr(message, "target", None)
+    return None
+
+
 def envelope_summary(envelope: remoting.Envelope) -> List[dict[str, Any]]:
     """Return a simplified list of request/response metadata for logging."""
 
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import json
-import urllib.request
 import zlib
 from collections import OrderedDict
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
+from .assets import default_registry
+from .transport import fetch_asset
+
 DEFAULT_ASSET_BASE_URL = "https://ns-assets.ninjasage.id/static/lib/"
 
 ASSET_NAMES = [
@@ -48,22 +50,30 @@ EXPECTED_ORDER = [
 ]
 
 
-def _download(url: str) -> bytes:
-    with urllib.request.urlopen(url) as resp:
-        return resp.read()
+# Concurrent asset downloads; the assets are independent, so a cold fetch
+# costs about one round trip per batch instead of one per asset.
+ASSET_FETCH_WORKERS = 8
 
 
-@lru_cache(maxsize=2)
 def fetch_asset_lengths(base_url: str = DEFAULT_ASSET_BASE_URL) -> Dict[str, int]:
+    """Byte size of every analytics asset, shared through the asset registry."""
+
+    return default_registry().get("asset_lengths", base_url, lambda: _measure_asset_lengths(base_url))
+
+
+def _measure_asset_lengths(base_url: str) -> Dict[str, int]:
     base = base_url.rstrip("/")
-    lengths: Dict[str, int] = {}
-    for name in ASSET_NAMES:
-        data = _download(f"{base}/{name}.bin")
-        lengths[name] = len(data)
-    return lengths
+    with ThreadPoolExecutor(max_workers=ASSET_FETCH_WORKERS, thread_name_prefix="asset-fetch") as pool:
+        sizes = pool.map(lambda name: len(fetch_asset(f"{base}/{name}.bin")), ASSET_NAMES)
+        return dict(zip(ASSET_NAMES, sizes))
 
 
 def build_analytics_payload(base_url: str = DEFAULT_ASSET_BASE_URL) -> bytes:
+    # Level-9 zlib is the expensive part; cache it next to the lengths.
+    return default_registry().get("analytics_payload", base_url, lambda: _compress_analytics_payload(base_url))
+
+
+def _compress_analytics_payload(base_url: str) -> bytes:
     lengths = fetch_asset_lengths(base_url)
     ordered = OrderedDict((key, lengths[key]) for key in EXPECTED_ORDER)
     json_str = json.dumps(ordered, separators=(",", ":")).encode("utf-8")
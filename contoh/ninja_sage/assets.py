@@ -0,0 +1,242 @@
+"""Shared registry for values derived from CDN assets.
+
+``library.bin`` levels, the analytics asset lengths and the compressed
+``Analytics.libraries`` payload only change when the game publishes a new
+CDN build. :class:`AssetRegistry` holds them for every caller in the
+process:
+
+* concurrent misses of one asset share a single download
+  (:class:`~ninja_sage.singleflight.SingleFlight` via :class:`TTLCache`);
+* after ``ttl`` seconds an entry is refreshed in the background while the
+  old value keeps being served (``stale_ttl``);
+* :meth:`AssetRegistry.observe_version` ties entries to
+  ``CheckVersionResponse.cdn``: the first version seen is adopted, a
+  different one later drops every entry;
+* an optional :class:`AssetStore` directory shares loaded values between
+  processes (pre-fork workers, CLI runs), with a file lock so only one
+  process downloads an asset at a time.
+
+Code calls :func:`load_library_levels` / :func:`fetch_asset_lengths` as
+before; they go through :func:`default_registry`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, TypeVar
+
+from .singleflight import TTLCache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: store without cross-process locking
+    fcntl = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class _Stored:
+    version: str | None
+    stored_at: float
+    value: Any
+
+
+class AssetStore:
+    """Directory of asset values shared between processes.
+
+    Every entry lives in its own file written atomically; a per-entry lock
+    file (``flock``) makes the first process download while the others
+    wait and then read its result. A file is one JSON header line followed
+    by the value as JSON text or as a raw blob, so reading a directory
+    someone else can write never executes anything (unlike ``pickle``).
+    Only JSON-compatible values and ``bytes`` are stored.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: Hashable) -> Path:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.asset"
+
+    def read(self, key: Hashable) -> _Stored | None:
+        try:
+            with self._path(key).open("rb") as handle:
+                header = json.loads(handle.readline())
+                body = handle.read()
+            value = body if header["type"] == "bytes" else json.loads(body)
+            return _Stored(version=header["version"], stored_at=float(header["stored_at"]), value=value)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def write(self, key: Hashable, stored: _Stored) -> None:
+        if isinstance(stored.value, (bytes, bytearray)):
+            kind, body = "bytes", bytes(stored.value)
+        else:
+            try:
+                kind, body = "json", json.dumps(stored.value, separators=(",", ":")).encode("utf-8")
+            except (TypeError, ValueError):
+                # Not representable without pickle: keep it in memory only.
+                return
+        header = json.dumps({"type": kind, "version": stored.version, "stored_at": stored.stored_at})
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".asset")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(header.encode("utf-8") + b"\n")
+                handle.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    @contextmanager
+    def lock(self, key: Hashable) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with self._path(key).with_suffix(".lock").open("a+b") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class AssetRegistry:
+    """Single-flight, version-aware cache of CDN-derived values."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 3600.0,
+        stale_ttl: float = 86400.0,
+        max_entries: int = 32,
+        store: AssetStore | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.store = store
+        self.version: str | None = None
+        self.invalidations = 0
+        self.store_hits = 0
+        self._generation = 0
+        self._clock = clock
+        # Store entries older than the last invalidation are not reused.
+        self._valid_after = 0.0
+        self._lock = threading.Lock()
+        self._cache: TTLCache[Any] = TTLCache(ttl=ttl, stale_ttl=stale_ttl, max_entries=max_entries)
+
+    def get(self, kind: str, source: str, loader: Callable[[], T]) -> T:
+        """Return the value of *kind* for *source* (a URL), loading it once."""
+
+        generation = self._generation
+        return self._cache.get_or_load(
+            (kind, source, generation),
+            lambda: self._load((kind, source), loader),
+        )
+
+    def observe_version(self, cdn: str | None) -> bool:
+        """Record the CDN build from ``checkVersion``; ``True`` if it changed.
+
+        The first version seen is adopted without dropping anything (the
+        warm-up runs before any ``checkVersion``).
+        """
+
+        if not cdn:
+            return False
+        with self._lock:
+            if self.version is None or self.version == cdn:
+                self.version = cdn
+                return False
+            self.version = cdn
+            self._bump_locked()
+        self._cache.invalidate()
+        return True
+
+    def invalidate(self) -> None:
+        """Drop every cached value; older store entries are ignored from now on."""
+
+        with self._lock:
+            self._bump_locked()
+        self._cache.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._cache.stats.as_dict(),
+            "entries": len(self._cache),
+            "version": self.version,
+            "invalidations": self.invalidations,
+            "store_hits": self.store_hits,
+            "store": str(self.store.directory) if self.store is not None else None,
+        }
+
+    # Internal -------------------------------------------------------------
+    def _bump_locked(self) -> None:
+        self._generation += 1
+        self.invalidations += 1
+        self._valid_after = self._clock()
+
+    def _usable(self, stored: _Stored | None) -> bool:
+        if stored is None or stored.stored_at < self._valid_after:
+            return False
+        if self._clock() - stored.stored_at >= self.ttl:
+            return False
+        # Values loaded before any checkVersion carry no version.
+        return stored.version is None or self.version is None or stored.version == self.version
+
+    def _load(self, key: Hashable, loader: Callable[[], T]) -> T:
+        store = self.store
+        if store is None:
+            return loader()
+        stored = store.read(key)
+        if not self._usable(stored):
+            with store.lock(key):
+                # Another process may have filled it while we waited for the lock.
+                stored = store.read(key)
+                if not self._usable(stored):
+                    value = loader()
+                    store.write(key, _Stored(version=self.version, stored_at=self._clock(), value=value))
+                    return value
+        with self._lock:
+            self.store_hits += 1
+        return stored.value
+
+
+_default = AssetRegistry()
+_default_lock = threading.Lock()
+
+
+def default_registry() -> AssetRegistry:
+    """Registry used by :func:`load_library_levels` and friends."""
+
+    return _default
+
+
+def set_default_registry(registry: AssetRegistry | None) -> AssetRegistry:
+    """Install *registry* as the process default and return the previous one.
+
+    ``None`` restores a fresh in-memory registry.
+    """
+
+    global _default
+    with _default_lock:
+        previous = _default
+        _default = registry if registry is not None else AssetRegistry()
+    return previous
+
+
+__all__ = ["AssetRegistry", "AssetStore", "default_registry", "set_default_registry"]
@@ -0,0 +1,425 @@
+"""Index directories of ``.amf`` captures into SQLite and browse them lazily.
+
+Charles exports (and :class:`~ninja_sage.transport.RecordingTransport`
+capture directories) can hold thousands of envelopes. :func:`build_index`
+decodes them on a process pool: every worker maps the file read-only with
+``mmap`` and hands the mapping straight to Py3AMF, then sends back only a
+few scalar columns per message. The parent writes them to SQLite:
+
+* ``files``: path, size, mtime, capture time, AMF version, decode error;
+* ``messages``: one row per envelope message with its kind
+  (request/response), response path, target, AMF status (``onResult``,
+  ``onStatus``) and the ``status``/``error`` fields of the game body.
+
+Re-indexing skips files whose size and mtime did not change. For response
+envelopes the target is taken from ``manifest.jsonl`` when the directory
+was recorded by ``RecordingTransport``.
+
+:func:`render_envelope` is the inspector: it yields the lines of an
+``envelope_summary``-like dump one at a time, truncating long strings,
+long containers and deep nesting, so a huge body can be paged through
+without formatting it whole.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from .amf_utils import decode_amf_bytes, iter_envelope
+from .transport import MANIFEST_NAME, load_manifest
+
+try:
+    from pyamf import remoting
+except ImportError as exc:  # pragma: no cover - dependency hint
+    raise ImportError(
+        "Py3AMF (module 'pyamf') belum terpasang. Jalankan 'pip install -r requirements.txt' "
+        "atau lihat README untuk instruksi instalasi."
+    ) from exc
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    captured_at REAL NOT NULL,
+    amf_version INTEGER,
+    messages INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    response_path TEXT,
+    target TEXT,
+    status TEXT,
+    body_status INTEGER,
+    body_error INTEGER,
+    PRIMARY KEY (path, idx)
+);
+CREATE INDEX IF NOT EXISTS messages_target ON messages(target);
+CREATE INDEX IF NOT EXISTS messages_status ON messages(status, body_status);
+CREATE INDEX IF NOT EXISTS files_captured_at ON files(captured_at);
+"""
+
+_STATUS_NAMES = {
+    remoting.STATUS_OK: "onResult",
+    remoting.STATUS_ERROR: "onStatus",
+    remoting.STATUS_DEBUG: "onDebugEvents",
+}
+
+
+@dataclass(slots=True)
+class IndexReport:
+    scanned: int = 0
+    indexed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    removed: int = 0
+    messages: int = 0
+    elapsed: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "scanned": self.scanned,
+            "indexed": self.indexed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "removed": self.removed,
+            "messages": self.messages,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+def connect(db_path: str | Path) -> sqlite3.Connection:
+    """Open (and create if needed) an index database."""
+
+    conn = sqlite3.connect(str(Path(db_path).expanduser()))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def decode_mapped(path: str | Path) -> remoting.Envelope:
+    """Decode an ``.amf`` file through a read-only memory map."""
+
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return decode_amf_bytes(b"")
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_amf_bytes(mapped)
+
+
+def _body_fields(body: Any) -> Tuple[int | None, int | None]:
+    if isinstance(body, (list, tuple)) and len(body) == 1:
+        body = body[0]
+    if not isinstance(body, Mapping):
+        return None, None
+    status, error = body.get("status"), body.get("error")
+    return (
+        status if isinstance(status, int) and not isinstance(status, bool) else None,
+        error if isinstance(error, int) and not isinstance(error, bool) else None,
+    )
+
+
+def _index_one(job: Tuple[str, str | None]) -> Dict[str, Any]:
+    """Worker: decode one capture and return its rows (runs in a subprocess)."""
+
+    path, manifest_target = job
+    try:
+        envelope = decode_mapped(path)
+    except Exception as exc:
+        return {"path": path, "error": f"{type(exc).__name__}: {exc}", "messages": []}
+    rows: List[Tuple[Any, ...]] = []
+    for idx, (response_path, message) in enumerate(iter_envelope(envelope)):
+        if isinstance(message, remoting.Request):
+            body = message.body[0] if message.body else None
+            rows.append((idx, "request", response_path, message.target, None, *_body_fields(body)))
+        else:
+            status = _STATUS_NAMES.get(getattr(message, "status", None))
+            rows.append((idx, "response", response_path, manifest_target, status, *_body_fields(message.body)))
+    return {"path": path, "error": None, "amf_version": envelope.amfVersion, "messages": rows}
+
+
+def _manifest_info(directory: Path) -> Dict[str, Tuple[str | None, float]]:
+    """``file path -> (target, recorded_at)`` for RecordingTransport directories."""
+
+    info: Dict[str, Tuple[str | None, float]] = {}
+    for manifest in directory.rglob(MANIFEST_NAME):
+        try:
+            entries = load_manifest(manifest.parent)
+        except (OSError, ValueError, KeyError):
+            continue
+        for entry in entries:
+            for name in (entry.request_file, entry.response_file):
+                if name:
+                    info[str(manifest.parent / name)] = (entry.target, entry.recorded_at)
+    return info
+
+
+def scan(directory: str | Path, pattern: str = "*.amf") -> Iterator[Path]:
+    """Every capture file below *directory*, in path order."""
+
+    yield from sorted(path for path in Path(directory).expanduser().rglob(pattern) if path.is_file())
+
+
+def build_index(
+    conn: sqlite3.Connection,
+    directory: str | Path,
+    *,
+    pattern: str = "*.amf",
+    workers: int | None = None,
+    rebuild: bool = False,
+    chunksize: int = 16,
+) -> IndexReport:
+    """(Re)index every capture below *directory* into *conn*."""
+
+    started = time.perf_counter()
+    root = Path(directory).expanduser().resolve()
+    report = IndexReport()
+    # Exact prefix match: LIKE would treat "_"/"%" in the root as wildcards
+    # and later prune a sibling directory's rows as "removed".
+    prefix = f"{root}{os.sep}"
+    known = {
+        row["path"]: (row["size"], row["mtime"])
+        for row in conn.execute(
+            "SELECT path, size, mtime FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+        )
+    }
+    manifest = _manifest_info(root)
+
+    pending: Dict[str, Tuple[int, float, float]] = {}
+    jobs: List[Tuple[str, str | None]] = []
+    seen = set()
+    for path in scan(root, pattern):
+        report.scanned += 1
+        key = str(path)
+        seen.add(key)
+        stat = path.stat()
+        if not rebuild and known.get(key) == (stat.st_size, stat.st_mtime):
+            report.skipped += 1
+            continue
+        target, recorded_at = manifest.get(key, (None, 0.0))
+        pending[key] = (stat.st_size, stat.st_mtime, recorded_at or stat.st_mtime)
+        jobs.append((key, target))
+
+    removed = [path for path in known if path not in seen]
+    with conn:
+        conn.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in removed))
+    report.removed = len(removed)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batch: List[Dict[str, Any]] = []
+            for result in pool.map(_index_one, jobs, chunksize=chunksize):
+                batch.append(result)
+                if len(batch) >= 256:
+                    _store(conn, batch, pending, report)
+                    batch = []
+            _store(conn, batch, pending, report)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def _store(
+    conn: sqlite3.Connection,
+    results: Sequence[Dict[str, Any]],
+    pending: Mapping[str, Tuple[int, float, float]],
+    report: IndexReport,
+) -> None:
+    now = time.time()
+    with conn:
+        for result in results:
+            path = result["path"]
+            size, mtime, captured_at = pending[path]
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            conn.execute(
+                "INSERT INTO files (path, size, mtime, captured_at, amf_version, messages, error, indexed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, size, mtime, captured_at, result.get("amf_version"), len(result["messages"]), result["error"], now),
+            )
+            conn.executemany(
+                "INSERT INTO messages (path, idx, kind, response_path, target, status, body_status, body_error)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((path, *row) for row in result["messages"]),
+            )
+            if result["error"]:
+                report.failed += 1
+            else:
+                report.indexed += 1
+            report.messages += len(result["messages"])
+
+
+def search(
+    conn: sqlite3.Connection,
+    *,
+    target: str | None = None,
+    kind: str | None = None,
+    status: str | None = None,
+    body_status: int | None = None,
+    path: str | None = None,
+    since: float | None = None,
+    until: float | None = None,
+    min_size: int | None = None,
+    errors: bool = False,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    """Query the index; ``target``/``path`` accept ``%`` as a wildcard.
+
+    Files without messages (an empty envelope, or a decode error) come back
+    once with the message columns set to ``None``.
+    """
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    for column, value in (("m.target", target), ("f.path", path)):
+        if value is not None:
+            clause, value = _match(column, value)
+            clauses.append(clause)
+            params.append(value)
+    for column, value in (("m.kind", kind), ("m.status", status), ("m.body_status", body_status)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        clauses.append("f.captured_at >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("f.captured_at < ?")
+        params.append(until)
+    if min_size is not None:
+        clauses.append("f.size >= ?")
+        params.append(min_size)
+    if errors:
+        clauses.append("f.error IS NOT NULL")
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = (
+        "SELECT f.path, f.size, f.captured_at, f.error, m.idx, m.kind, m.response_path, m.target,"
+        " m.status, m.body_status, m.body_error"
+        f" FROM files f LEFT JOIN messages m ON m.path = f.path {where}"
+        " ORDER BY f.captured_at, f.path, m.idx LIMIT ?"
+    )
+    return [dict(row) for row in conn.execute(query, (*params, limit))]
+
+
+def _match(column: str, value: str) -> Tuple[str, str]:
+    # Only ``%`` is a wildcard: ``_`` is in most targets and file names and
+    # must match itself, so it is escaped for LIKE.
+    if "%" not in value:
+        return f"{column} = ?", value
+    escaped = value.replace("!", "!!").replace("_", "!_")
+    return f"{column} LIKE ? ESCAPE '!'", escaped
+
+
+def summary(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Counts per target/status, for a quick overview of an index."""
+
+    files = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COUNT(error) FROM files").fetchone()
+    targets = conn.execute(
+        "SELECT target, kind, status, COUNT(*) AS n FROM messages"
+        " GROUP BY target, kind, status ORDER BY n DESC"
+    ).fetchall()
+    return {
+        "files": files[0],
+        "bytes": files[1],
+        "errors": files[2],
+        "targets": [dict(row) for row in targets],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Streaming inspector
+# ---------------------------------------------------------------------------
+
+
+def _short(text: str, max_string: int) -> str:
+    if len(text) <= max_string:
+        return json.dumps(text, ensure_ascii=False)
+    return json.dumps(text[:max_string], ensure_ascii=False) + f"… (+{len(text) - max_string} karakter)"
+
+
+def _render(value: Any, indent: str, depth: int, limits: Tuple[int, int, int]) -> Iterator[str]:
+    """Yield ``value`` line by line; containers are walked lazily."""
+
+    max_string, max_items, max_depth = limits
+    if isinstance(value, str):
+        yield indent + _short(value, max_string)
+        return
+    if isinstance(value, (bytes, bytearray, memoryview)) or hasattr(value, "getvalue"):
+        size = len(value.getvalue()) if hasattr(value, "getvalue") else len(value)
+        yield f"{indent}<{type(value).__name__} {size} byte>"
+        return
+    if isinstance(value, Mapping):
+        items: Iterable[Tuple[Any, Any]] = value.items()
+        total = len(value)
+        open_, close = "{", "}"
+    elif isinstance(value, (list, tuple)):
+        items = enumerate(value)
+        total = len(value)
+        open_, close = "[", "]"
+    else:
+        yield indent + repr(value)[: max_string + 1]
+        return
+    if total == 0:
+        yield indent + open_ + close
+        return
+    if depth >= max_depth:
+        yield f"{indent}{open_}… {total} item{close}"
+        return
+    yield indent + open_
+    child = indent + "  "
+    for shown, (key, item) in enumerate(items):
+        if shown >= max_items:
+            yield f"{child}… (+{total - max_items} item lagi)"
+            break
+        label = f"{key}: " if isinstance(value, Mapping) else ""
+        lines = _render(item, "", depth + 1, limits)
+        first = next(lines)
+        yield f"{child}{label}{first}"
+        for line in lines:
+            yield child + line
+    yield indent + close
+
+
+def render_envelope(
+    envelope: remoting.Envelope,
+    *,
+    max_string: int = 200,
+    max_items: int = 20,
+    max_depth: int = 4,
+) -> Iterator[str]:
+    """Lazily render the messages of *envelope* like :func:`envelope_summary`."""
+
+    limits = (max_string, max_items, max_depth)
+    yield f"AMF{envelope.amfVersion} envelope"
+    for response_path, message in iter_envelope(envelope):
+        if isinstance(message, remoting.Request):
+            yield f"- request {response_path} target={message.target}"
+        else:
+            status = _STATUS_NAMES.get(getattr(message, "status", None), "?")
+            yield f"- response {response_path} status={status}"
+        for line in _render(message.body, "    ", 0, limits):
+            yield line
+
+
+__all__ = [
+    "IndexReport",
+    "build_index",
+    "connect",
+    "decode_mapped",
+    "render_envelope",
+    "scan",
+    "search",
+    "summary",
+]
@@ -0,0 +1,220 @@
+"""Structural diff of ``getCharacterData`` results between refreshes.
+
+A panel polling a character mostly sees a few fields move (xp, gold, a
+couple of material counts) yet re-downloads the whole
+:class:`GetCharacterDataResponse`. :func:`diff_character_data` compares two
+responses section by section and emits JSON Patch operations (RFC 6902)
+against the *view* document built by :func:`character_view`: the response
+as JSON (without ``raw``) where every ``CharacterInventory`` string
+(``"wpn_01,material_02:40"``) is an ``{item: count}`` object, so an item
+changing count is one ``replace`` of ``/inventory/materials/material_02``.
+
+Unchanged sections cost one comparison; inventory strings are only parsed
+when they differ, and parsed strings are memoised.
+
+:class:`CharacterRevisions` remembers the last few responses per character
+under content-derived revisions so the API can answer "what changed since
+revision X" with a patch (or the full view when X is unknown).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Tuple
+
+from .get_character_data_models import CharacterInventory, GetCharacterDataResponse
+from .serialization import dumps_bytes, field_plan, to_builtins
+
+INVENTORY_FIELD = "inventory"
+_MISSING = object()
+
+
+@lru_cache(maxsize=512)
+def _parse_inventory(value: str) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        item, sep, quantity = entry.partition(":")
+        try:
+            amount = int(quantity) if sep else 1
+        except ValueError:
+            item, amount = entry, 1
+        counts[item] = counts.get(item, 0) + amount
+    return counts
+
+
+def parse_inventory(value: str | None) -> Dict[str, int] | None:
+    """``"wpn_01,material_02:40"`` -> ``{"wpn_01": 1, "material_02": 40}``."""
+
+    if value is None:
+        return None
+    return dict(_parse_inventory(value))
+
+
+def inventory_counts(inventory: CharacterInventory) -> Dict[str, Dict[str, int] | None]:
+    return {name: parse_inventory(getattr(inventory, name)) for name in field_plan(CharacterInventory)}
+
+
+def character_view(response: GetCharacterDataResponse) -> Dict[str, Any]:
+    """JSON document the patches of :func:`diff_character_data` apply to."""
+
+    view = to_builtins(response, exclude_raw=True)
+    view[INVENTORY_FIELD] = inventory_counts(response.inventory)
+    return view
+
+
+def _pointer(parent: str, key: Any) -> str:
+    return f"{parent}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def _diff_mapping(old: Mapping[str, Any], new: Mapping[str, Any], path: str, ops: List[Dict[str, Any]]) -> None:
+    added = 0
+    for key, value in new.items():
+        before = old.get(key, _MISSING)
+        if before is _MISSING:
+            added += 1
+            ops.append({"op": "add", "path": _pointer(path, key), "value": to_builtins(value)})
+        elif before is not value and before != value:
+            _diff_value(before, value, _pointer(path, key), ops)
+    # Every old key is still present unless the sizes say otherwise.
+    if len(old) != len(new) - added:
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+
+
+def _diff_value(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]) -> None:
+    if old is new:
+        return
+    if type(old) is type(new) and dataclasses.is_dataclass(old):
+        _diff_dataclass(old, new, path, ops)
+    elif isinstance(old, Mapping) and isinstance(new, Mapping):
+        _diff_mapping(old, new, path, ops)
+    elif old != new:
+        ops.append({"op": "replace", "path": path, "value": to_builtins(new, exclude_raw=True)})
+
+
+def _diff_inventory(old: CharacterInventory, new: CharacterInventory, path: str, ops: List[Dict[str, Any]]) -> None:
+    for name in field_plan(CharacterInventory):
+        before, after = getattr(old, name), getattr(new, name)
+        if before == after:
+            continue
+        pointer = _pointer(path, name)
+        if before is None or after is None:
+            ops.append({"op": "replace", "path": pointer, "value": parse_inventory(after)})
+        else:
+            _diff_mapping(_parse_inventory(before), _parse_inventory(after), pointer, ops)
+
+
+def _diff_dataclass(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]) -> None:
+    for name in field_plan(type(old), True):
+        before, after = getattr(old, name), getattr(new, name)
+        if before is after:
+            continue
+        pointer = _pointer(path, name)
+        if isinstance(before, CharacterInventory) and isinstance(after, CharacterInventory):
+            _diff_inventory(before, after, pointer, ops)
+        else:
+            _diff_value(before, after, pointer, ops)
+
+
+def diff_character_data(old: GetCharacterDataResponse, new: GetCharacterDataResponse) -> List[Dict[str, Any]]:
+    """JSON Patch turning ``character_view(old)`` into ``character_view(new)``."""
+
+    ops: List[Dict[str, Any]] = []
+    _diff_dataclass(old, new, "", ops)
+    return ops
+
+
+def revision_of(response: GetCharacterDataResponse) -> str:
+    """Content-derived revision: equal data gives the same id in every process."""
+
+    return hashlib.sha1(dumps_bytes(response, exclude_raw=True)).hexdigest()[:16]
+
+
+class CharacterRevisions:
+    """Recent responses per character, for ``since revision X`` deltas."""
+
+    def __init__(self, *, max_revisions: int = 16, max_characters: int = 1024, max_patches: int = 256) -> None:
+        self.max_revisions = max_revisions
+        self.max_characters = max_characters
+        self.max_patches = max_patches
+        self.patches = 0
+        self.full = 0
+        self._lock = threading.Lock()
+        self._history: "OrderedDict[int, OrderedDict[str, GetCharacterDataResponse]]" = OrderedDict()
+        self._latest: Dict[int, Tuple[GetCharacterDataResponse, str]] = {}
+        self._memo: "OrderedDict[Tuple[str, str], List[Dict[str, Any]]]" = OrderedDict()
+
+    def record(self, response: GetCharacterDataResponse) -> str:
+        """Remember *response* and return its revision."""
+
+        character_id = response.character.character_id if response.character is not None else None
+        latest = self._latest.get(character_id)
+        if latest is not None and latest[0] is response:
+            # The same cached WorkflowResult served again: nothing to hash.
+            return latest[1]
+        revision = revision_of(response)
+        with self._lock:
+            history = self._history.setdefault(character_id, OrderedDict())
+            self._history.move_to_end(character_id)
+            history[revision] = response
+            history.move_to_end(revision)
+            while len(history) > self.max_revisions:
+                history.popitem(last=False)
+            while len(self._history) > self.max_characters:
+                dropped, _ = self._history.popitem(last=False)
+                self._latest.pop(dropped, None)
+            self._latest[character_id] = (response, revision)
+        return revision
+
+    def delta(self, response: GetCharacterDataResponse, base: str | None) -> Dict[str, Any]:
+        """Patch from revision *base* to *response* (recorded on the way).
+
+        ``{"mode": "patch", "base", "revision", "patch"}`` when *base* is
+        still known, otherwise ``{"mode": "full", "revision", "data"}``.
+        """
+
+        revision = self.record(response)
+        character_id = response.character.character_id if response.character is not None else None
+        if base == revision:
+            return {"mode": "patch", "base": base, "revision": revision, "patch": []}
+        with self._lock:
+            old = self._history.get(character_id, {}).get(base) if base else None
+            patch = self._memo.get((base, revision)) if old is not None else None
+        if old is None:
+            self.full += 1
+            return {"mode": "full", "revision": revision, "data": character_view(response)}
+        if patch is None:
+            patch = diff_character_data(old, response)
+            with self._lock:
+                # Every panel polling the same character asks for the same pair.
+                self._memo[(base, revision)] = patch
+                while len(self._memo) > self.max_patches:
+                    self._memo.popitem(last=False)
+        self.patches += 1
+        return {"mode": "patch", "base": base, "revision": revision, "patch": patch}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "characters": len(self._history),
+            "patches": self.patches,
+            "full": self.full,
+            "memoised": len(self._memo),
+        }
+
+
+__all__ = [
+    "CharacterRevisions",
+    "character_view",
+    "diff_character_data",
+    "inventory_counts",
+    "parse_inventory",
+    "revision_of",
+]
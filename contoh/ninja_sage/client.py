@@ -1,7 +1,14 @@
-"""HTTP client able to replay Ninja Sage AMF calls."""
+"""HTTP client able to replay Ninja Sage AMF calls.
+
+One :class:`NinjaSageClient` can be shared by many threads: the header set
+is computed once and frozen, nothing mutates the session after
+construction, and connections come from the pool of a
+:class:`~ninja_sage.sessions.SessionPool`.
+"""
 
 from __future__ import annotations
 
+from types import MappingProxyType
 from typing import Any, Mapping, Sequence
 
 import requests
@@ -16,8 +23,12 @@ except ImportError as exc:  # pragma: no cover - dependency hint
 
 from urllib.parse import urlparse
 
-from .amf_utils import build_envelope, decode_amf_bytes, encode_envelope, envelope_summary
+from .amf_utils import build_envelope, decode_amf_bytes, encode_envelope, envelope_summary, envelope_target
 from .constants import DEFAULT_BASE_URL, DEFAULT_ENDPOINT_PATH, DEFAULT_HEADERS
+from .middleware import AmfCall, Middleware, compose
+from .scheduler import UpstreamScheduler
+from .sessions import SessionPool
+from .transport import HttpTransport, Transport
 
 
 class NinjaSageClient:
@@ -30,21 +41,42 @@ class NinjaSageClient:
         session: requests.Session | None = None,
         default_headers: Mapping[str, str] | None = None,
         endpoint_path: str = DEFAULT_ENDPOINT_PATH,
+        transport: Transport | None = None,
+        scheduler: UpstreamScheduler | None = None,
+        middleware: Sequence[Middleware] = (),
+        sessions: SessionPool | None = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.endpoint_path = endpoint_path if endpoint_path.startswith("/") else f"/{endpoint_path}"
-        self.session = session or requests.Session()
-        self.session.verify = False
+        self.url = f"{self.base_url}{self.endpoint_path}"
+        self.sessions = sessions or SessionPool(session=session)
+
         headers = dict(DEFAULT_HEADERS)
         if default_headers:
             headers.update(default_headers)
-        self.session.headers.update(headers)
-
         parsed = urlparse(self.base_url)
         if parsed.netloc:
-            self.session.headers.setdefault("Host", parsed.netloc)
+            headers.setdefault("Host", parsed.netloc)
+        # Sent with every request; read-only so threads can share it as is.
+        self.headers: Mapping[str, str] = MappingProxyType(headers)
+        self.transport: Transport = transport or HttpTransport(self.sessions)
+        self.scheduler = scheduler
+        self.middleware: list[Middleware] = list(middleware)
+        self._handler = compose(self.middleware, self._send_upstream)
+
+    @property
+    def session(self) -> requests.Session:
+        """The ``requests`` session used by the calling thread."""
+
+        return self.sessions.current()
 
     # Public API -----------------------------------------------------------
+    def add_middleware(self, layer: Middleware) -> None:
+        """Append *layer* to the chain (it runs after the existing layers)."""
+
+        self.middleware.append(layer)
+        self._handler = compose(self.middleware, self._send_upstream)
+
     def invoke(
         self,
         target: str,
@@ -54,6 +86,7 @@ class NinjaSageClient:
         amf_version: int = 3,
         extra_headers: Mapping[str, str] | None = None,
         timeout: int | float = 20,
+        account: str | None = None,
     ) -> remoting.Envelope:
         """Encode and send a single AMF request."""
 
@@ -63,7 +96,7 @@ class NinjaSageClient:
             response_path=response_path,
             amf_version=amf_version,
         )
-        return self.send_envelope(envelope, timeout=timeout, extra_headers=extra_headers)
+        return self.send_envelope(envelope, timeout=timeout, extra_headers=extra_headers, account=account)
 
     def send_envelope(
         self,
@@ -71,17 +104,26 @@ class NinjaSageClient:
         *,
         extra_headers: Mapping[str, str] | None = None,
         timeout: int | float = 20,
+        account: str | None = None,
     ) -> remoting.Envelope:
-        """Send a fully composed envelope to the server."""
-
-        payload = encode_envelope(envelope)
-        url = self._build_url()
-        headers = dict(self.session.headers)
-        if extra_headers:
-            headers.update(extra_headers)
-        response = self.session.post(url, data=payload, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        return decode_amf_bytes(response.content)
+        """Send a fully composed envelope to the server.
+
+        The call passes through the middleware chain first (see
+        :mod:`ninja_sage.middleware`). When a
+        :class:`~ninja_sage.scheduler.UpstreamScheduler` is attached the call
+        then waits for a slot; *account* selects the fair-queuing lane.
+        """
+
+        headers = {**self.headers, **extra_headers} if extra_headers else self.headers
+        call = AmfCall(
+            url=self.url,
+            target=envelope_target(envelope),
+            payload=encode_envelope(envelope),
+            headers=headers,
+            timeout=timeout,
+            account=account,
+        )
+        return decode_amf_bytes(self._handler(call))
 
     def decode_local_file(self, path: str) -> remoting.Envelope:
         """Quick helper mirroring the workflow in Charles Proxy."""
@@ -101,5 +143,10 @@ class NinjaSageClient:
         return "\n".join(lines)
 
     # Internal -------------------------------------------------------------
-    def _build_url(self) -> str:
-        return f"{self.base_url}{self.endpoint_path}"
+    def _send_upstream(self, call: AmfCall) -> bytes:
+        post = self.transport.post
+        if self.scheduler is None:
+            return post(call.url, call.payload, target=call.target, headers=call.headers, timeout=call.timeout)
+        with self.scheduler.slot(call.account):
+            return post(call.url, call.payload, target=call.target, headers=call.headers, timeout=call.timeout)
+
@@ -0,0 +1,194 @@
+"""Compact AMF3 encoding of API responses.
+
+The Flutter client already ships an AMF3 reader (``lib/amf/amf3.dart``),
+so AMF3 is the binary format offered next to JSON. Compared to JSON it
+sends every distinct string once (later occurrences are table references)
+and writes the key list of an object shape once as a *trait*; every
+further record with the same keys only carries a trait reference and its
+values. Lists of records (characters, inventory, game data pages) shrink
+accordingly.
+
+Model dataclasses are walked directly using the field plans from
+:mod:`ninja_sage.serialization`, so no intermediate dict tree is built.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime as _dt
+import struct
+from collections.abc import Mapping, Set
+from typing import Any, Dict, Tuple
+
+from .serialization import _convert_leaf, field_plan
+
+AMF3_CONTENT_TYPE = "application/x-amf"
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+_NULL = 0x01
+_FALSE = 0x02
+_TRUE = 0x03
+_INTEGER = 0x04
+_DOUBLE = 0x05
+_STRING = 0x06
+_DATE = 0x08
+_ARRAY = 0x09
+_OBJECT = 0x0A
+_BYTE_ARRAY = 0x0C
+
+_INT_MIN = -(2**28)
+_INT_MAX = 2**28 - 1
+_PACK_DOUBLE = struct.Struct(">d").pack
+_EPOCH = _dt.datetime(1970, 1, 1, tzinfo=_dt.timezone.utc)
+
+
+class _Amf3Writer:
+    __slots__ = ("out", "exclude_raw", "_strings", "_traits")
+
+    def __init__(self, exclude_raw: bool) -> None:
+        self.out = bytearray()
+        self.exclude_raw = exclude_raw
+        self._strings: Dict[str, int] = {}
+        self._traits: Dict[Tuple[str, ...], int] = {}
+
+    def u29(self, value: int) -> None:
+        out = self.out
+        if value < 0x80:
+            out.append(value)
+        elif value < 0x4000:
+            out += bytes(((value >> 7) | 0x80, value & 0x7F))
+        elif value < 0x200000:
+            out += bytes(((value >> 14) | 0x80, ((value >> 7) & 0x7F) | 0x80, value & 0x7F))
+        elif value < 0x20000000:
+            out += bytes(
+                (
+                    (value >> 22) | 0x80,
+                    ((value >> 15) & 0x7F) | 0x80,
+                    ((value >> 8) & 0x7F) | 0x80,
+                    value & 0xFF,
+                )
+            )
+        else:
+            raise ValueError(f"nilai U29 terlalu besar: {value}")
+
+    def string(self, value: str) -> None:
+        if not value:
+            self.out.append(0x01)
+            return
+        index = self._strings.get(value)
+        if index is not None:
+            self.u29(index << 1)
+            return
+        self._strings[value] = len(self._strings)
+        encoded = value.encode("utf-8")
+        self.u29((len(encoded) << 1) | 1)
+        self.out += encoded
+
+    def traits(self, names: Tuple[str, ...]) -> None:
+        index = self._traits.get(names)
+        if index is not None:
+            self.u29((index << 2) | 0x01)
+            return
+        self._traits[names] = len(self._traits)
+        # Sealed anonymous object: not externalizable, not dynamic.
+        self.u29((len(names) << 4) | 0x03)
+        self.out.append(0x01)
+        for name in names:
+            self.string(name)
+
+    def value(self, obj: Any) -> None:
+        out = self.out
+        if obj is None:
+            out.append(_NULL)
+        elif obj is True:
+            out.append(_TRUE)
+        elif obj is False:
+            out.append(_FALSE)
+        elif isinstance(obj, int):
+            if _INT_MIN <= obj <= _INT_MAX:
+                out.append(_INTEGER)
+                self.u29(obj & 0x1FFFFFFF)
+            else:
+                out.append(_DOUBLE)
+                out += _PACK_DOUBLE(float(obj))
+        elif isinstance(obj, float):
+            out.append(_DOUBLE)
+            out += _PACK_DOUBLE(obj)
+        elif isinstance(obj, str):
+            out.append(_STRING)
+            self.string(obj)
+        elif isinstance(obj, (list, tuple)):
+            self.array(obj)
+        elif dataclasses.is_dataclass(type(obj)):
+            names = field_plan(type(obj), self.exclude_raw)
+            out.append(_OBJECT)
+            self.traits(names)
+            for name in names:
+                self.value(getattr(obj, name))
+        elif isinstance(obj, Mapping):
+            names = tuple(str(key) for key in obj)
+            out.append(_OBJECT)
+            self.traits(names)
+            for item in obj.values():
+                self.value(item)
+        elif isinstance(obj, (bytes, bytearray, memoryview)):
+            data = bytes(obj)
+            out.append(_BYTE_ARRAY)
+            self.u29((len(data) << 1) | 1)
+            out += data
+        elif isinstance(obj, _dt.datetime):
+            moment = obj if obj.tzinfo is not None else obj.replace(tzinfo=_dt.timezone.utc)
+            out.append(_DATE)
+            out.append(0x01)
+            out += _PACK_DOUBLE((moment - _EPOCH).total_seconds() * 1000.0)
+        elif isinstance(obj, Set):
+            self.array(list(obj))
+        else:
+            self.value(_convert_leaf(obj))
+
+    def array(self, items: Any) -> None:
+        self.out.append(_ARRAY)
+        self.u29((len(items) << 1) | 1)
+        self.out.append(0x01)  # no associative part
+        for item in items:
+            self.value(item)
+
+
+def encode_amf3(obj: Any, *, exclude_raw: bool = False) -> bytes:
+    """Encode a model tree (or any JSON-like value) as a single AMF3 value."""
+
+    writer = _Amf3Writer(exclude_raw)
+    writer.value(obj)
+    return bytes(writer.out)
+
+
+def wants_amf3(accept: str | None, format_param: str | None = None) -> bool:
+    """``True`` when the client asked for AMF3 (``?format=amf3`` or ``Accept``).
+
+    ``Accept`` is honoured only when AMF3 outranks JSON by q-value, so a
+    generic ``*/*`` keeps getting JSON.
+    """
+
+    if format_param:
+        return format_param.lower() in ("amf", "amf3")
+    if not accept:
+        return False
+    amf_q = json_q = 0.0
+    for item in accept.split(","):
+        parts = [part.strip() for part in item.split(";")]
+        media = parts[0].lower()
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media in (AMF3_CONTENT_TYPE, "application/x-amf3"):
+            amf_q = max(amf_q, q)
+        elif media in ("application/json", "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return amf_q > 0 and amf_q >= json_q
+
+
+__all__ = ["AMF3_CONTENT_TYPE", "JSON_CONTENT_TYPE", "encode_amf3", "wants_amf3"]
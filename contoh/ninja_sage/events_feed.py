@@ -0,0 +1,469 @@
+"""Shared ``EventsService.get`` poller with change push to subscribers.
+
+The seasonal/permanent/features/packages collections change a few times a
+week, yet every client refresh used to ask the game server again.
+:class:`EventsFeed` fetches them once per ``interval`` for the whole
+process and fingerprints every collection; only a different fingerprint
+produces a new :class:`EventsSnapshot` (and a notification).
+
+:class:`SseHub` pushes snapshots as Server-Sent Events to any number of
+subscribed sockets from a single thread: each change is serialised once
+and queued on every subscriber's non-blocking socket, idle connections get
+a keep-alive comment, and a subscriber whose buffer overflows or stays
+unsent for ``send_timeout`` is dropped without delaying the others
+(``EventSource`` reconnects and sends ``Last-Event-ID``, which is the
+fingerprint).
+
+With several processes, :class:`SharedEventsFile` lets one process poll
+upstream and the others follow the snapshot it writes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import queue
+import selectors
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .models_common import EventCollections, EventsServiceGetResponse
+from .serialization import dumps_bytes, to_builtins
+
+SECTIONS = ("seasonal", "permanent", "features", "packages")
+
+
+def fingerprint_events(events: EventCollections) -> Tuple[str, Dict[str, str]]:
+    """Overall fingerprint plus one per collection."""
+
+    sections = {
+        name: hashlib.sha1(dumps_bytes(getattr(events, name))).hexdigest()[:16] for name in SECTIONS
+    }
+    overall = hashlib.sha1("".join(sections[name] for name in SECTIONS).encode("ascii")).hexdigest()[:16]
+    return overall, sections
+
+
+@dataclass(frozen=True, slots=True)
+class EventsSnapshot:
+    version: int
+    fingerprint: str
+    sections: Dict[str, str]
+    changed: Tuple[str, ...]
+    fetched_at: float
+    changed_at: float
+    response: EventsServiceGetResponse
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "changed": list(self.changed),
+            "changed_at": self.changed_at,
+            "fetched_at": self.fetched_at,
+            "events": self.response.events,
+        }
+
+
+class EventsFeed:
+    """Poll ``fetch`` every ``interval`` seconds and publish changes."""
+
+    def __init__(
+        self,
+        fetch: Callable[[], EventsServiceGetResponse],
+        *,
+        interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.fetch = fetch
+        self.interval = interval
+        self.polls = 0
+        self.changes = 0
+        self.errors = 0
+        self.last_error: str | None = None
+        self._clock = clock
+        self._snapshot: EventsSnapshot | None = None
+        self._listeners: List[Callable[[EventsSnapshot], None]] = []
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "EventsFeed":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="events-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def current(self) -> EventsSnapshot | None:
+        return self._snapshot
+
+    def response(self) -> EventsServiceGetResponse | None:
+        """Latest response, for callers that used to invoke ``EventsService.get``."""
+
+        snapshot = self._snapshot
+        return snapshot.response if snapshot is not None else None
+
+    def subscribe(self, listener: Callable[[EventsSnapshot], None]) -> Callable[[], None]:
+        """Call *listener* (on the poller thread) after every change."""
+
+        with self._changed:
+            self._listeners.append(listener)
+
+        def _unsubscribe() -> None:
+            with self._changed:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return _unsubscribe
+
+    def wait_for_change(self, fingerprint: str | None, timeout: float | None = None) -> EventsSnapshot | None:
+        """Block until the fingerprint differs from *fingerprint* (or timeout)."""
+
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._snapshot is not None and self._snapshot.fingerprint != fingerprint,
+                timeout,
+            )
+            return self._snapshot
+
+    def poll(self) -> bool:
+        """Fetch once; ``True`` when the collections changed."""
+
+        self.polls += 1
+        try:
+            response = self.fetch()
+        except Exception as exc:
+            self.errors += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            return False
+        if response.status != 1:
+            # Error answers are never published: consumers fall back to
+            # asking upstream themselves, and the last good collections stay.
+            self.errors += 1
+            self.last_error = f"status={response.status} error={response.error}"
+            return False
+        self.last_error = None
+        now = self._clock()
+        fingerprint, sections = fingerprint_events(response.events)
+        previous = self._snapshot
+        if previous is not None and previous.fingerprint == fingerprint:
+            self._snapshot = EventsSnapshot(
+                previous.version, fingerprint, sections, previous.changed, now, previous.changed_at, previous.response
+            )
+            return False
+        changed = tuple(
+            name for name in SECTIONS if previous is None or previous.sections.get(name) != sections[name]
+        )
+        snapshot = EventsSnapshot(
+            (previous.version + 1) if previous is not None else 1, fingerprint, sections, changed, now, now, response
+        )
+        with self._changed:
+            self._snapshot = snapshot
+            self.changes += 1
+            listeners = list(self._listeners)
+            self._changed.notify_all()
+        for listener in listeners:
+            try:
+                listener(snapshot)
+            except Exception:  # pragma: no cover - a broken listener must not stop polling
+                pass
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "interval": self.interval,
+            "polls": self.polls,
+            "changes": self.changes,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "fingerprint": snapshot.fingerprint if snapshot is not None else None,
+            "changed_at": snapshot.changed_at if snapshot is not None else None,
+            "fetched_at": snapshot.fetched_at if snapshot is not None else None,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.interval)
+
+
+def sse_message(snapshot: EventsSnapshot) -> bytes:
+    """One ``event: events`` SSE frame; the id is the fingerprint."""
+
+    data = dumps_bytes(snapshot.as_dict())
+    return b"id: " + snapshot.fingerprint.encode("ascii") + b"\nevent: events\ndata: " + data + b"\n\n"
+
+
+class SharedEventsFile:
+    """Latest events response in a file, written by one process and read by the rest.
+
+    The leader subscribes :meth:`publish` to its :class:`EventsFeed`;
+    followers use :meth:`read` as their ``fetch`` and only parse the file
+    again when it was replaced.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._stamp: Tuple[int, int] | None = None
+        self._response: EventsServiceGetResponse | None = None
+
+    def publish(self, snapshot: EventsSnapshot) -> None:
+        response = snapshot.response
+        events = to_builtins(response.events)
+        # Keys as the server sends them, so ``from_content`` reads them back.
+        events["event:permanent"] = events.pop("permanent")
+        payload = json.dumps({"status": response.status, "error": response.error, "events": events})
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(payload, encoding="utf-8")
+        os.replace(temporary, self.path)
+
+    def read(self) -> EventsServiceGetResponse:
+        stat = os.stat(self.path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp or self._response is None:
+            content = json.loads(self.path.read_text(encoding="utf-8"))
+            self._response = EventsServiceGetResponse.from_content(content)
+            self._stamp = stamp
+        return self._response
+
+
+@dataclass(slots=True)
+class _Subscriber:
+    sock: socket.socket
+    pending: bytearray = field(default_factory=bytearray)
+    stalled_since: float | None = None
+
+
+class SseHub:
+    """Owns subscriber sockets and writes SSE frames to them from one thread.
+
+    Sockets are non-blocking and multiplexed with :mod:`selectors`; every
+    subscriber has its own output buffer of at most ``max_buffer`` bytes,
+    so a stalled client only ever costs its own connection.
+    """
+
+    def __init__(
+        self,
+        feed: EventsFeed,
+        *,
+        max_subscribers: int = 1000,
+        keepalive: float = 15.0,
+        send_timeout: float = 5.0,
+        max_buffer: int = 256 * 1024,
+    ) -> None:
+        self.feed = feed
+        self.max_subscribers = max_subscribers
+        self.keepalive = keepalive
+        self.send_timeout = send_timeout
+        self.max_buffer = max_buffer
+        self.sent = 0
+        self.dropped = 0
+        self.disconnected = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        # (kind, socket, frame) commands for the hub thread, which alone
+        # touches the selector and the subscriber buffers.
+        self._outbox: "queue.SimpleQueue[Tuple[str, socket.socket | None, bytes]]" = queue.SimpleQueue()
+        self._selector = selectors.DefaultSelector()
+        self._subscribers: Dict[socket.socket, _Subscriber] = {}
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self._selector.register(self._wake_reader, selectors.EVENT_READ)
+        self._thread: threading.Thread | None = None
+        feed.subscribe(lambda snapshot: self._command("send", None, sse_message(snapshot)))
+
+    def start(self) -> "SseHub":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="events-sse", daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    def add(self, sock: socket.socket, last_event_id: str | None = None) -> bool:
+        """Take over *sock* (headers already sent); ``False`` when full."""
+
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                return False
+            self._count += 1
+        snapshot = self.feed.current()
+        initial = sse_message(snapshot) if snapshot is not None and snapshot.fingerprint != last_event_id else b""
+        self._command("add", sock, initial)
+        return True
+
+    def close(self, timeout: float = 1.0) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._close_all()
+            return
+        self._command("close", None, b"")
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": self._count,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+        }
+
+    def _command(self, kind: str, sock: socket.socket | None, frame: bytes) -> None:
+        self._outbox.put((kind, sock, frame))
+        try:
+            self._wake_writer.send(b"\0")
+        except OSError:  # wake-up pipe already full: the hub is awake anyway
+            pass
+
+    def _run(self) -> None:
+        next_keepalive = time.monotonic() + self.keepalive
+        while True:
+            timeout = max(0.0, next_keepalive - time.monotonic())
+            if any(subscriber.stalled_since is not None for subscriber in self._subscribers.values()):
+                timeout = min(timeout, self.send_timeout / 4)
+            for key, events in self._selector.select(timeout):
+                if key.fileobj is self._wake_reader:
+                    try:
+                        while self._wake_reader.recv(4096):
+                            pass
+                    except OSError:
+                        pass
+                    continue
+                subscriber = key.data
+                if events & selectors.EVENT_READ and not self._discard_input(subscriber):
+                    continue
+                if events & selectors.EVENT_WRITE:
+                    self._flush(subscriber)
+            while True:
+                try:
+                    kind, sock, frame = self._outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "close":
+                    self._close_all()
+                    return
+                if kind == "add":
+                    self._register(sock, frame)
+                else:
+                    self._broadcast(frame)
+                    next_keepalive = time.monotonic() + self.keepalive
+            now = time.monotonic()
+            if now >= next_keepalive:
+                self._broadcast(b": keep-alive\n\n")
+                next_keepalive = now + self.keepalive
+            for subscriber in list(self._subscribers.values()):
+                if subscriber.stalled_since is not None and now - subscriber.stalled_since > self.send_timeout:
+                    self._drop(subscriber)
+
+    def _register(self, sock: socket.socket, initial: bytes) -> None:
+        try:
+            sock.setblocking(False)
+            subscriber = _Subscriber(sock)
+            self._selector.register(sock, selectors.EVENT_READ, subscriber)
+        except (OSError, ValueError):
+            self._release()
+            self._close(sock)
+            return
+        self._subscribers[sock] = subscriber
+        if initial:
+            self._enqueue(subscriber, initial)
+
+    def _broadcast(self, frame: bytes) -> None:
+        for subscriber in list(self._subscribers.values()):
+            self._enqueue(subscriber, frame)
+
+    def _enqueue(self, subscriber: _Subscriber, frame: bytes) -> None:
+        if len(subscriber.pending) + len(frame) > self.max_buffer:
+            self._drop(subscriber)
+            return
+        subscriber.pending += frame
+        self.sent += 1
+        self._flush(subscriber)
+
+    def _flush(self, subscriber: _Subscriber) -> None:
+        try:
+            written = subscriber.sock.send(subscriber.pending)
+        except (BlockingIOError, InterruptedError):
+            written = 0
+        except OSError:
+            self._drop(subscriber, disconnected=True)
+            return
+        del subscriber.pending[:written]
+        if subscriber.pending and subscriber.stalled_since is None:
+            subscriber.stalled_since = time.monotonic()
+            self._selector.modify(subscriber.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, subscriber)
+        elif not subscriber.pending and subscriber.stalled_since is not None:
+            subscriber.stalled_since = None
+            self._selector.modify(subscriber.sock, selectors.EVENT_READ, subscriber)
+
+    def _discard_input(self, subscriber: _Subscriber) -> bool:
+        """Read and ignore client bytes; ``False`` once the client hung up."""
+
+        try:
+            if subscriber.sock.recv(4096):
+                return True
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            pass
+        self._drop(subscriber, disconnected=True)
+        return False
+
+    def _drop(self, subscriber: _Subscriber, *, disconnected: bool = False) -> None:
+        if self._subscribers.pop(subscriber.sock, None) is None:
+            return
+        if disconnected:
+            self.disconnected += 1
+        else:
+            self.dropped += 1
+        self._selector.unregister(subscriber.sock)
+        self._release()
+        self._close(subscriber.sock)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._count -= 1
+
+    def _close_all(self) -> None:
+        for subscriber in list(self._subscribers.values()):
+            self._subscribers.pop(subscriber.sock, None)
+            self._selector.unregister(subscriber.sock)
+            self._release()
+            self._close(subscriber.sock)
+        # Commands that never reached the hub thread.
+        while True:
+            try:
+                kind, sock, _ = self._outbox.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "add" and sock is not None:
+                self._release()
+                self._close(sock)
+
+    @staticmethod
+    def _close(sock: socket.socket) -> None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+
+__all__ = [
+    "EventsFeed",
+    "EventsSnapshot",
+    "SECTIONS",
+    "SharedEventsFile",
+    "SseHub",
+    "fingerprint_events",
+    "sse_message",
+]
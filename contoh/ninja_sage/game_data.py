@@ -0,0 +1,590 @@
+"""Read-only game data tables with precomputed indexes and pages.
+
+:class:`GameData` loads ``sage_data/*.json`` once and builds, per table:
+
+* the JSON encoding of every record, so a response is assembled by joining
+  bytes instead of serialising objects per request;
+* equality indexes (``type=wpn,back``, ``premium=true``) mapping each value
+  to the positions of the matching records;
+* every supported sort order, ascending and descending, together with the
+  rank of each record in it. Cursors are ranks, so pagination is keyset
+  based and stays stable while pages are being fetched.
+
+Filtered results and rendered pages are memoised in small LRUs. The pages
+of each table's default listing are rendered and compressed at load time.
+
+The parsed records are dropped once the indexes are built: encoded
+records, search text, ids, range values, index positions, orders and ranks
+are flat buffers (one contiguous byte buffer plus an offset array, or an
+``array``). :meth:`GameData.share` moves all of them into a single
+read-only memory-mapped file, so worker processes forked afterwards
+(``api_server.py --processes``) read the same physical pages instead of
+each holding a copy.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+import math
+import mmap
+import os
+import re
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Hashable, List, Mapping, Sequence, Tuple
+
+from .compact_encoding import encode_amf3
+from .http_cache import PrecompressedBody
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+_RESERVED = frozenset({"sort", "limit", "cursor", "q", "raw", "format"})
+_DIGITS = re.compile(r"(\d+)")
+
+
+class GameDataQueryError(ValueError):
+    """Raised for an unknown filter or sort field, or a malformed cursor."""
+
+
+@dataclass(frozen=True, slots=True)
+class TableSpec:
+    """Which fields of a ``sage_data`` file can be filtered and sorted."""
+
+    name: str
+    filename: str
+    exact: Tuple[str, ...] = ()
+    flags: Tuple[str, ...] = ()
+    ranges: Tuple[str, ...] = ()
+    sorts: Tuple[str, ...] = ("id", "name")
+    text: Tuple[str, ...] = ("name",)
+
+
+TABLES: Tuple[TableSpec, ...] = (
+    TableSpec(
+        "items",
+        "library.json",
+        exact=("type", "category"),
+        flags=("buyable", "premium", "sellable", "buyable_clan"),
+        ranges=("level", "damage", "price_gold", "price_tokens"),
+        sorts=("id", "name", "level", "damage", "price_gold", "price_tokens"),
+    ),
+    TableSpec(
+        "skills",
+        "skills.json",
+        exact=("type", "target", "category"),
+        flags=("buyable", "premium"),
+        ranges=("level", "damage", "cp_cost", "cooldown"),
+        sorts=("id", "name", "level", "damage", "cp_cost", "cooldown"),
+    ),
+    TableSpec(
+        "enemies",
+        "enemy.json",
+        ranges=("level", "hp", "cp", "agility"),
+        sorts=("id", "name", "level", "hp", "cp", "agility"),
+    ),
+    TableSpec(
+        "missions",
+        "mission.json",
+        exact=("grade", "enemies"),
+        flags=("premium", "visible"),
+        ranges=("level",),
+        sorts=("id", "name", "level"),
+    ),
+)
+
+
+def _natural_key(text: str) -> tuple:
+    """``wpn_2`` before ``wpn_10``: digit runs compare as numbers."""
+
+    return tuple((0, int(part)) if part.isdigit() else (1, part.lower()) for part in _DIGITS.split(text) if part)
+
+
+def _sort_value(value: Any) -> tuple:
+    # Missing values sort last in ascending order.
+    if value is None:
+        return (1,)
+    if isinstance(value, str):
+        return (0, _natural_key(value))
+    return (0, (0, value))
+
+
+def _index_value(value: Any) -> str:
+    return ("true" if value else "false") if isinstance(value, bool) else str(value)
+
+
+def _encode_cursor(sort: str, rank: int) -> str:
+    return base64.urlsafe_b64encode(f"{sort}:{rank}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        cursor_sort, _, rank = raw.rpartition(":")
+        value = int(rank)
+    except ValueError as exc:
+        raise GameDataQueryError("cursor tidak valid") from exc
+    if cursor_sort != sort:
+        raise GameDataQueryError("cursor dibuat untuk urutan lain")
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class _Query:
+    sort: str
+    exact: Tuple[Tuple[str, FrozenSet[str]], ...] = ()
+    ranges: Tuple[Tuple[str, float | None, float | None], ...] = ()
+    text: str | None = None
+
+
+class _LRU:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class GameTable:
+    """One ``sage_data`` table with its indexes, orders and page caches.
+
+    The parsed records are only needed while the indexes are built. Afterwards
+    every per-record structure is a flat buffer (see :meth:`shared_arrays`):
+    the JSON encoding of each record, the lowercased search text, the id
+    lookup order, the numeric values of the range filters, the positions of
+    each equality index value, and the sort orders and ranks. Records that
+    must be re-encoded (AMF3) are decoded from their JSON on demand.
+    """
+
+    def __init__(
+        self,
+        spec: TableSpec,
+        records: Sequence[Mapping[str, Any]],
+        *,
+        min_size: int = 1024,
+        level: int = 6,
+        max_results: int = 256,
+        max_pages: int = 1024,
+    ) -> None:
+        self.spec = spec
+        self.min_size = min_size
+        self.level = level
+        self._count = len(records)
+        # Record ``pos`` is blob[offsets[pos]:offsets[pos + 1]]; the same
+        # layout is used for the search text and the ids.
+        self._blob, self._offsets = _pack(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for record in records
+        )
+        self._text, self._text_offsets = _pack(
+            " ".join(str(record.get(name) or "") for name in spec.text).lower().encode("utf-8") for record in records
+        )
+        ids = [str(record.get("id")).encode("utf-8") for record in records]
+        self._ids, self._id_offsets = _pack(ids)
+        self._id_order: Sequence[int] = array("I", sorted(range(len(ids)), key=ids.__getitem__))
+        self._range_values: Dict[str, Sequence[float]] = {
+            name: array("d", (_range_value(record.get(name)) for record in records)) for name in spec.ranges
+        }
+        self._index: Dict[str, Dict[str, Sequence[int]]] = {
+            name: _build_index(records, name) for name in spec.exact + spec.flags
+        }
+        self._orders: Dict[str, Sequence[int]] = {}
+        self._ranks: Dict[str, Sequence[int]] = {}
+        for name in spec.sorts:
+            ascending = sorted(
+                range(len(records)),
+                key=lambda pos: (_sort_value(records[pos].get(name)), _natural_key(str(records[pos].get("id")))),
+            )
+            for sort, order in ((name, ascending), (f"-{name}", ascending[::-1])):
+                ranks = array("I", bytes(4 * len(order)))
+                for rank, pos in enumerate(order):
+                    ranks[pos] = rank
+                self._orders[sort] = array("I", order)
+                self._ranks[sort] = ranks
+        self._results = _LRU(max_results)
+        self._pages = _LRU(max_pages)
+        self._static_pages: Dict[Tuple[_Query, int | None, int, bool], PrecompressedBody] = {}
+        self._record_bodies: Dict[Tuple[str, bool], PrecompressedBody] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    # Public API -----------------------------------------------------------
+    def page(self, params: Mapping[str, Sequence[str]], *, binary: bool = False) -> PrecompressedBody:
+        """Render (or fetch) the page described by query string *params*.
+
+        ``params`` is the ``parse_qs`` mapping: ``sort`` (``-`` prefix for
+        descending), ``limit``, ``cursor``, ``q`` (substring of the name),
+        equality filters (comma separated values) and ``min_<field>`` /
+        ``max_<field>`` ranges. Raises :class:`GameDataQueryError`.
+        With ``binary`` the page is AMF3 (:mod:`ninja_sage.compact_encoding`)
+        instead of JSON.
+        """
+
+        query, after, limit = self._parse(params)
+        key = (query, after, limit, binary)
+        body = self._static_pages.get(key) or self._pages.get(key)
+        if body is None:
+            body = self._render(query, after, limit, binary)
+            self._pages.put(key, body)
+        return body
+
+    def record(self, record_id: str, *, binary: bool = False) -> PrecompressedBody | None:
+        body = self._record_bodies.get((record_id, binary))
+        if body is None:
+            pos = self._position(record_id)
+            if pos is None:
+                return None
+            data = encode_amf3(self._decoded(pos)) if binary else bytes(self._encoded(pos))
+            body = PrecompressedBody(data, min_size=self.min_size, level=self.level)
+            self._record_bodies[(record_id, binary)] = body
+        return body
+
+    def prewarm(self, limit: int = DEFAULT_LIMIT) -> int:
+        """Render and compress every page of the default listing; returns the page count."""
+
+        query = _Query(sort="id")
+        after: int | None = None
+        pages = 0
+        while True:
+            body = self._render(query, after, limit, False)
+            body.warm()
+            self._static_pages[(query, after, limit, False)] = body
+            pages += 1
+            result = self._result(query)
+            start = 0 if after is None else self._start(query, result, after)
+            if start + limit >= len(result):
+                return pages
+            after = self._ranks[query.sort][result[start + limit - 1]]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "records": self._count,
+            "static_pages": len(self._static_pages),
+            "cached_pages": len(self._pages),
+            "cached_results": len(self._results),
+        }
+
+    def shared_arrays(self) -> Dict[Hashable, Tuple[str, Sequence[int] | Sequence[float] | memoryview]]:
+        """Flat buffers that :meth:`GameData.share` may relocate, by attribute key."""
+
+        arrays: Dict[Hashable, Tuple[str, Any]] = {
+            "blob": ("B", self._blob),
+            "offsets": ("Q", self._offsets),
+            "text": ("B", self._text),
+            "text_offsets": ("Q", self._text_offsets),
+            "ids": ("B", self._ids),
+            "id_offsets": ("Q", self._id_offsets),
+            "id_order": ("I", self._id_order),
+        }
+        for name, values in self._range_values.items():
+            arrays[("range", name)] = ("d", values)
+        for name, index in self._index.items():
+            for value, positions in index.items():
+                arrays[("index", name, value)] = ("I", positions)
+        for sort in self._orders:
+            arrays[("order", sort)] = ("I", self._orders[sort])
+            arrays[("rank", sort)] = ("I", self._ranks[sort])
+        return arrays
+
+    def adopt_arrays(self, views: Mapping[Hashable, memoryview]) -> None:
+        """Replace the flat buffers with *views* of identical content."""
+
+        self._blob = views["blob"]
+        self._offsets = views["offsets"]
+        self._text = views["text"]
+        self._text_offsets = views["text_offsets"]
+        self._ids = views["ids"]
+        self._id_offsets = views["id_offsets"]
+        self._id_order = views["id_order"]
+        for name in self._range_values:
+            self._range_values[name] = views[("range", name)]
+        for name, index in self._index.items():
+            for value in index:
+                index[value] = views[("index", name, value)]
+        for sort in self._orders:
+            self._orders[sort] = views[("order", sort)]
+            self._ranks[sort] = views[("rank", sort)]
+
+    # Internal -------------------------------------------------------------
+    def _encoded(self, pos: int) -> memoryview:
+        return self._blob[self._offsets[pos] : self._offsets[pos + 1]]
+
+    def _decoded(self, pos: int) -> Any:
+        return json.loads(bytes(self._encoded(pos)))
+
+    def _position(self, record_id: str) -> int | None:
+        wanted = record_id.encode("utf-8")
+        ids, offsets, order = self._ids, self._id_offsets, self._id_order
+
+        def id_at(rank: int) -> bytes:
+            pos = order[rank]
+            return bytes(ids[offsets[pos] : offsets[pos + 1]])
+
+        # The order is stable, so a duplicated id resolves to its last record.
+        rank = bisect.bisect_right(range(len(order)), wanted, key=id_at) - 1
+        if rank >= 0 and id_at(rank) == wanted:
+            return order[rank]
+        return None
+
+    def _text_matches(self, needle: str) -> set[int]:
+        """Positions whose search text contains *needle* (one regex scan of the buffer)."""
+
+        pattern = re.compile(re.escape(needle.encode("utf-8")))
+        text, offsets = self._text, self._text_offsets
+        found: set[int] = set()
+        at = 0
+        while True:
+            match = pattern.search(text, at)
+            if match is None:
+                return found
+            pos = bisect.bisect_right(offsets, match.start()) - 1
+            if match.end() <= offsets[pos + 1]:
+                found.add(pos)
+                at = offsets[pos + 1]
+            else:
+                # Spans into the next record's text: not a match for either.
+                at = match.start() + 1
+
+    def _parse(self, params: Mapping[str, Sequence[str]]) -> Tuple[_Query, int | None, int]:
+        spec = self.spec
+
+        def last(name: str) -> str | None:
+            values = params.get(name)
+            return values[-1] if values else None
+
+        sort = last("sort") or "id"
+        if sort not in self._orders:
+            raise GameDataQueryError(f"sort tidak dikenal: {sort} (pilihan: {', '.join(spec.sorts)})")
+
+        limit_text = last("limit")
+        try:
+            limit = int(limit_text) if limit_text else DEFAULT_LIMIT
+        except ValueError as exc:
+            raise GameDataQueryError(f"limit tidak valid: {limit_text!r}") from exc
+        if not 1 <= limit <= MAX_LIMIT:
+            raise GameDataQueryError(f"limit harus 1..{MAX_LIMIT}")
+
+        exact: List[Tuple[str, FrozenSet[str]]] = []
+        ranges: Dict[str, List[float | None]] = {}
+        for name, values in params.items():
+            if name in _RESERVED:
+                continue
+            if name in spec.exact or name in spec.flags:
+                items = (item.strip() for value in values for item in value.split(","))
+                wanted = frozenset(item.lower() if name in spec.flags else item for item in items) - {""}
+                if wanted:
+                    exact.append((name, wanted))
+                continue
+            bound, _, field_name = name.partition("_")
+            if bound in ("min", "max") and field_name in spec.ranges:
+                try:
+                    number = float(values[-1])
+                except ValueError as exc:
+                    raise GameDataQueryError(f"{name} harus angka") from exc
+                ranges.setdefault(field_name, [None, None])[0 if bound == "min" else 1] = number
+                continue
+            raise GameDataQueryError(f"filter tidak dikenal: {name}")
+
+        text = (last("q") or "").strip().lower() or None
+        query = _Query(
+            sort=sort,
+            exact=tuple(sorted(exact)),
+            ranges=tuple(sorted((name, low, high) for name, (low, high) in ranges.items())),
+            text=text,
+        )
+        cursor = last("cursor")
+        after = _decode_cursor(cursor, sort) if cursor else None
+        return query, after, limit
+
+    def _result(self, query: _Query) -> Tuple[int, ...]:
+        result = self._results.get(query)
+        if result is not None:
+            return result
+
+        candidates: set[int] | None = None
+        for name, values in query.exact:
+            index = self._index[name]
+            matched: set[int] = set()
+            for value in values:
+                matched.update(index.get(value, ()))
+            candidates = matched if candidates is None else candidates & matched
+        if query.text is not None:
+            matched = self._text_matches(query.text)
+            candidates = matched if candidates is None else candidates & matched
+        ranges = [(self._range_values[name], low, high) for name, low, high in query.ranges]
+
+        def in_ranges(pos: int) -> bool:
+            for values, low, high in ranges:
+                value = values[pos]
+                # NaN marks a missing or non-numeric value: never in range.
+                if value != value:
+                    return False
+                if (low is not None and value < low) or (high is not None and value > high):
+                    return False
+            return True
+
+        result = tuple(
+            pos
+            for pos in self._orders[query.sort]
+            if (candidates is None or pos in candidates) and (not ranges or in_ranges(pos))
+        )
+        self._results.put(query, result)
+        return result
+
+    def _start(self, query: _Query, result: Tuple[int, ...], after: int) -> int:
+        ranks = self._ranks[query.sort]
+        return bisect.bisect_right(result, after, key=ranks.__getitem__)
+
+    def _render(self, query: _Query, after: int | None, limit: int, binary: bool) -> PrecompressedBody:
+        result = self._result(query)
+        start = 0 if after is None else self._start(query, result, after)
+        page = result[start : start + limit]
+        next_cursor = None
+        if page and start + limit < len(result):
+            next_cursor = _encode_cursor(query.sort, self._ranks[query.sort][page[-1]])
+        meta = {"table": self.spec.name, "total": len(result), "limit": limit, "next_cursor": next_cursor}
+        if binary:
+            # AMF3 string/trait tables span the whole page, so records cannot be
+            # pre-encoded individually; the rendered page is cached instead.
+            body = encode_amf3({**meta, "results": [self._decoded(pos) for pos in page]})
+        else:
+            head = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+            body = b"".join((head[:-1], b',"results":[', b",".join(self._encoded(pos) for pos in page), b"]}"))
+        return PrecompressedBody(body, min_size=self.min_size, level=self.level)
+
+
+def _pack(items: Any) -> Tuple[memoryview, Sequence[int]]:
+    """Concatenate byte strings; item ``i`` is ``blob[offsets[i]:offsets[i + 1]]``."""
+
+    offsets = array("Q", [0])
+    chunks = []
+    for item in items:
+        chunks.append(item)
+        offsets.append(offsets[-1] + len(item))
+    return memoryview(b"".join(chunks)), offsets
+
+
+def _range_value(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+def _build_index(records: Sequence[Mapping[str, Any]], name: str) -> Dict[str, Sequence[int]]:
+    index: Dict[str, List[int]] = {}
+    for pos, record in enumerate(records):
+        value = record.get(name)
+        if value is None:
+            continue
+        for item in value if isinstance(value, list) else (value,):
+            positions = index.setdefault(_index_value(item), [])
+            if not positions or positions[-1] != pos:
+                positions.append(pos)
+    return {value: array("I", positions) for value, positions in index.items()}
+
+
+class GameData:
+    """All game data tables, keyed by their API name."""
+
+    def __init__(self, tables: Mapping[str, GameTable]) -> None:
+        self.tables = dict(tables)
+
+    @classmethod
+    def load(
+        cls,
+        directory: str | Path,
+        specs: Sequence[TableSpec] = TABLES,
+        *,
+        min_size: int = 1024,
+        level: int = 6,
+        prewarm: bool = True,
+    ) -> "GameData":
+        """Load each table in *specs* from *directory*; missing files are skipped."""
+
+        directory = Path(directory)
+        tables: Dict[str, GameTable] = {}
+        for spec in specs:
+            path = directory / spec.filename
+            if not path.is_file():
+                continue
+            with path.open("r", encoding="utf-8") as handle:
+                records = json.load(handle)
+            table = GameTable(spec, records, min_size=min_size, level=level)
+            if prewarm:
+                table.prewarm()
+            tables[spec.name] = table
+        return cls(tables)
+
+    def table(self, name: str) -> GameTable | None:
+        return self.tables.get(name)
+
+    def share(self, directory: str | None = None) -> int:
+        """Move every table's flat buffers into one read-only shared mapping.
+
+        The data is written to an unlinked temporary file (in ``/dev/shm``
+        when available) and mapped with ``ACCESS_READ``; processes forked
+        afterwards share those pages. Returns the mapped size in bytes.
+        """
+
+        layout: List[Tuple[GameTable, Hashable, str, Any, int, int]] = []
+        size = 0
+        for table in self.tables.values():
+            for key, (typecode, values) in table.shared_arrays().items():
+                size = -(-size // 8) * 8
+                nbytes = memoryview(values).nbytes
+                layout.append((table, key, typecode, values, size, nbytes))
+                size += nbytes
+        if size == 0:
+            return 0
+
+        if directory is None and os.path.isdir("/dev/shm"):
+            directory = "/dev/shm"
+        with tempfile.TemporaryFile(dir=directory) as handle:
+            for _, _, _, values, offset, _ in layout:
+                handle.seek(offset)
+                handle.write(memoryview(values).cast("B"))
+            handle.truncate(size)
+            handle.flush()
+            mapping = mmap.mmap(handle.fileno(), size, access=mmap.ACCESS_READ)
+
+        buffer = memoryview(mapping)
+        views: Dict[GameTable, Dict[Hashable, memoryview]] = {}
+        for table, key, typecode, _, offset, nbytes in layout:
+            views.setdefault(table, {})[key] = buffer[offset : offset + nbytes].cast(typecode)
+        for table, table_views in views.items():
+            table.adopt_arrays(table_views)
+        return size
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: table.stats() for name, table in self.tables.items()}
+
+
+__all__ = [
+    "DEFAULT_LIMIT",
+    "GameData",
+    "GameDataQueryError",
+    "GameTable",
+    "MAX_LIMIT",
+    "TABLES",
+    "TableSpec",
+]
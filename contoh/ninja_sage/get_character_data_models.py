@@ -224,3 +224,14 @@ class GetCharacterDataResponse:
             clan=ClanInfo.from_mapping(content.get("clan")),
             raw=content,
         )
+
+
+__all__ = [
+    "CharacterPoints",
+    "CharacterSlots",
+    "CharacterCoreData",
+    "CharacterSets",
+    "CharacterInventory",
+    "ClanInfo",
+    "GetCharacterDataResponse",
+]
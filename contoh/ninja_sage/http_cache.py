@@ -0,0 +1,182 @@
+"""ETag and content-encoding helpers for the HTTP API.
+
+Bodies are identified by a BLAKE2 digest of their uncompressed bytes. The
+digest doubles as ``ETag`` (with an ``-gzip``/``-deflate`` suffix for
+encoded representations) and as the key of a small LRU cache of
+compressed bodies, so a response that did not change since the last poll
+is compressed once and then served from memory, or answered with
+``304 Not Modified`` when the client already has it.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+_COMPRESSORS: Dict[str, Callable[[bytes, int], bytes]] = {
+    "gzip": lambda body, level: gzip.compress(body, compresslevel=level, mtime=0),
+    # HTTP "deflate" is the zlib container (RFC 9110 section 8.4.1.2).
+    "deflate": lambda body, level: zlib.compress(body, level),
+}
+_PREFERENCE = ("gzip", "deflate")
+
+
+def body_digest(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def make_etag(digest: str, encoding: str | None = None) -> str:
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, digest: str) -> bool:
+    """``True`` when ``If-None-Match`` names any representation of *digest*."""
+
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate == digest or candidate.split("-", 1)[0] == digest:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick ``gzip`` or ``deflate`` from an ``Accept-Encoding`` header."""
+
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        parts = [part.strip() for part in item.split(";")]
+        coding = parts[0].lower()
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    ranked: List[Tuple[float, int, str]] = []
+    for index, coding in enumerate(_PREFERENCE):
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > 0:
+            ranked.append((q, -index, coding))
+    return max(ranked)[2] if ranked else None
+
+
+@dataclass(slots=True)
+class EncodedBody:
+    body: bytes
+    encoding: str | None
+    etag: str
+    digest: str
+
+
+class CompressedBodyCache:
+    """LRU cache of compressed representations keyed by body digest."""
+
+    def __init__(self, *, max_entries: int = 256, min_size: int = 1024, level: int = 6) -> None:
+        self.max_entries = max_entries
+        self.min_size = min_size
+        self.level = level
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def choose_encoding(self, body: bytes, accept_encoding: str | None) -> str | None:
+        return negotiate_encoding(accept_encoding) if len(body) >= self.min_size else None
+
+    def encode(self, body: bytes, accept_encoding: str | None, *, digest: str | None = None) -> EncodedBody:
+        digest = digest or body_digest(body)
+        encoding = self.choose_encoding(body, accept_encoding)
+        if encoding is None:
+            return EncodedBody(body=body, encoding=None, etag=make_etag(digest), digest=digest)
+
+        key = (digest, encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if compressed is None:
+            compressed = _COMPRESSORS[encoding](body, self.level)
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = compressed
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return EncodedBody(body=compressed, encoding=encoding, etag=make_etag(digest, encoding), digest=digest)
+
+
+class PrecompressedBody:
+    """An immutable body whose digest and compressed variants are kept with it.
+
+    Used for responses that are built once and served many times (game
+    data pages): the digest is computed up front and each encoding is
+    compressed at most once, outside any shared LRU.
+    """
+
+    __slots__ = ("body", "digest", "min_size", "level", "_variants", "_lock")
+
+    def __init__(self, body: bytes, *, min_size: int = 1024, level: int = 6) -> None:
+        self.body = body
+        self.digest = body_digest(body)
+        self.min_size = min_size
+        self.level = level
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def choose_encoding(self, accept_encoding: str | None) -> str | None:
+        return negotiate_encoding(accept_encoding) if len(self.body) >= self.min_size else None
+
+    def encode(self, accept_encoding: str | None) -> EncodedBody:
+        encoding = self.choose_encoding(accept_encoding)
+        if encoding is None:
+            return EncodedBody(body=self.body, encoding=None, etag=make_etag(self.digest), digest=self.digest)
+        return EncodedBody(
+            body=self._variant(encoding),
+            encoding=encoding,
+            etag=make_etag(self.digest, encoding),
+            digest=self.digest,
+        )
+
+    def warm(self, encodings: Tuple[str, ...] = _PREFERENCE) -> None:
+        """Compress the body ahead of time for each of *encodings*."""
+
+        if len(self.body) >= self.min_size:
+            for encoding in encodings:
+                self._variant(encoding)
+
+    def _variant(self, encoding: str) -> bytes:
+        compressed = self._variants.get(encoding)
+        if compressed is None:
+            with self._lock:
+                compressed = self._variants.get(encoding)
+                if compressed is None:
+                    compressed = _COMPRESSORS[encoding](self.body, self.level)
+                    self._variants[encoding] = compressed
+        return compressed
+
+
+__all__ = [
+    "CompressedBodyCache",
+    "EncodedBody",
+    "PrecompressedBody",
+    "body_digest",
+    "etag_matches",
+    "make_etag",
+    "negotiate_encoding",
+]
@@ -0,0 +1,295 @@
+"""Bounded background job queue with priorities, deduplication and retention.
+
+:class:`JobQueue` runs callables on a fixed pool of worker threads. Jobs
+with a higher ``priority`` run first (FIFO within the same priority). A
+job submitted with the key of a job that is still queued or running
+returns that existing job instead of enqueuing a duplicate. Finished jobs
+stay available for ``retention`` seconds and are then purged. On shutdown
+accepted jobs still run; those left when the timeout expires are marked
+failed rather than staying queued forever.
+
+With ``spool_dir`` set, every state change is also written to
+``<spool_dir>/<id>.pickle`` so that other processes sharing the directory
+(the pre-fork workers of ``api_server.py``) can answer status polls for
+jobs they did not run. Deduplication stays per process.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import pickle
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Priorities accepted from callers; anything outside is clamped.
+MIN_PRIORITY = -1000
+MAX_PRIORITY = 1000
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the number of pending jobs reached ``max_pending``."""
+
+
+@dataclass(slots=True)
+class Job:
+    id: str
+    key: Hashable
+    priority: int
+    fn: Callable[[], Any] = field(repr=False)
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: Any = field(default=None, repr=False)
+    error: str | None = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def describe(self) -> Dict[str, Any]:
+        """Status fields suitable for an API response (without the result)."""
+
+        return {
+            "id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Run submitted callables on ``workers`` background threads."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        max_pending: int = 256,
+        retention: float = 300.0,
+        spool_dir: str | Path | None = None,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.spool_dir = Path(spool_dir) if spool_dir is not None else None
+        self._queue: "queue.PriorityQueue[tuple[float, int, str]]" = queue.PriorityQueue()
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[Hashable, Job] = {}
+        self._pending = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    # Public API -----------------------------------------------------------
+    def submit(self, key: Hashable, fn: Callable[[], Any], *, priority: int = 0) -> tuple[Job, bool]:
+        """Enqueue *fn* unless a job with *key* is already pending.
+
+        Returns ``(job, created)``; ``created`` is ``False`` for a deduplicated
+        submission. Raises :class:`QueueFullError` when too many jobs wait
+        or the queue is shutting down.
+        """
+
+        priority = max(MIN_PRIORITY, min(MAX_PRIORITY, priority))
+        self._start_workers()
+        with self._lock:
+            if self._closed:
+                raise QueueFullError("antrean job sedang berhenti")
+            self._purge_expired_locked()
+            existing = self._active.get(key)
+            if existing is not None:
+                return existing, False
+            if self._pending >= self.max_pending:
+                raise QueueFullError("antrean job penuh")
+            job = Job(id=uuid.uuid4().hex, key=key, priority=priority, fn=fn)
+            self._jobs[job.id] = job
+            self._active[key] = job
+            self._pending += 1
+        self._spool(job)
+        self._queue.put((-priority, next(self._seq), job.id))
+        return job, True
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            self._purge_expired_locked()
+            job = self._jobs.get(job_id)
+        if job is None and self.spool_dir is not None:
+            job = self._load_spooled(job_id)
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Run the accepted jobs, then stop the workers, waiting up to *timeout*.
+
+        Jobs still queued when *timeout* expires are marked failed (and
+        spooled) so status polls get a final answer.
+        """
+
+        with self._lock:
+            self._closed = True
+        # Stop markers sort after every job, so the workers drain the queue first.
+        for _ in self._threads:
+            self._queue.put((math.inf, next(self._seq), ""))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        self._cancel_queued()
+
+    # Internal -------------------------------------------------------------
+    def _start_workers(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while True:
+            _, _, job_id = self._queue.get()
+            if not job_id:
+                return
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.status != QUEUED:
+                    continue
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._pending -= 1
+            self._spool(job)
+            try:
+                result = job.fn()
+            except Exception as exc:
+                job.error = str(exc) or type(exc).__name__
+                job.status = FAILED
+            else:
+                job.result = result
+                job.status = SUCCEEDED
+            with self._lock:
+                job.finished_at = time.time()
+                # Drop the closure so retained jobs only keep their result.
+                job.fn = _finished
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+            self._spool(job)
+            job.done.set()
+
+    def _cancel_queued(self) -> None:
+        cancelled = []
+        while True:
+            try:
+                _, _, job_id = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.status != QUEUED:
+                    continue
+                job.status = FAILED
+                job.error = "server berhenti sebelum job dijalankan"
+                job.finished_at = time.time()
+                job.fn = _finished
+                self._pending -= 1
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+            cancelled.append(job)
+        for job in cancelled:
+            self._spool(job)
+            job.done.set()
+
+    def _spool(self, job: Job) -> None:
+        if self.spool_dir is None or not _is_spool_id(job.id):
+            return
+        state = {name: getattr(job, name) for name in _SPOOLED_FIELDS}
+        target = self.spool_dir / f"{job.id}.pickle"
+        partial = target.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with partial.open("wb") as handle:
+                pickle.dump(state, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, target)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # Spooling is best effort; the owning process still has the job.
+            partial.unlink(missing_ok=True)
+
+    def _load_spooled(self, job_id: str) -> Job | None:
+        if not _is_spool_id(job_id):
+            return None
+        path = self.spool_dir / f"{job_id}.pickle"
+        try:
+            with path.open("rb") as handle:
+                state = pickle.load(handle)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        finished_at = state.get("finished_at")
+        if self.retention > 0 and finished_at is not None and finished_at < time.time() - self.retention:
+            return None
+        job = Job(fn=_finished, **state)
+        if job.finished:
+            job.done.set()
+        return job
+
+    def _purge_expired_locked(self) -> None:
+        if self.retention <= 0:
+            return
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            if self.spool_dir is not None:
+                (self.spool_dir / f"{job_id}.pickle").unlink(missing_ok=True)
+
+
+_SPOOLED_FIELDS = ("id", "key", "priority", "status", "created_at", "started_at", "finished_at", "result", "error")
+
+
+def _is_spool_id(job_id: str) -> bool:
+    # Job ids are uuid4 hex; anything else never names a spool file.
+    return len(job_id) == 32 and all(char in "0123456789abcdef" for char in job_id)
+
+
+def _finished() -> None:  # pragma: no cover - placeholder once a job ran
+    raise RuntimeError("job sudah selesai")
+
+
+__all__ = [
+    "FAILED",
+    "Job",
+    "JobQueue",
+    "MAX_PRIORITY",
+    "MIN_PRIORITY",
+    "QUEUED",
+    "QueueFullError",
+    "RUNNING",
+    "SUCCEEDED",
+]
@@ -7,15 +7,17 @@ import hashlib
 import json
 import random
 import time
-import urllib.request
 import zlib
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Dict
+from typing import Dict, Tuple
 
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad
 
+from .assets import default_registry
+from .transport import fetch_asset
+
 DEFAULT_LIBRARY_URL = "https://ns-assets.ninjasage.id/static/lib/library.bin"
 
 
@@ -61,11 +63,25 @@ class _PM_PRNG:
         self.seed = (self.seed * self.MUL) % self.MOD
         return self.seed
 
+    @classmethod
+    def nth(cls, seed: int, steps: int) -> int:
+        """Value after *steps* calls of :meth:`next_int`, without stepping.
+
+        Lehmer generators are ``seed * MUL**n mod MOD``, so any position is
+        one modular exponentiation away.
+        """
+
+        return (seed & 0x7FFFFFFF) * pow(cls.MUL, steps, cls.MOD) % cls.MOD
+
 
-@lru_cache(maxsize=2)
 def load_library_levels(library_url: str = DEFAULT_LIBRARY_URL) -> Dict[str, int]:
-    with urllib.request.urlopen(library_url) as resp:
-        compressed = resp.read()
+    """Item levels from ``library.bin``, shared through the asset registry."""
+
+    return default_registry().get("library_levels", library_url, lambda: _download_library_levels(library_url))
+
+
+def _download_library_levels(library_url: str) -> Dict[str, int]:
+    compressed = fetch_asset(library_url)
     data = zlib.decompress(compressed)
     items = json.loads(data.decode("utf-8"))
     levels: Dict[str, int] = {}
@@ -123,6 +139,134 @@ def get_random_n_seed(character_seed: int | float, loader: LoaderInfo) -> str:
     return "".join(str(rng.next_int()) for _ in range(4))
 
 
+class _CbcEncryptor:
+    """AES-CBC with a fixed key/IV whose key schedule is expanded once.
+
+    PyCryptodome CBC objects are single-use, so every ``AES.new`` pays for
+    the key expansion again. A stateless ECB object keeps the expanded key
+    and the CBC chaining (one XOR per block) is done here.
+    """
+
+    __slots__ = ("_ecb", "_iv")
+
+    def __init__(self, key: str, iv: bytes) -> None:
+        self._ecb = AES.new(key.encode("latin1"), AES.MODE_ECB)
+        self._iv = int.from_bytes(iv, "big")
+
+    def encrypt(self, plaintext: str) -> str:
+        data = pad(plaintext.encode("latin1"), 16)
+        encrypt_block = self._ecb.encrypt
+        previous = self._iv
+        out = bytearray()
+        for offset in range(0, len(data), 16):
+            block = encrypt_block((int.from_bytes(data[offset : offset + 16], "big") ^ previous).to_bytes(16, "big"))
+            out += block
+            previous = int.from_bytes(block, "big")
+        return base64.b64encode(out).decode("ascii")
+
+
+def encrypt_password(plaintext: str, key: str, seed: int) -> str:
+    """Encrypt *plaintext* the way the client does, with a fresh AES-CBC cipher.
+
+    :class:`LoginPayloadFactory` caches the key schedule instead; this is the
+    one-shot form for a single login.
+    """
+
+    return _Crypt.encrypt(plaintext, key, seed)
+
+
+def warm_crypto() -> None:
+    """Load the AES backend and run one encryption through the cached-key path."""
+
+    _CbcEncryptor("0123456789abcdef", _Crypt._make_iv("1")).encrypt("warmup")
+
+
+class LoginPayloadFactory:
+    """Build loginUser components for many accounts sharing one ``checkVersion``.
+
+    Everything except the encrypted password depends only on the character
+    seed, the loader sizes and three library levels, so ``specific_item``,
+    ``random_seed`` and the AES key schedule are computed once here and
+    only the password is encrypted per account. Use :func:`login_payload_factory`
+    to share instances.
+    """
+
+    __slots__ = ("character_seed", "character_key", "loader", "specific_item", "random_seed", "_encryptor")
+
+    random_seed: str | None
+
+    def __init__(
+        self,
+        character_seed: int | float,
+        character_key: str,
+        *,
+        loader: LoaderInfo | None = None,
+        levels: Dict[str, int],
+    ) -> None:
+        self.character_seed = int(character_seed)
+        self.character_key = character_key
+        self.loader = loader or LoaderInfo()
+        self.specific_item = get_specific_item(self.loader, self.character_seed, levels)
+        seed_rng = self.character_seed % int(self.loader.bytes_loaded)
+        # A zero seed makes the PRNG seed itself from the clock, so that
+        # value is drawn per login instead of cached.
+        self.random_seed = (
+            "".join(str(_PM_PRNG.nth(seed_rng, step)) for step in range(1, 5)) if seed_rng else None
+        )
+        self._encryptor = _CbcEncryptor(character_key, _Crypt._make_iv(str(self.character_seed)))
+
+    def components(self, username: str, password: str) -> Dict[str, object]:
+        return {
+            "username": username,
+            "encrypted_password": self._encryptor.encrypt(password),
+            "character_seed": self.character_seed,
+            "bytes_loaded": self.loader.bytes_loaded,
+            "bytes_total": self.loader.bytes_total,
+            "character_key": self.character_key,
+            "specific_item": self.specific_item,
+            "random_seed": self.random_seed or get_random_n_seed(self.character_seed, self.loader),
+            "password_length": len(password),
+        }
+
+
+# Only these library entries feed ``get_specific_item``.
+_LEVEL_KEYS = ("hair_10000_1", "hair_10000_0", "accessory_2003")
+
+
+@lru_cache(maxsize=16)
+def _cached_factory(
+    character_seed: int,
+    character_key: str,
+    loader: Tuple[int, int],
+    levels: Tuple[int, ...],
+) -> LoginPayloadFactory:
+    return LoginPayloadFactory(
+        character_seed,
+        character_key,
+        loader=LoaderInfo(bytes_loaded=loader[0], bytes_total=loader[1]),
+        levels=dict(zip(_LEVEL_KEYS, levels)),
+    )
+
+
+def login_payload_factory(
+    character_seed: int | float,
+    character_key: str,
+    *,
+    loader: LoaderInfo | None = None,
+    library_url: str = DEFAULT_LIBRARY_URL,
+) -> LoginPayloadFactory:
+    """Shared :class:`LoginPayloadFactory` for one ``checkVersion`` result."""
+
+    loader = loader or LoaderInfo()
+    levels = load_library_levels(library_url)
+    return _cached_factory(
+        int(character_seed),
+        character_key,
+        (int(loader.bytes_loaded), int(loader.bytes_total)),
+        tuple(levels.get(key, 0) for key in _LEVEL_KEYS),
+    )
+
+
 def build_login_components(
     username: str,
     password: str,
@@ -132,21 +276,5 @@ def build_login_components(
     loader: LoaderInfo | None = None,
     library_url: str = DEFAULT_LIBRARY_URL,
 ) -> Dict[str, object]:
-    loader = loader or LoaderInfo()
-    character_seed = int(character_seed)
-    levels = load_library_levels(library_url)
-    encrypted_password = _Crypt.encrypt(password, character_key, character_seed)
-    specific_item = get_specific_item(loader, character_seed, levels)
-    random_seed = get_random_n_seed(character_seed, loader)
-
-    return {
-        "username": username,
-        "encrypted_password": encrypted_password,
-        "character_seed": character_seed,
-        "bytes_loaded": loader.bytes_loaded,
-        "bytes_total": loader.bytes_total,
-        "character_key": character_key,
-        "specific_item": specific_item,
-        "random_seed": random_seed,
-        "password_length": len(password),
-    }
+    factory = login_payload_factory(character_seed, character_key, loader=loader, library_url=library_url)
+    return factory.components(username, password)
@@ -0,0 +1,162 @@
+"""Middleware chain for :class:`~ninja_sage.client.NinjaSageClient`.
+
+A middleware is a callable ``(call, next_handler) -> bytes`` that receives
+an :class:`AmfCall` (the encoded request) and either returns response bytes
+itself or delegates to ``next_handler``. Middlewares run before the
+upstream scheduler, so a short-circuited call never takes an upstream
+slot.
+
+:class:`ResponseCache` is the built-in middleware: it caches the raw
+response bytes of idempotent targets (``checkVersion``, ``EventsService.get``,
+``Analytics.libraries``) keyed on URL, target and a digest of the encoded
+request body, with a TTL policy per target, an LRU bound per target and
+single-flight loading of concurrent misses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Sequence
+
+from .amf_utils import decode_amf_bytes
+from .response_utils import extract_first_body, normalize_content
+from .singleflight import TTLCache
+
+try:
+    from pyamf import remoting
+except ImportError as exc:  # pragma: no cover - dependency hint
+    raise ImportError(
+        "Py3AMF (module 'pyamf') belum terpasang. Jalankan 'pip install -r requirements.txt' "
+        "atau lihat README untuk instruksi instalasi."
+    ) from exc
+
+
+@dataclass(frozen=True, slots=True)
+class AmfCall:
+    """One encoded AMF request on its way to the server."""
+
+    url: str
+    target: str
+    payload: bytes
+    headers: Mapping[str, str]
+    timeout: float
+    account: str | None = None
+
+
+Handler = Callable[[AmfCall], bytes]
+Middleware = Callable[[AmfCall, Handler], bytes]
+
+
+def compose(middleware: Sequence[Middleware], handler: Handler) -> Handler:
+    """Wrap *handler* so that ``middleware[0]`` runs first."""
+
+    for layer in reversed(middleware):
+        handler = _bind(layer, handler)
+    return handler
+
+
+def _bind(layer: Middleware, next_handler: Handler) -> Handler:
+    def _handler(call: AmfCall) -> bytes:
+        return layer(call, next_handler)
+
+    return _handler
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """How long responses of one target stay cached, and how many variants."""
+
+    ttl: float
+    stale_ttl: float = 0.0
+    max_entries: int = 16
+
+
+DEFAULT_CACHE_POLICIES: Dict[str, CachePolicy] = {
+    "SystemLogin.checkVersion": CachePolicy(ttl=300.0, stale_ttl=300.0),
+    "EventsService.get": CachePolicy(ttl=60.0, stale_ttl=60.0),
+    "Analytics.libraries": CachePolicy(ttl=300.0, stale_ttl=300.0),
+}
+
+
+class _Uncacheable(Exception):
+    def __init__(self, content: bytes) -> None:
+        super().__init__("response tidak di-cache")
+        self.content = content
+
+
+def _is_cacheable(content: bytes) -> bool:
+    """Only successful responses are worth caching.
+
+    The game reports failures (maintenance, bad version, ...) inside an
+    ``onResult`` body as ``status != 1``; those must not be served to
+    every account for the whole TTL.
+    """
+
+    try:
+        envelope = decode_amf_bytes(content)
+    except Exception:
+        return False
+    if not all(message.status == remoting.STATUS_OK for _, message in envelope):
+        return False
+    return normalize_content(extract_first_body(envelope)).get("status") == 1
+
+
+class ResponseCache:
+    """Middleware caching raw responses of idempotent targets."""
+
+    def __init__(self, policies: Mapping[str, CachePolicy] | None = None) -> None:
+        self.policies = dict(DEFAULT_CACHE_POLICIES if policies is None else policies)
+        self._caches: Dict[str, TTLCache[bytes]] = {
+            target: TTLCache(ttl=policy.ttl, stale_ttl=policy.stale_ttl, max_entries=policy.max_entries)
+            for target, policy in self.policies.items()
+        }
+        self._bypassed = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, call: AmfCall, next_handler: Handler) -> bytes:
+        cache = self._caches.get(call.target)
+        if cache is None:
+            with self._lock:
+                self._bypassed += 1
+            return next_handler(call)
+
+        def _load() -> bytes:
+            content = next_handler(call)
+            if not _is_cacheable(content):
+                raise _Uncacheable(content)
+            return content
+
+        key = (call.url, hashlib.blake2b(call.payload, digest_size=16).digest())
+        try:
+            return cache.get_or_load(key, _load)
+        except _Uncacheable as exc:
+            # Error envelopes reach the caller(s) but are never stored.
+            return exc.content
+
+    def invalidate(self, target: str | None = None) -> None:
+        """Drop cached responses of one target, or of every target."""
+
+        for name, cache in self._caches.items():
+            if target is None or name == target:
+                cache.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        targets = {
+            target: {**cache.stats.as_dict(), "entries": len(cache)} for target, cache in self._caches.items()
+        }
+        with self._lock:
+            bypassed = self._bypassed
+        return {"targets": targets, "bypassed": bypassed}
+
+
+__all__ = [
+    "AmfCall",
+    "CachePolicy",
+    "DEFAULT_CACHE_POLICIES",
+    "Handler",
+    "Middleware",
+    "ResponseCache",
+    "compose",
+]
@@ -0,0 +1,230 @@
+"""Synthetic response payloads shaped like the real Ninja Sage server.
+
+The builders return plain mappings using the same keys the server sends
+(``character_data``, ``char_weapons``, ``event:permanent``, ...), so they
+can be fed straight into the ``from_content`` parsers or encoded into an
+AMF envelope by the local mock server. Sizes follow what a mid-game
+account looks like: a few hundred inventory entries per character and a
+few dozen event definitions.
+
+Every builder is deterministic for a given ``seed`` so benchmarks stay
+reproducible.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List
+
+MOCK_CHARACTER_SEED = 1_234_567
+MOCK_CHARACTER_KEY = "0123456789abcdef"
+MOCK_CDN = "https://ns-assets.ninjasage.id/static/"
+
+_NAMES = [
+    "Shadow Knight",
+    "Mystic Sage",
+    "Void Archer",
+    "Flame Warlock",
+    "Divine Guardian",
+    "Legendary Hero",
+]
+
+
+def _inventory(rng: random.Random, prefix: str, count: int, *, max_qty: int = 1) -> str:
+    entries = []
+    for index in rng.sample(range(1, count * 4), count):
+        item = f"{prefix}_{index:02d}"
+        if max_qty > 1:
+            item = f"{item}:{rng.randint(1, max_qty)}"
+        entries.append(item)
+    return ",".join(entries)
+
+
+def check_version(channel: str = "Public 0.52") -> Dict[str, Any]:
+    return {
+        "status": 1,
+        "error": 0,
+        "cdn": MOCK_CDN,
+        "_": MOCK_CHARACTER_SEED,
+        "__": MOCK_CHARACTER_KEY,
+        "_rm": False,
+    }
+
+
+def analytics_libraries() -> Dict[str, Any]:
+    return {"status": 1, "error": 0}
+
+
+def events(*, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+
+    def _event(kind: str, index: int) -> Dict[str, Any]:
+        return {
+            "id": f"{kind}_{index}",
+            "name": f"{kind.title()} Event {index}",
+            "panel": f"{kind}_panel_{index}",
+            "icon": f"icons/events/{kind}_{index}.png",
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "inside": rng.random() < 0.5,
+            "active": True,
+        }
+
+    return {
+        "status": 1,
+        "error": 0,
+        "events": {
+            "seasonal": [_event("seasonal", i) for i in range(12)],
+            "event:permanent": [_event("permanent", i) for i in range(24)],
+            "features": [_event("feature", i) for i in range(18)],
+            "packages": [_event("package", i) for i in range(8)],
+        },
+    }
+
+
+def login_user(username: str, *, uid: int | None = None) -> Dict[str, Any]:
+    uid = uid if uid is not None else 100_000 + (sum(map(ord, username)) % 900_000)
+    return {
+        "status": 1,
+        "error": 0,
+        "uid": uid,
+        "sessionkey": f"mock-session-{uid:08x}",
+        "hash": f"{uid:032x}",
+        "system_time": "2025-11-20 12:00:00",
+        "banners": [
+            [
+                {
+                    "url": f"banners/banner_{i}.png",
+                    "menu": "event",
+                    "title": f"Banner {i}",
+                    "action": f"open_event_{i}",
+                }
+                for i in range(6)
+            ]
+        ],
+        "events": [f"event_{i}" for i in range(10)],
+        "clan_season": "Season 42",
+        "crew_season": "Season 17",
+        "__": f"client-token-{uid}",
+    }
+
+
+def _character_summary(rng: random.Random, uid: int, char_id: int, name: str) -> Dict[str, Any]:
+    return {
+        "char_id": char_id,
+        "acc_id": uid,
+        "character_name": name,
+        "character_level": rng.randint(1, 90),
+        "character_xp": rng.randint(0, 2_000_000),
+        "character_gender": rng.randint(0, 1),
+        "character_rank": rng.randint(0, 7),
+        "character_prestige": rng.randint(0, 5),
+        "character_element_1": rng.randint(1, 5),
+        "character_element_2": rng.randint(1, 5),
+        "character_element_3": None,
+        "character_talent_1": None,
+        "character_talent_2": None,
+        "character_talent_3": None,
+        "character_gold": rng.randint(0, 50_000_000),
+        "character_tp": rng.randint(0, 5_000),
+    }
+
+
+def all_characters(uid: int, *, count: int = 6, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed ^ uid)
+    account_data = [
+        _character_summary(rng, uid, uid * 10 + index, _NAMES[index % len(_NAMES)])
+        for index in range(count)
+    ]
+    return {
+        "status": 1,
+        "error": 0,
+        "account_type": 1,
+        "emblem_duration": 30,
+        "tokens": rng.randint(0, 10_000),
+        "total_characters": count,
+        "account_data": account_data,
+    }
+
+
+def character_data(char_id: int, *, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed ^ char_id)
+    summary = _character_summary(rng, char_id // 10, char_id, _NAMES[char_id % len(_NAMES)])
+    core = {
+        "character_id": char_id,
+        **{key: value for key, value in summary.items() if key.startswith("character_")},
+        "character_merit": rng.randint(0, 100_000),
+        "character_ss": rng.randint(0, 1_000),
+        "character_class": None,
+        "character_senjutsu": None,
+        "character_pvp_points": rng.randint(0, 10_000),
+    }
+    features: List[str] = [f"feature_{i}" for i in range(20)]
+    return {
+        "status": 1,
+        "error": 0,
+        "announcements": "Selamat datang di server mock Ninja Sage.",
+        "account_type": 1,
+        "emblem_duration": 30,
+        "has_unread_mails": rng.random() < 0.3,
+        "features": features,
+        "events": events(seed=seed)["events"],
+        "character_data": core,
+        "character_points": {
+            "atrrib_wind": rng.randint(0, 90),
+            "atrrib_fire": rng.randint(0, 90),
+            "atrrib_lightning": rng.randint(0, 90),
+            "atrrib_water": rng.randint(0, 90),
+            "atrrib_earth": rng.randint(0, 90),
+            "atrrib_free": rng.randint(0, 10),
+        },
+        "character_slots": {
+            "weapons": 200,
+            "back_items": 200,
+            "accessories": 200,
+            "hairstyles": 100,
+            "clothing": 200,
+        },
+        "character_sets": {
+            "weapon": "wpn_01",
+            "back_item": "back_01",
+            "accessory": "accessory_01",
+            "hairstyle": "hair_01_0",
+            "clothing": "set_01_0",
+            "skills": ",".join(f"skill_{i:02d}" for i in rng.sample(range(1, 400), 8)),
+            "senjutsu_skills": None,
+            "hair_color": "0|0",
+            "skin_color": "null|null",
+            "face": "face_01_0",
+        },
+        "character_inventory": {
+            "char_weapons": _inventory(rng, "wpn", 150),
+            "char_back_items": _inventory(rng, "back", 120),
+            "char_accessories": _inventory(rng, "accessory", 100),
+            "char_sets": _inventory(rng, "set", 150),
+            "char_hairs": _inventory(rng, "hair", 60),
+            "char_skills": _inventory(rng, "skill", 250),
+            "char_talent_skills": _inventory(rng, "talent", 40, max_qty=10),
+            "char_senjutsu_skills": _inventory(rng, "senjutsu", 30, max_qty=10),
+            "char_materials": _inventory(rng, "material", 120, max_qty=999),
+            "char_essentials": _inventory(rng, "essential", 40, max_qty=99),
+            "char_items": _inventory(rng, "item", 60, max_qty=99),
+            "char_animations": _inventory(rng, "ani", 20),
+        },
+        "recruiters": [],
+        "recruit_data": [],
+        "pet_data": {"pet_id": rng.randint(1, 500), "pet_name": "Kyuubi", "pet_level": rng.randint(1, 90)},
+        "clan": {"id": rng.randint(1, 5_000), "name": "Mock Clan", "banner": "clan_banner_01"},
+    }
+
+
+__all__ = [
+    "MOCK_CDN",
+    "MOCK_CHARACTER_KEY",
+    "MOCK_CHARACTER_SEED",
+    "all_characters",
+    "analytics_libraries",
+    "character_data",
+    "check_version",
+    "events",
+    "login_user",
+]
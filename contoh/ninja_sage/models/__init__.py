@@ -9,12 +9,61 @@ Semua dataclass request/response dibagi per-domain:
 - ``models_workflow`` → gabungan hasil workflow.
 
 File ini meng-ekspos nama-nama yang sering dipakai supaya impor tetap
-pendek: ``from ninja_sage.models import SystemLoginResponse``.
+pendek: ``from ninja_sage.models import SystemLoginResponse``. Modul
+domain baru di-import saat namanya pertama kali diakses, jadi mengambil
+``GetAllCharactersResponse`` tidak ikut memuat Py3AMF atau pycryptodome.
 """
 
-from ..models_common import *  # noqa: F401,F403
-from ..models_system_login import *  # noqa: F401,F403
-from ..models_characters import *  # noqa: F401,F403
-from ..get_character_data_models import *  # noqa: F401,F403
-from ..models_workflow import *  # noqa: F401,F403
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ..get_character_data_models import *  # noqa: F401,F403
+    from ..models_characters import *  # noqa: F401,F403
+    from ..models_common import *  # noqa: F401,F403
+    from ..models_system_login import *  # noqa: F401,F403
+    from ..models_workflow import *  # noqa: F401,F403
+
+# Harus sama dengan ``__all__`` tiap modul; dicek oleh ``python -m benchmarks.import_time``.
+_MODULES = {
+    "models_common": (
+        "CheckVersionRequest",
+        "CheckVersionResponse",
+        "AnalyticsLibrariesRequest",
+        "AnalyticsLibrariesResponse",
+        "EventsServiceGetRequest",
+        "EventCollections",
+        "EventsServiceGetResponse",
+    ),
+    "models_system_login": ("SystemLoginRequest", "SystemLoginResponse", "LoginBanner"),
+    "models_characters": ("CharacterSummary", "GetAllCharactersRequest", "GetAllCharactersResponse"),
+    "get_character_data_models": (
+        "CharacterPoints",
+        "CharacterSlots",
+        "CharacterCoreData",
+        "CharacterSets",
+        "CharacterInventory",
+        "ClanInfo",
+        "GetCharacterDataResponse",
+    ),
+    "models_workflow": ("WorkflowResult",),
+}
+_LAZY = {name: module for module, names in _MODULES.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"..{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = list(_LAZY)
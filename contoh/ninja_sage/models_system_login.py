@@ -10,9 +10,9 @@ This module contains request/response types and helpers for:
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, List, Mapping, Sequence
+from typing import Any, Iterable, List, Mapping, Sequence, Tuple
 
-from .login_payload import DEFAULT_LIBRARY_URL, LoaderInfo, build_login_components
+from .login_payload import DEFAULT_LIBRARY_URL, LoaderInfo, build_login_components, login_payload_factory
 
 
 @dataclass(slots=True)
@@ -62,6 +62,32 @@ class SystemLoginRequest:
             password_length=components["password_length"],
         )
 
+    @classmethod
+    def batch_from_credentials(
+        cls,
+        credentials: Iterable[Tuple[str, str] | Any],
+        *,
+        character_seed: int,
+        character_key: str,
+        loader: LoaderInfo | None = None,
+        library_url: str = DEFAULT_LIBRARY_URL,
+    ) -> List["SystemLoginRequest"]:
+        """Build one request per ``(username, password)`` pair (or ``Credentials``).
+
+        All accounts share the seed-derived strings and AES key schedule of
+        one :class:`~ninja_sage.login_payload.LoginPayloadFactory`; only the
+        password is encrypted per account.
+        """
+
+        if character_seed is None or character_key is None:
+            raise ValueError("character_seed dan character_key wajib tersedia dari checkVersion")
+        factory = login_payload_factory(character_seed, character_key, loader=loader, library_url=library_url)
+        requests: List[SystemLoginRequest] = []
+        for item in credentials:
+            username, password = (item.username, item.password) if hasattr(item, "username") else item
+            requests.append(cls(**factory.components(username, password)))
+        return requests
+
     def to_body(self) -> List[Any]:
         # Match the in‑game AMF types:
         # [0] String username
@@ -0,0 +1,116 @@
+"""Sparse fieldsets: extract only selected paths from a model tree.
+
+A projection is written as comma separated dotted paths, for example::
+
+    characters.characters.name,characters.characters.level,character_data.character.xp
+
+Lists are traversed implicitly, so ``characters.characters.name`` picks the
+``name`` of every ``CharacterSummary``. :func:`compile_projection` validates
+the paths against the dataclass annotations once and caches the resulting
+plan, so applying it per request only touches the requested attributes.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import types
+import typing
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Tuple, Union
+
+# A plan is a tuple of (name, subplan) pairs; ``None`` selects the whole value.
+Plan = Union[Tuple[Tuple[str, "Plan"], ...], None]
+
+
+class ProjectionError(ValueError):
+    """Raised when a ``fields`` expression names an unknown path."""
+
+
+@lru_cache(maxsize=None)
+def _field_types(cls: type) -> dict[str, Any]:
+    return typing.get_type_hints(cls)
+
+
+def _dataclass_of(annotation: Any) -> type | None:
+    """Return the dataclass behind ``X``, ``X | None`` or ``List[X]``, if any."""
+
+    if isinstance(annotation, type) and dataclasses.is_dataclass(annotation):
+        return annotation
+    origin = typing.get_origin(annotation)
+    if origin in (Union, types.UnionType, list, tuple):
+        for arg in typing.get_args(annotation):
+            found = _dataclass_of(arg)
+            if found is not None:
+                return found
+    return None
+
+
+def _build(paths: list[list[str]], cls: type | None, prefix: str) -> Plan:
+    if any(not path for path in paths):
+        return None
+    grouped: dict[str, list[list[str]]] = {}
+    for path in paths:
+        grouped.setdefault(path[0], []).append(path[1:])
+
+    plan = []
+    for name, rest in grouped.items():
+        child_cls = None
+        if cls is not None:
+            hints = _field_types(cls)
+            if name not in hints:
+                raise ProjectionError(f"field tidak dikenal: {prefix}{name}")
+            child_cls = _dataclass_of(hints[name])
+        plan.append((name, _build(rest, child_cls, f"{prefix}{name}.")))
+    return tuple(plan)
+
+
+@dataclass(frozen=True, slots=True)
+class Projection:
+    root: type
+    plan: Plan
+
+    def apply(self, obj: Any) -> Any:
+        """Return a plain structure containing only the projected paths."""
+
+        return _apply(self.plan, obj)
+
+    def select(self, name: str) -> "Projection | None":
+        """Sub-projection for top-level field *name*, or ``None`` if not selected."""
+
+        if self.plan is None:
+            return Projection(root=self.root, plan=None)
+        for field_name, subplan in self.plan:
+            if field_name == name:
+                return Projection(root=self.root, plan=subplan)
+        return None
+
+
+def _apply(plan: Plan, obj: Any) -> Any:
+    if plan is None or obj is None:
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [_apply(plan, item) for item in obj]
+    if dataclasses.is_dataclass(obj):
+        return {name: _apply(subplan, getattr(obj, name)) for name, subplan in plan if hasattr(obj, name)}
+    if isinstance(obj, Mapping):
+        return {name: _apply(subplan, obj[name]) for name, subplan in plan if name in obj}
+    return obj
+
+
+@lru_cache(maxsize=256)
+def compile_projection(fields: str, root: type) -> Projection:
+    """Parse and validate a ``fields`` expression against dataclass *root*."""
+
+    paths = [
+        [segment.strip() for segment in item.split(".")]
+        for item in fields.split(",")
+        if item.strip()
+    ]
+    if not paths or any(not segment for path in paths for segment in path):
+        raise ProjectionError(f"ekspresi fields tidak valid: {fields!r}")
+    return Projection(root=root, plan=_build(paths, root, ""))
+
+
+__all__ = ["Projection", "ProjectionError", "compile_projection"]
@@ -0,0 +1,209 @@
+"""Upstream concurrency limiter and fair scheduler for AMF calls.
+
+:class:`UpstreamScheduler` decides when a call to the game server may
+start. It enforces:
+
+* a global limit of in-flight calls (``max_in_flight``);
+* a per-account limit (``per_account``), so one account refreshing many
+  characters cannot take every upstream connection;
+* an optional token bucket (``rate`` calls per second, ``burst`` size)
+  that keeps the overall request rate polite.
+
+Waiting calls are ordered with start-time fair queuing: every account
+gets a virtual clock that advances by ``1 / weight`` per call, and the
+call with the smallest start tag among eligible accounts goes next. Queue
+depth and wait times are exported through :meth:`UpstreamScheduler.stats`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping
+
+from .stats import LatencyStats
+
+_POLL_INTERVAL = 0.05
+
+
+class TokenBucket:
+    """Classic token bucket; not thread-safe on its own."""
+
+    def __init__(self, rate: float, burst: float | None = None, *, clock=time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("rate harus lebih besar dari 0")
+        if burst is not None and burst < 1:
+            # A bucket that never holds a whole token never admits anything.
+            raise ValueError("burst minimal 1")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def delay(self) -> float:
+        """Seconds until the next token is available."""
+
+        self._refill()
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+
+@dataclass(order=True)
+class _Ticket:
+    tag: float
+    seq: int
+    account: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    admitted: threading.Event = field(compare=False, default_factory=threading.Event)
+
+
+class UpstreamScheduler:
+    """Admit upstream calls under global, per-account and rate limits."""
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = 16,
+        per_account: int = 2,
+        rate: float | None = None,
+        burst: float | None = None,
+        weights: Mapping[str, float] | None = None,
+        default_weight: float = 1.0,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.per_account = per_account
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._lock = threading.Lock()
+        self._waiting: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._last_tag: Dict[str, float] = {}
+        self._waiting_by_account: Dict[str, int] = {}
+        self._in_flight = 0
+        self._account_in_flight: Dict[str, int] = {}
+        self._admitted = 0
+        self._max_depth = 0
+        self._wait_stats = LatencyStats()
+
+    @contextmanager
+    def slot(self, account: str | None = None) -> Iterator[None]:
+        """Block until the call may start; release the slot on exit."""
+
+        key = account or ""
+        ticket = self._enqueue(key)
+        try:
+            while not ticket.admitted.is_set():
+                with self._lock:
+                    delay = self._dispatch_locked()
+                ticket.admitted.wait(delay if delay is not None else _POLL_INTERVAL)
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {
+                "queue_depth": len(self._waiting),
+                "max_queue_depth": self._max_depth,
+                "in_flight": self._in_flight,
+                "admitted": self._admitted,
+                "waiting_by_account": dict(self._waiting_by_account),
+                "in_flight_by_account": {k: v for k, v in self._account_in_flight.items() if v},
+            }
+        snapshot["wait"] = self._wait_stats.summary()
+        return snapshot
+
+    # Internal -------------------------------------------------------------
+    def _enqueue(self, account: str) -> _Ticket:
+        weight = self.weights.get(account, self.default_weight) or self.default_weight
+        with self._lock:
+            start = max(self._virtual_time, self._last_tag.get(account, 0.0))
+            self._last_tag[account] = start + 1.0 / weight
+            self._waiting_by_account[account] = self._waiting_by_account.get(account, 0) + 1
+            ticket = _Ticket(tag=start, seq=next(self._seq), account=account, enqueued_at=time.perf_counter())
+            bisect.insort(self._waiting, ticket)
+            self._max_depth = max(self._max_depth, len(self._waiting))
+            self._dispatch_locked()
+        return ticket
+
+    def _dispatch_locked(self) -> float | None:
+        """Admit as many waiting tickets as limits allow.
+
+        Returns how long to sleep before a token becomes available, or
+        ``None`` when waiters should just wait for a release.
+        """
+
+        while self._waiting and self._in_flight < self.max_in_flight:
+            index = next(
+                (
+                    i
+                    for i, ticket in enumerate(self._waiting)
+                    if self._account_in_flight.get(ticket.account, 0) < self.per_account
+                ),
+                None,
+            )
+            if index is None:
+                return None
+            if self._bucket is not None and not self._bucket.try_take():
+                return self._bucket.delay()
+            ticket = self._waiting.pop(index)
+            self._forget_locked(ticket.account)
+            self._in_flight += 1
+            self._account_in_flight[ticket.account] = self._account_in_flight.get(ticket.account, 0) + 1
+            self._admitted += 1
+            self._virtual_time = max(self._virtual_time, ticket.tag)
+            self._wait_stats.record(time.perf_counter() - ticket.enqueued_at)
+            ticket.admitted.set()
+        return None
+
+    def _forget_locked(self, account: str) -> None:
+        # Once an account has nothing queued its virtual clock is at most one
+        # call ahead of the global one; drop it so idle accounts cost nothing.
+        remaining = self._waiting_by_account[account] - 1
+        if remaining:
+            self._waiting_by_account[account] = remaining
+        else:
+            del self._waiting_by_account[account]
+            self._last_tag.pop(account, None)
+
+    def _release(self, account: str) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._account_in_flight[account] -= 1
+            if not self._account_in_flight[account]:
+                del self._account_in_flight[account]
+            self._dispatch_locked()
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                self._forget_locked(ticket.account)
+                return
+        if ticket.admitted.is_set():
+            self._release(ticket.account)
+
+
+__all__ = ["TokenBucket", "UpstreamScheduler"]
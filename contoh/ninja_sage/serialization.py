@@ -0,0 +1,103 @@
+"""Fast JSON serialisation of the response dataclasses.
+
+``dataclasses.asdict`` deep-copies every list and ``raw`` mapping before
+``json.dumps`` walks the same tree again. The helpers here let the C JSON
+encoder walk the original objects instead: dataclasses are turned into a
+shallow ``{field: value}`` dict from a field plan computed once per class,
+and everything else is handed to the encoder untouched. Py3AMF leftovers
+(``ByteArray``, ``ASObject``, typed objects, ``datetime``) are converted on
+the fly.
+"""
+
+from __future__ import annotations
+
+import base64
+import dataclasses
+import datetime as _dt
+import json
+from collections.abc import Mapping, Set
+from functools import lru_cache
+from typing import Any, Callable, Tuple
+
+RAW_FIELD = "raw"
+
+
+@lru_cache(maxsize=None)
+def field_plan(cls: type, exclude_raw: bool = False) -> Tuple[str, ...]:
+    """Names of the fields to serialise for dataclass *cls*, computed once."""
+
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    if exclude_raw:
+        names = tuple(name for name in names if name != RAW_FIELD)
+    return names
+
+
+def _convert_leaf(obj: Any) -> Any:
+    """Turn non-JSON values into JSON-friendly ones, or raise ``TypeError``."""
+
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(obj)).decode("ascii")
+    getvalue = getattr(obj, "getvalue", None)
+    if callable(getvalue):
+        # pyamf.amf3.ByteArray and other BytesIO-like buffers.
+        return base64.b64encode(getvalue()).decode("ascii")
+    if isinstance(obj, (_dt.datetime, _dt.date, _dt.time)):
+        return obj.isoformat()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (Set, tuple)):
+        return list(obj)
+    if hasattr(obj, "__dict__"):
+        # Py3AMF typed objects decoded from class aliases.
+        return {key: value for key, value in vars(obj).items() if not callable(value)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _make_default(exclude_raw: bool) -> Callable[[Any], Any]:
+    def _default(obj: Any) -> Any:
+        cls = type(obj)
+        if dataclasses.is_dataclass(cls):
+            return {name: getattr(obj, name) for name in field_plan(cls, exclude_raw)}
+        return _convert_leaf(obj)
+
+    return _default
+
+
+_ENCODERS = {
+    exclude_raw: json.JSONEncoder(ensure_ascii=False, default=_make_default(exclude_raw))
+    for exclude_raw in (False, True)
+}
+
+
+def dumps(obj: Any, *, exclude_raw: bool = False) -> str:
+    """Serialise a model tree (or any JSON-like value) to a JSON string."""
+
+    return _ENCODERS[exclude_raw].encode(obj)
+
+
+def dumps_bytes(obj: Any, *, exclude_raw: bool = False) -> bytes:
+    """Like :func:`dumps` but returns UTF-8 bytes ready for the socket."""
+
+    return dumps(obj, exclude_raw=exclude_raw).encode("utf-8")
+
+
+def to_builtins(obj: Any, *, exclude_raw: bool = False) -> Any:
+    """Convert a model tree into plain dicts/lists/scalars.
+
+    Used where a real Python structure is needed (projections, binary
+    encoders); JSON output should go through :func:`dumps_bytes` instead.
+    """
+
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    cls = type(obj)
+    if dataclasses.is_dataclass(cls):
+        return {name: to_builtins(getattr(obj, name), exclude_raw=exclude_raw) for name in field_plan(cls, exclude_raw)}
+    if isinstance(obj, Mapping):
+        return {str(key): to_builtins(value, exclude_raw=exclude_raw) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, Set)):
+        return [to_builtins(value, exclude_raw=exclude_raw) for value in obj]
+    return to_builtins(_convert_leaf(obj), exclude_raw=exclude_raw)
+
+
+__all__ = ["dumps", "dumps_bytes", "field_plan", "to_builtins"]
@@ -9,6 +9,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
+from ..assets import default_registry
 from ..client import NinjaSageClient
 from ..login_payload import DEFAULT_LIBRARY_URL, LoaderInfo
 from ..models import (
@@ -41,11 +42,14 @@ class SystemLoginService:
 
     def check_version(self, channel: str = "Public 0.52") -> CheckVersionResponse:
         request = CheckVersionRequest(channel=channel)
-        return self._call(
+        response = self._call(
             "SystemLogin.checkVersion",
             request.to_body(),
             CheckVersionResponse.from_content,
         )
+        # A new CDN build invalidates cached library levels / asset lengths.
+        default_registry().observe_version(response.cdn)
+        return response
 
     def login_user(
         self,
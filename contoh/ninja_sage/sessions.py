@@ -0,0 +1,87 @@
+"""Thread-safe ``requests`` session handling for the AMF client.
+
+:class:`SessionPool` owns one :class:`requests.adapters.HTTPAdapter`, and
+therefore one urllib3 connection pool, with a configurable size and retry
+policy. It hands out sessions in one of two strategies:
+
+* ``per_thread=False`` (default): a single shared session. Sending
+  requests through it is safe from many threads as long as nobody mutates
+  it afterwards, which the client no longer does.
+* ``per_thread=True``: every thread gets its own lightweight session
+  (separate cookie jar) mounted on the *same* adapter, so threads never
+  contend on session state but still reuse pooled keep-alive connections.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _retry_policy(max_retries: int) -> Retry:
+    # Only failures before the request reached the server are retried: AMF
+    # calls such as loginUser are not idempotent.
+    return Retry(total=max_retries, connect=max_retries, read=0, status=0, other=0, backoff_factor=0.1)
+
+
+class SessionPool:
+    """Hand out ``requests`` sessions that share one connection pool."""
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 4,
+        pool_maxsize: int = 32,
+        max_retries: int = 0,
+        per_thread: bool = False,
+        verify: bool = False,
+        session: requests.Session | None = None,
+    ) -> None:
+        self.per_thread = per_thread and session is None
+        self.verify = verify
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=_retry_policy(max_retries),
+            pool_block=False,
+        )
+        self._shared = session if session is not None else self._new_session()
+        if session is not None:
+            session.verify = verify
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: list[requests.Session] = [self._shared]
+
+    def current(self) -> requests.Session:
+        """Session to use on the calling thread."""
+
+        if not self.per_thread:
+            return self._shared
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """Close every session handed out and the shared connection pool."""
+
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self.adapter.close()
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.verify = self.verify
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        return session
+
+
+__all__ = ["SessionPool"]
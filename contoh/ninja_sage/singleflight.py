@@ -0,0 +1,247 @@
+"""Request coalescing and a small TTL cache with stale-while-revalidate.
+
+:class:`SingleFlight` makes concurrent callers with the same key share one
+execution of an expensive function. :class:`TTLCache` builds on it: fresh
+entries are served directly, stale entries are served while a single
+background refresh runs, and expired entries are reloaded through the
+single-flight group so a burst of misses still costs one upstream call.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Run *fn* once per key at a time.
+
+        Returns ``(result, shared)`` where ``shared`` is ``True`` when the
+        caller waited for another thread's execution instead of running
+        *fn* itself. Exceptions are propagated to every waiter.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    shared: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+@dataclass(slots=True)
+class _Entry(Generic[T]):
+    value: T
+    fresh_until: float
+    stale_until: float
+
+
+@dataclass
+class TTLCache(Generic[T]):
+    """LRU-bounded cache with a fresh window and a stale-while-revalidate window.
+
+    ``ttl`` seconds after a load the entry is fresh. For the following
+    ``stale_ttl`` seconds it is still served, but the first reader kicks off
+    a background refresh. A ``ttl`` of ``0`` disables caching while keeping
+    request coalescing.
+
+    :meth:`invalidate` bumps a generation counter; a load that started in an
+    earlier generation still returns its value to its callers but does not
+    store it, so an invalidation is never undone by a load already in flight.
+    """
+
+    ttl: float = 5.0
+    stale_ttl: float = 0.0
+    max_entries: int = 1024
+    clock: Callable[[], float] = time.monotonic
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry[T]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._generation = 0
+        # Generation of the last invalidate(None), and of the last
+        # invalidate(key) for keys with loads in flight.
+        self._cleared = 0
+        self._invalidated: Dict[Hashable, int] = {}
+        self._loading: Dict[Hashable, int] = {}
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T]) -> T:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now < entry.fresh_until:
+                    self.stats.hits += 1
+                    return entry.value
+                if now < entry.stale_until:
+                    self.stats.stale_hits += 1
+                    stale = entry
+                else:
+                    stale = None
+            else:
+                stale = None
+
+        if stale is not None:
+            self._refresh_in_background(key, loader)
+            return stale.value
+
+        value, shared = self._flight.do(key, lambda: self._load(key, loader))
+        with self._lock:
+            if shared:
+                self.stats.shared += 1
+            else:
+                self.stats.misses += 1
+        return value
+
+    def peek(self, key: Hashable) -> T | None:
+        """Return a fresh or stale cached value without loading or counting stats."""
+
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.stale_until:
+                return entry.value
+        return None
+
+    def put(self, key: Hashable, value: T) -> None:
+        """Store a value computed outside :meth:`get_or_load`."""
+
+        self._load(key, lambda: value)
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop one entry, or every entry when *key* is ``None``."""
+
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+                self._invalidated.clear()
+                self._cleared = self._generation
+            else:
+                self._entries.pop(key, None)
+                if key in self._loading:
+                    self._invalidated[key] = self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Internal -------------------------------------------------------------
+    def _load(self, key: Hashable, loader: Callable[[], T]) -> T:
+        with self._lock:
+            started = self._generation
+            self._loading[key] = self._loading.get(key, 0) + 1
+        try:
+            value = loader()
+        except BaseException:
+            with self._lock:
+                self._finish_load(key, started)
+            raise
+        loaded_at = self.clock()
+        with self._lock:
+            if self._finish_load(key, started) and self.ttl > 0:
+                self._entries[key] = _Entry(
+                    value=value,
+                    fresh_until=loaded_at + self.ttl,
+                    stale_until=loaded_at + self.ttl + self.stale_ttl,
+                )
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def _finish_load(self, key: Hashable, started: int) -> bool:
+        """Account for a finished load; ``True`` when no invalidation happened since it started."""
+
+        current = started >= self._cleared and started >= self._invalidated.get(key, 0)
+        self._loading[key] -= 1
+        if not self._loading[key]:
+            del self._loading[key]
+            self._invalidated.pop(key, None)
+        return current
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], T]) -> None:
+        if self._flight.in_flight(key):
+            return
+
+        def _refresh() -> None:
+            try:
+                self._flight.do(key, lambda: self._load(key, loader))
+            except Exception:
+                with self._lock:
+                    self.stats.refresh_errors += 1
+                return
+            with self._lock:
+                self.stats.refreshes += 1
+
+        threading.Thread(target=_refresh, name="ttlcache-refresh", daemon=True).start()
+
+
+__all__ = ["CacheStats", "SingleFlight", "TTLCache"]
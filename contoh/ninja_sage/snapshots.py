@@ -0,0 +1,422 @@
+"""Time series of ``getCharacterData`` snapshots in SQLite.
+
+Every fetched :class:`GetCharacterDataResponse` can be appended to a
+:class:`SnapshotStore`. Rows stay small even with months of frequent
+polling:
+
+* the response is flattened to ``{"character.xp": ..., "sets.weapon": ...}``
+  and only the paths that changed since the previous snapshot of that
+  character are stored (zlib-compressed JSON); every ``keyframe_interval``
+  rows a full copy bounds the replay needed to rebuild a state;
+* a poll that changed nothing does not add a row, it only extends
+  ``seen_until`` of the latest one;
+* the chart metrics (level, xp, gold, tp, ...) are plain indexed columns,
+  so :meth:`SnapshotStore.series` never decodes a payload;
+* :meth:`SnapshotStore.compact` thins history older than a cutoff down to
+  one snapshot per ``resolution`` seconds.
+
+The store opens its SQLite connection lazily per process, so it can be
+created before ``api_server --processes`` forks.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from .get_character_data_models import GetCharacterDataResponse
+from .serialization import to_builtins
+
+METRICS = ("level", "xp", "gold", "tp", "ss", "rank", "prestige", "merit", "pvp_points")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    character_id INTEGER NOT NULL,
+    taken_at REAL NOT NULL,
+    seen_until REAL NOT NULL,
+    keyframe INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    {", ".join(f"{name} INTEGER" for name in METRICS)}
+);
+CREATE INDEX IF NOT EXISTS snapshots_character_time ON snapshots(character_id, taken_at);
+"""
+
+_COLUMNS = ("id", "taken_at", "seen_until", "keyframe", "payload")
+_MISSING = object()
+
+
+def flatten(value: Mapping[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Nested mappings -> ``{"a.b": leaf}``; lists are kept as leaves."""
+
+    flat: Dict[str, Any] = {}
+    for key, item in value.items():
+        path = f"{prefix}{key}"
+        if isinstance(item, Mapping) and item:
+            flat.update(flatten(item, path + "."))
+        else:
+            flat[path] = item
+    return flat
+
+
+def unflatten(flat: Mapping[str, Any]) -> Dict[str, Any]:
+    nested: Dict[str, Any] = {}
+    for path, value in flat.items():
+        node = nested
+        *parents, leaf = path.split(".")
+        for name in parents:
+            node = node.setdefault(name, {})
+        node[leaf] = value
+    return nested
+
+
+def _pack(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def _delta(old: Mapping[str, Any], new: Mapping[str, Any]) -> Dict[str, Any]:
+    changed = {path: value for path, value in new.items() if old.get(path, _MISSING) != value}
+    removed = [path for path in old if path not in new]
+    return {"set": changed, "del": removed} if removed else {"set": changed}
+
+
+def _apply(state: Dict[str, Any], delta: Mapping[str, Any]) -> None:
+    state.update(delta["set"])
+    for path in delta.get("del", ()):
+        state.pop(path, None)
+
+
+def _metrics(flat: Mapping[str, Any]) -> Tuple[Any, ...]:
+    values = []
+    for name in METRICS:
+        value = flat.get(f"character.{name}")
+        values.append(value if isinstance(value, int) and not isinstance(value, bool) else None)
+    return tuple(values)
+
+
+@dataclass(slots=True)
+class _Head:
+    row_id: int
+    state: Dict[str, Any]
+    since_keyframe: int
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    characters: int = 0
+    removed: int = 0
+    kept: int = 0
+    elapsed: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "characters": self.characters,
+            "removed": self.removed,
+            "kept": self.kept,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+class SnapshotStore:
+    """Append-only (until compacted) snapshot history per character."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        keyframe_interval: int = 64,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._db: sqlite3.Connection | None = None
+        self._heads: Dict[int, _Head] = {}
+
+    # Writing --------------------------------------------------------------
+    def append(self, response: GetCharacterDataResponse, *, taken_at: float | None = None) -> str | None:
+        """Store *response*; returns ``"keyframe"``, ``"delta"``, ``"unchanged"``.
+
+        ``None`` when the response carries no character.
+        """
+
+        character = response.character
+        if character is None or character.character_id is None:
+            return None
+        character_id = int(character.character_id)
+        state = flatten(to_builtins(response, exclude_raw=True))
+        taken_at = self._clock() if taken_at is None else taken_at
+        with self._lock:
+            db = self._conn()
+            with db:
+                # IMMEDIATE: other processes appending to the same file wait here.
+                db.execute("BEGIN IMMEDIATE")
+                head = self._head(db, character_id)
+                if head is not None and head.state == state:
+                    db.execute(
+                        "UPDATE snapshots SET seen_until = MAX(seen_until, ?) WHERE id = ?",
+                        (taken_at, head.row_id),
+                    )
+                    return "unchanged"
+                keyframe = head is None or head.since_keyframe + 1 >= self.keyframe_interval
+                payload = state if keyframe else _delta(head.state, state)
+                row_id = self._insert(db, character_id, taken_at, taken_at, keyframe, payload, state)
+                self._heads[character_id] = _Head(row_id, state, 0 if keyframe else head.since_keyframe + 1)
+        return "keyframe" if keyframe else "delta"
+
+    def compact(self, *, older_than: float, resolution: float = 3600.0) -> CompactionReport:
+        """Keep one snapshot per *resolution* seconds for rows older than *older_than* seconds."""
+
+        started = time.perf_counter()
+        cutoff = self._clock() - older_than
+        report = CompactionReport()
+        with self._lock:
+            db = self._conn()
+            characters = [
+                row[0]
+                for row in db.execute(
+                    "SELECT DISTINCT character_id FROM snapshots WHERE taken_at < ?", (cutoff,)
+                )
+            ]
+            for character_id in characters:
+                with db:
+                    db.execute("BEGIN IMMEDIATE")
+                    removed, kept = self._compact_character(db, character_id, cutoff, resolution)
+                report.characters += 1
+                report.removed += removed
+                report.kept += kept
+            self._heads.clear()
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    # Reading --------------------------------------------------------------
+    def series(
+        self,
+        character_id: int,
+        metrics: Sequence[str] = ("level", "xp", "gold", "tp"),
+        *,
+        since: float | None = None,
+        until: float | None = None,
+        step: float | None = None,
+        limit: int = 10000,
+    ) -> List[Dict[str, Any]]:
+        """``[{"t": taken_at, "until": seen_until, <metric>: value}, ...]`` in time order.
+
+        With *step* only the last snapshot of every ``step``-second bucket is
+        returned.
+        """
+
+        unknown = [name for name in metrics if name not in METRICS]
+        if unknown:
+            raise ValueError(f"Metrik tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(METRICS)})")
+        clauses, params = self._range(character_id, since, until)
+        columns = ", ".join(("taken_at", "seen_until", *metrics))
+        if step:
+            # SQLite returns the bare columns of the row holding MAX(taken_at).
+            query = (
+                f"SELECT MAX(taken_at) AS last, {columns} FROM snapshots WHERE {clauses}"
+                " GROUP BY CAST(taken_at / ? AS INTEGER) ORDER BY last LIMIT ?"
+            )
+            params = (*params, step, limit)
+        else:
+            query = f"SELECT {columns} FROM snapshots WHERE {clauses} ORDER BY taken_at, id LIMIT ?"
+            params = (*params, limit)
+        with self._lock:
+            rows = self._conn().execute(query, params).fetchall()
+        points = []
+        for row in rows:
+            values = row[1:] if step else row
+            point = {"t": values[0], "until": values[1]}
+            point.update(zip(metrics, values[2:]))
+            points.append(point)
+        return points
+
+    def state_at(self, character_id: int, when: float | None = None) -> Dict[str, Any] | None:
+        """Rebuild the full (nested) snapshot that was current at *when* (default: latest)."""
+
+        with self._lock:
+            db = self._conn()
+            target = db.execute(
+                "SELECT id, taken_at FROM snapshots WHERE character_id = ? AND taken_at <= ?"
+                " ORDER BY taken_at DESC, id DESC LIMIT 1",
+                (character_id, float("inf") if when is None else when),
+            ).fetchone()
+            if target is None:
+                return None
+            rows = self._replay_rows(db, character_id, target[1], target[0])
+        state = self._rebuild(rows)
+        return {"taken_at": target[1], "data": unflatten(state)}
+
+    def characters(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT character_id, COUNT(*), MIN(taken_at), MAX(seen_until) FROM snapshots"
+                " GROUP BY character_id ORDER BY character_id"
+            ).fetchall()
+        return [{"character_id": row[0], "snapshots": row[1], "first": row[2], "last": row[3]} for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows, keyframes, payload = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(keyframe), 0), COALESCE(SUM(LENGTH(payload)), 0) FROM snapshots"
+            ).fetchone()
+        return {"path": str(self.path), "snapshots": rows, "keyframes": keyframes, "payload_bytes": payload}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None and self._pid == os.getpid():
+                self._db.close()
+            self._db = None
+            self._heads.clear()
+
+    # Internal -------------------------------------------------------------
+    def _conn(self) -> sqlite3.Connection:
+        # A connection inherited through fork() must not be used by the child.
+        if self._db is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False, timeout=30.0)
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            db.executescript(SCHEMA)
+            self._db, self._pid = db, os.getpid()
+            self._heads = {}
+        return self._db
+
+    @staticmethod
+    def _range(character_id: int, since: float | None, until: float | None) -> Tuple[str, Tuple[Any, ...]]:
+        clauses = ["character_id = ?"]
+        params: List[Any] = [character_id]
+        if since is not None:
+            clauses.append("taken_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("taken_at < ?")
+            params.append(until)
+        return " AND ".join(clauses), tuple(params)
+
+    def _head(self, db: sqlite3.Connection, character_id: int) -> _Head | None:
+        latest = db.execute(
+            "SELECT id, taken_at FROM snapshots WHERE character_id = ? ORDER BY taken_at DESC, id DESC LIMIT 1",
+            (character_id,),
+        ).fetchone()
+        if latest is None:
+            self._heads.pop(character_id, None)
+            return None
+        head = self._heads.get(character_id)
+        if head is not None and head.row_id == latest[0]:
+            return head
+        # Written by another process (or first use): rebuild from the last keyframe.
+        rows = self._replay_rows(db, character_id, latest[1], latest[0])
+        head = _Head(latest[0], self._rebuild(rows), sum(1 for row in rows if not row[3]))
+        self._heads[character_id] = head
+        return head
+
+    @staticmethod
+    def _replay_rows(
+        db: sqlite3.Connection, character_id: int, taken_at: float, row_id: int
+    ) -> List[Tuple[Any, ...]]:
+        """Rows from the last keyframe up to and including ``(taken_at, row_id)``."""
+
+        keyframe = db.execute(
+            "SELECT taken_at, id FROM snapshots WHERE character_id = ? AND keyframe = 1"
+            " AND (taken_at < ? OR (taken_at = ? AND id <= ?)) ORDER BY taken_at DESC, id DESC LIMIT 1",
+            (character_id, taken_at, taken_at, row_id),
+        ).fetchone()
+        start = keyframe if keyframe is not None else (float("-inf"), 0)
+        return db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM snapshots WHERE character_id = ?"
+            " AND (taken_at > ? OR (taken_at = ? AND id >= ?))"
+            " AND (taken_at < ? OR (taken_at = ? AND id <= ?)) ORDER BY taken_at, id",
+            (character_id, start[0], start[0], start[1], taken_at, taken_at, row_id),
+        ).fetchall()
+
+    @staticmethod
+    def _rebuild(rows: Iterable[Tuple[Any, ...]]) -> Dict[str, Any]:
+        state: Dict[str, Any] = {}
+        for row in rows:
+            payload = _unpack(row[4])
+            if row[3]:
+                state = payload
+            else:
+                _apply(state, payload)
+        return state
+
+    def _insert(
+        self,
+        db: sqlite3.Connection,
+        character_id: int,
+        taken_at: float,
+        seen_until: float,
+        keyframe: bool,
+        payload: Any,
+        state: Mapping[str, Any],
+    ) -> int:
+        cursor = db.execute(
+            f"INSERT INTO snapshots (character_id, taken_at, seen_until, keyframe, payload, {', '.join(METRICS)})"
+            f" VALUES (?, ?, ?, ?, ?, {', '.join('?' for _ in METRICS)})",
+            (character_id, taken_at, seen_until, int(keyframe), _pack(payload), *_metrics(state)),
+        )
+        return int(cursor.lastrowid)
+
+    def _compact_character(
+        self, db: sqlite3.Connection, character_id: int, cutoff: float, resolution: float
+    ) -> Tuple[int, int]:
+        rows = db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM snapshots WHERE character_id = ? ORDER BY taken_at, id",
+            (character_id,),
+        ).fetchall()
+        old = [row for row in rows if row[1] < cutoff]
+        recent = rows[len(old) :]
+        # Last snapshot of every bucket survives; it keeps the bucket's seen_until.
+        last_in_bucket: Dict[int, int] = {}
+        for index, row in enumerate(old):
+            last_in_bucket[int(row[1] // resolution)] = index
+        keep = set(last_in_bucket.values())
+        if len(keep) == len(old):
+            return 0, len(old)
+
+        db.executemany("DELETE FROM snapshots WHERE id = ?", ((row[0],) for row in old))
+        state: Dict[str, Any] = {}
+        previous: Dict[str, Any] | None = None
+        since_keyframe = 0
+        for index, row in enumerate(old):
+            payload = _unpack(row[4])
+            if row[3]:
+                state = payload
+            else:
+                _apply(state, payload)
+            if index not in keep:
+                continue
+            keyframe = previous is None or since_keyframe + 1 >= self.keyframe_interval
+            self._insert(
+                db,
+                character_id,
+                row[1],
+                row[2],
+                keyframe,
+                dict(state) if keyframe else _delta(previous, state),
+                state,
+            )
+            previous = dict(state)
+            since_keyframe = 0 if keyframe else since_keyframe + 1
+        if recent and not recent[0][3]:
+            # Its base row may be gone: store the first recent snapshot in full.
+            _apply(state, _unpack(recent[0][4]))
+            db.execute("UPDATE snapshots SET keyframe = 1, payload = ? WHERE id = ?", (_pack(state), recent[0][0]))
+        return len(old) - len(keep), len(keep)
+
+
+__all__ = ["METRICS", "CompactionReport", "SnapshotStore", "flatten", "unflatten"]
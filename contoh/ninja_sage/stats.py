@@ -0,0 +1,64 @@
+"""Small latency bookkeeping helpers shared by benchmarks and servers."""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, List, Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LatencyStats:
+    """Thread-safe collector of latency samples (in seconds)."""
+
+    def __init__(self) -> None:
+        self._samples: List[float] = []
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def record_error(self) -> None:
+        with self._lock:
+            self._errors += 1
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def errors(self) -> int:
+        return self._errors
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, error count, mean, min, max and p50/p95/p99 in milliseconds."""
+
+        with self._lock:
+            values = sorted(self._samples)
+            errors = self._errors
+        if not values:
+            return {"count": 0, "errors": errors}
+        to_ms = 1000.0
+        return {
+            "count": len(values),
+            "errors": errors,
+            "mean_ms": sum(values) / len(values) * to_ms,
+            "min_ms": values[0] * to_ms,
+            "max_ms": values[-1] * to_ms,
+            "p50_ms": percentile(values, 50) * to_ms,
+            "p95_ms": percentile(values, 95) * to_ms,
+            "p99_ms": percentile(values, 99) * to_ms,
+        }
+
+
+__all__ = ["LatencyStats", "percentile"]
@@ -0,0 +1,364 @@
+"""Pluggable transports used by :class:`ninja_sage.client.NinjaSageClient`.
+
+A transport moves raw bytes: encoded AMF envelopes to the game server and
+static ``.bin`` assets from the CDN. Swapping the transport lets the whole
+workflow run against live servers, record a session to disk, or replay a
+recorded session completely offline:
+
+* :class:`HttpTransport` – default, talks to the real endpoints.
+* :class:`RecordingTransport` – wraps another transport and persists every
+  request/response pair plus its timing to a capture directory.
+* :class:`ReplayTransport` – serves responses from a capture directory,
+  optionally sleeping for the recorded latency.
+
+Capture directories contain ``manifest.jsonl`` (one JSON object per call)
+and the raw bodies as ``.amf``/``.bin`` files next to it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.request
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Mapping, Protocol
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import requests
+
+    from .sessions import SessionPool
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+class AssetTransport(Protocol):
+    """Anything that can download static CDN assets (see :func:`set_asset_transport`)."""
+
+    def fetch(self, url: str) -> bytes:
+        """Download a static asset (``library.bin``, ``skills.bin``, ...)."""
+
+
+class Transport(AssetTransport, Protocol):
+    """Minimal interface every client transport implements."""
+
+    def post(
+        self,
+        url: str,
+        payload: bytes,
+        *,
+        target: str | None,
+        headers: Mapping[str, str],
+        timeout: int | float,
+    ) -> bytes:
+        """Send an encoded AMF request and return the raw response body."""
+
+
+class ReplayMissError(LookupError):
+    """Raised when a replayed session has no recording for a request."""
+
+
+def _download(url: str) -> bytes:
+    with urllib.request.urlopen(url) as resp:
+        return resp.read()
+
+
+class HttpTransport:
+    """Send requests over the network using a ``requests`` session.
+
+    *session* is either a plain session or a
+    :class:`~ninja_sage.sessions.SessionPool`, in which case each call uses
+    the pool's session for the calling thread.
+    """
+
+    def __init__(self, session: "requests.Session | SessionPool") -> None:
+        self._sessions = session
+
+    @property
+    def session(self) -> "requests.Session":
+        current = getattr(self._sessions, "current", None)
+        return current() if current is not None else self._sessions
+
+    def post(
+        self,
+        url: str,
+        payload: bytes,
+        *,
+        target: str | None,
+        headers: Mapping[str, str],
+        timeout: int | float,
+    ) -> bytes:
+        response = self.session.post(url, data=payload, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+
+    def fetch(self, url: str) -> bytes:
+        return _download(url)
+
+
+class _UrllibAssetTransport:
+    """Asset-only transport used until a client installs its own."""
+
+    def fetch(self, url: str) -> bytes:
+        return _download(url)
+
+
+_asset_transport: AssetTransport = _UrllibAssetTransport()
+_asset_lock = threading.Lock()
+
+
+def set_asset_transport(transport: AssetTransport | None) -> AssetTransport:
+    """Route :func:`fetch_asset` through *transport* and return the previous one.
+
+    Any object with ``fetch(url)`` works (a full :class:`Transport` too).
+    Passing ``None`` restores the default ``urllib`` downloader.
+    """
+
+    global _asset_transport
+    with _asset_lock:
+        previous = _asset_transport
+        _asset_transport = transport if transport is not None else _UrllibAssetTransport()
+    return previous
+
+
+def fetch_asset(url: str) -> bytes:
+    """Download a static asset through the active asset transport."""
+
+    return _asset_transport.fetch(url)
+
+
+# ---------------------------------------------------------------------------
+# Record / replay
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class CaptureEntry:
+    """One line of ``manifest.jsonl``."""
+
+    seq: int
+    kind: str  # "amf" or "asset"
+    url: str
+    target: str | None
+    request_file: str | None
+    response_file: str
+    request_sha1: str | None
+    elapsed: float
+    recorded_at: float
+
+    @classmethod
+    def from_mapping(cls, payload: Mapping[str, Any]) -> "CaptureEntry":
+        return cls(
+            seq=int(payload["seq"]),
+            kind=payload.get("kind", "amf"),
+            url=payload.get("url", ""),
+            target=payload.get("target"),
+            request_file=payload.get("request_file"),
+            response_file=payload["response_file"],
+            request_sha1=payload.get("request_sha1"),
+            elapsed=float(payload.get("elapsed", 0.0)),
+            recorded_at=float(payload.get("recorded_at", 0.0)),
+        )
+
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _slug(value: str) -> str:
+    return _UNSAFE_CHARS.sub("_", value).strip("_")[:80] or "call"
+
+
+def load_manifest(capture_dir: str | Path) -> List[CaptureEntry]:
+    """Read every entry of a capture directory in recording order."""
+
+    path = Path(capture_dir).expanduser() / MANIFEST_NAME
+    entries: List[CaptureEntry] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                entries.append(CaptureEntry.from_mapping(json.loads(line)))
+    entries.sort(key=lambda entry: entry.seq)
+    return entries
+
+
+class RecordingTransport:
+    """Forward calls to *inner* and persist every exchange to *capture_dir*."""
+
+    def __init__(self, inner: Transport, capture_dir: str | Path) -> None:
+        self.inner = inner
+        self.capture_dir = Path(capture_dir).expanduser()
+        self.capture_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._seq = self._last_seq()
+
+    def _last_seq(self) -> int:
+        if not (self.capture_dir / MANIFEST_NAME).exists():
+            return 0
+        entries = load_manifest(self.capture_dir)
+        return entries[-1].seq if entries else 0
+
+    def _next_seq(self) -> int:
+        with self._lock:
+            self._seq += 1
+            return self._seq
+
+    def _write(self, entry: CaptureEntry, request: bytes | None, response: bytes) -> None:
+        if request is not None and entry.request_file:
+            (self.capture_dir / entry.request_file).write_bytes(request)
+        (self.capture_dir / entry.response_file).write_bytes(response)
+        line = json.dumps(asdict(entry), ensure_ascii=False)
+        with self._lock:
+            with (self.capture_dir / MANIFEST_NAME).open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+    def post(
+        self,
+        url: str,
+        payload: bytes,
+        *,
+        target: str | None,
+        headers: Mapping[str, str],
+        timeout: int | float,
+    ) -> bytes:
+        started = time.perf_counter()
+        content = self.inner.post(url, payload, target=target, headers=headers, timeout=timeout)
+        elapsed = time.perf_counter() - started
+
+        seq = self._next_seq()
+        stem = f"{seq:05d}-{_slug(target or 'amf')}"
+        entry = CaptureEntry(
+            seq=seq,
+            kind="amf",
+            url=url,
+            target=target,
+            request_file=f"{stem}.request.amf",
+            response_file=f"{stem}.response.amf",
+            request_sha1=hashlib.sha1(payload).hexdigest(),
+            elapsed=elapsed,
+            recorded_at=time.time(),
+        )
+        self._write(entry, payload, content)
+        return content
+
+    def fetch(self, url: str) -> bytes:
+        started = time.perf_counter()
+        content = self.inner.fetch(url)
+        elapsed = time.perf_counter() - started
+
+        seq = self._next_seq()
+        entry = CaptureEntry(
+            seq=seq,
+            kind="asset",
+            url=url,
+            target=None,
+            request_file=None,
+            response_file=f"{seq:05d}-{_slug(url.rsplit('/', 1)[-1])}",
+            request_sha1=None,
+            elapsed=elapsed,
+            recorded_at=time.time(),
+        )
+        self._write(entry, None, content)
+        return content
+
+
+class ReplayTransport:
+    """Serve responses recorded by :class:`RecordingTransport`.
+
+    Requests are matched first by the exact request bytes, then by target in
+    recording order. Once every recording of a target has been served the
+    sequence starts over, so a capture of one workflow can drive any number
+    of benchmark iterations.
+    """
+
+    def __init__(
+        self,
+        capture_dir: str | Path,
+        *,
+        emulate_latency: bool = False,
+        latency_scale: float = 1.0,
+    ) -> None:
+        self.capture_dir = Path(capture_dir).expanduser()
+        self.emulate_latency = emulate_latency
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, bytes] = {}
+        self._by_sha1: Dict[str, CaptureEntry] = {}
+        self._by_target: Dict[str | None, List[CaptureEntry]] = defaultdict(list)
+        self._queues: Dict[str | None, Deque[CaptureEntry]] = {}
+        self._assets: Dict[str, CaptureEntry] = {}
+
+        for entry in load_manifest(self.capture_dir):
+            if entry.kind == "asset":
+                self._assets.setdefault(entry.url, entry)
+                continue
+            self._by_target[entry.target].append(entry)
+            if entry.request_sha1:
+                self._by_sha1.setdefault(entry.request_sha1, entry)
+
+    @property
+    def targets(self) -> List[str | None]:
+        return list(self._by_target)
+
+    def _body(self, name: str) -> bytes:
+        body = self._bodies.get(name)
+        if body is None:
+            body = (self.capture_dir / name).read_bytes()
+            self._bodies[name] = body
+        return body
+
+    def _sleep(self, entry: CaptureEntry) -> None:
+        if self.emulate_latency and entry.elapsed > 0:
+            time.sleep(entry.elapsed * self.latency_scale)
+
+    def _match(self, payload: bytes, target: str | None) -> CaptureEntry:
+        entry = self._by_sha1.get(hashlib.sha1(payload).hexdigest())
+        if entry is not None and entry.target == target:
+            return entry
+        recorded = self._by_target.get(target)
+        if not recorded:
+            raise ReplayMissError(f"tidak ada rekaman untuk target {target!r} di {self.capture_dir}")
+        with self._lock:
+            queue = self._queues.get(target)
+            if not queue:
+                queue = deque(recorded)
+                self._queues[target] = queue
+            return queue.popleft()
+
+    def post(
+        self,
+        url: str,
+        payload: bytes,
+        *,
+        target: str | None,
+        headers: Mapping[str, str],
+        timeout: int | float,
+    ) -> bytes:
+        entry = self._match(payload, target)
+        self._sleep(entry)
+        return self._body(entry.response_file)
+
+    def fetch(self, url: str) -> bytes:
+        entry = self._assets.get(url)
+        if entry is None:
+            raise ReplayMissError(f"asset {url!r} tidak ada di rekaman {self.capture_dir}")
+        self._sleep(entry)
+        return self._body(entry.response_file)
+
+
+__all__ = [
+    "AssetTransport",
+    "CaptureEntry",
+    "HttpTransport",
+    "RecordingTransport",
+    "ReplayMissError",
+    "ReplayTransport",
+    "Transport",
+    "fetch_asset",
+    "load_manifest",
+    "set_asset_transport",
+]
@@ -0,0 +1,211 @@
+"""Warm-start phase: pay every one-time cost before the first real request.
+
+A cold process otherwise spends its first workflow on work that does not
+depend on the account at all:
+
+* ``library``    – download and parse ``library.bin`` (:func:`load_library_levels`);
+* ``assets``     – download the 15 CDN assets measured by :func:`fetch_asset_lengths`;
+* ``analytics``  – zlib level-9 compression of the ``Analytics.libraries`` payload;
+* ``codec``      – Py3AMF's lazy codec/class-alias setup and the AES backend load;
+* ``connection`` – TCP/TLS handshakes to the game server, left idle in the pool.
+
+:func:`warm_start` runs these steps concurrently and returns a
+:class:`WarmupReport`; :class:`Warmup` does the same in a background thread
+and exposes readiness for health checks. A failing step never raises: it
+is recorded in the report and the workflow simply pays for it later.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence
+
+from .amf_utils import build_envelope, decode_amf_bytes, encode_envelope
+from .analytics_payload import build_analytics_payload, fetch_asset_lengths
+from .login_payload import load_library_levels, warm_crypto
+from .models_common import CheckVersionRequest
+from .transport import HttpTransport
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .client import NinjaSageClient
+    from .workflow import WorkflowConfig
+
+# Steps that only fill process-wide caches; safe to run before ``fork``.
+CACHE_STEPS = ("library", "assets", "analytics", "codec")
+ALL_STEPS = CACHE_STEPS + ("connection",)
+
+
+@dataclass(slots=True)
+class WarmupStep:
+    name: str
+    ok: bool
+    elapsed: float
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class WarmupReport:
+    steps: List[WarmupStep] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(step.ok for step in self.steps)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "elapsed_ms": round(self.elapsed * 1000.0, 2),
+            "steps": {
+                step.name: {
+                    "ok": step.ok,
+                    "elapsed_ms": round(step.elapsed * 1000.0, 2),
+                    **({"error": step.error} if step.error else {}),
+                }
+                for step in self.steps
+            },
+        }
+
+
+def _warm_codec() -> None:
+    # Round-trip a real request so Py3AMF imports its AMF0/AMF3 codecs and
+    # builds its class-alias tables now rather than inside the first call.
+    envelope = build_envelope("SystemLogin.checkVersion", body=CheckVersionRequest().to_body())
+    decode_amf_bytes(encode_envelope(envelope))
+    warm_crypto()
+
+
+def _warm_connections(client: "NinjaSageClient", connections: int, timeout: float) -> None:
+    session = client.sessions.current()
+
+    def _open(_: int) -> None:
+        # HEAD leaves a keep-alive connection (handshake done) in the pool.
+        session.head(client.url, headers=dict(client.headers), timeout=timeout)
+
+    if connections <= 1:
+        _open(0)
+        return
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        list(pool.map(_open, range(connections)))
+
+
+# Steps in one chain run in order on one thread; chains run concurrently.
+# ``analytics`` compresses the lengths measured by ``assets``, so it follows it
+# instead of racing it into a second round of downloads.
+_CHAINS = (("library",), ("assets", "analytics"), ("codec",), ("connection",))
+
+
+def _steps(
+    config: "WorkflowConfig",
+    client: "NinjaSageClient | None",
+    connections: int,
+    timeout: float,
+) -> Dict[str, Callable[[], Any]]:
+    steps: Dict[str, Callable[[], Any]] = {
+        "library": lambda: load_library_levels(config.library_url),
+        "assets": lambda: fetch_asset_lengths(config.analytics_base_url),
+        "analytics": lambda: build_analytics_payload(config.analytics_base_url),
+        "codec": _warm_codec,
+    }
+    # Recorded/replayed sessions never open a connection to warm.
+    if client is not None and isinstance(client.transport, HttpTransport):
+        steps["connection"] = lambda: _warm_connections(client, connections, timeout)
+    return steps
+
+
+def _timed(name: str, func: Callable[[], Any]) -> WarmupStep:
+    started = time.perf_counter()
+    try:
+        func()
+    except Exception as exc:
+        return WarmupStep(name, False, time.perf_counter() - started, f"{type(exc).__name__}: {exc}")
+    return WarmupStep(name, True, time.perf_counter() - started)
+
+
+def warm_start(
+    config: "WorkflowConfig",
+    client: "NinjaSageClient | None" = None,
+    *,
+    steps: Sequence[str] = ALL_STEPS,
+    connections: int = 1,
+    timeout: float = 10.0,
+) -> WarmupReport:
+    """Run the selected warm-up *steps* concurrently and report each one.
+
+    ``connection`` is skipped when no *client* is given or the client does
+    not talk HTTP (record/replay transports).
+    """
+
+    available = _steps(config, client, connections, timeout)
+    chains = [
+        [(name, available[name]) for name in chain if name in steps and name in available] for chain in _CHAINS
+    ]
+    chains = [chain for chain in chains if chain]
+
+    def _run_chain(chain: List[tuple[str, Callable[[], Any]]]) -> List[WarmupStep]:
+        return [_timed(name, func) for name, func in chain]
+
+    started = time.perf_counter()
+    report = WarmupReport()
+    if chains:
+        with ThreadPoolExecutor(max_workers=len(chains), thread_name_prefix="warmup") as pool:
+            report.steps = [step for done in pool.map(_run_chain, chains) for step in done]
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+class Warmup:
+    """Run :func:`warm_start` in the background and track readiness."""
+
+    def __init__(
+        self,
+        config: "WorkflowConfig",
+        client: "NinjaSageClient | None" = None,
+        *,
+        on_ready: Callable[[WarmupReport], Any] | None = None,
+        **options: Any,
+    ) -> None:
+        self.report: WarmupReport | None = None
+        self.on_ready = on_ready
+        self._ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(config, client, options),
+            name="warmup",
+            daemon=True,
+        )
+
+    def start(self) -> "Warmup":
+        self._thread.start()
+        return self
+
+    def _run(self, config: "WorkflowConfig", client: "NinjaSageClient | None", options: Dict[str, Any]) -> None:
+        try:
+            self.report = warm_start(config, client, **options)
+            if self.on_ready is not None:
+                self.on_ready(self.report)
+        finally:
+            self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until warm-up finished; ``False`` on timeout."""
+
+        return self._ready.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        if not self.ready:
+            return {"ready": False, "status": "warming"}
+        report = self.report
+        if report is None:
+            return {"ready": True, "status": "degraded"}
+        return {"ready": True, "status": "ready" if report.ok else "degraded", "warmup": report.as_dict()}
+
+
+__all__ = ["ALL_STEPS", "CACHE_STEPS", "Warmup", "WarmupReport", "WarmupStep", "warm_start"]
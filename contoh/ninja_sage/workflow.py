@@ -3,12 +3,11 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Mapping
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
-from rich.console import Console
-
+from .assets import default_registry
 from .client import NinjaSageClient
 from .constants import DEFAULT_BASE_URL
 from .analytics_payload import DEFAULT_ASSET_BASE_URL
@@ -30,6 +29,10 @@ from .models import (
 )
 from .response_utils import extract_first_body, normalize_content
 
+# Order in which :meth:`NinjaSageWorkflow.iter_steps` yields its results;
+# the names match the fields of :class:`WorkflowResult`.
+WORKFLOW_STEPS = ("version", "analytics", "events", "login", "characters", "character_data")
+
 
 @dataclass
 class Credentials:
@@ -84,16 +87,25 @@ class WorkflowConfig:
 class NinjaSageWorkflow:
     """High level API that reproduces the Charles Proxy capture order."""
 
-    def __init__(self, client: NinjaSageClient, config: WorkflowConfig) -> None:
+    def __init__(
+        self,
+        client: NinjaSageClient,
+        config: WorkflowConfig,
+        *,
+        events_source: Callable[[], EventsServiceGetResponse | None] | None = None,
+    ) -> None:
         self.client = client
         self.config = config
+        # Shared EventsService.get result (e.g. EventsFeed.response); ``None``
+        # from the source falls back to calling the game server.
+        self.events_source = events_source
         self._response_logger = None
 
     def _call(self, target: str, body: Sequence[Any], parser):
         # Debug: print outbound body for comparison with Charles
         # print(f"REQUEST {target} body:")
         # print(body)
-        envelope = self.client.invoke(target, body=body)
+        envelope = self.client.invoke(target, body=body, account=self.config.credentials.username)
         content = extract_first_body(envelope)
         normalized = normalize_content(content)
         result = parser(normalized)
@@ -108,12 +120,24 @@ class NinjaSageWorkflow:
         self._response_logger = callback
 
     def run(self) -> WorkflowResult:
+        return WorkflowResult(**dict(self.iter_steps()))
+
+    def iter_steps(self) -> Iterator[tuple[str, Any]]:
+        """Yield ``(step, parsed_response)`` as soon as each call completes.
+
+        Step names follow :data:`WORKFLOW_STEPS`; ``character_data`` is
+        ``None`` when the account has no characters.
+        """
+
         check_version_request = CheckVersionRequest(channel=self.config.channel)
         version = self._call(
             "SystemLogin.checkVersion",
             check_version_request.to_body(),
             CheckVersionResponse.from_content,
         )
+        # A new CDN build invalidates cached library levels / asset lengths.
+        default_registry().observe_version(version.cdn)
+        yield "version", version
 
         analytics_request = AnalyticsLibrariesRequest.from_assets(self.config.analytics_base_url)
         analytics = self._call(
@@ -121,15 +145,19 @@ class NinjaSageWorkflow:
             analytics_request.to_body(),
             AnalyticsLibrariesResponse.from_content,
         )
+        yield "analytics", analytics
 
         if self.config.include_events:
-            events = self._call(
-                "EventsService.get",
-                self.config.events_request.to_body(),
-                EventsServiceGetResponse.from_content,
-            )
+            events = self.events_source() if self.events_source is not None else None
+            if events is None:
+                events = self._call(
+                    "EventsService.get",
+                    self.config.events_request.to_body(),
+                    EventsServiceGetResponse.from_content,
+                )
         else:
             events = EventsServiceGetResponse(status=0, error=0, events=EventCollections())
+        yield "events", events
 
         seed = self.config.character_seed if self.config.character_seed is not None else version.character_seed
         key = self.config.character_key if self.config.character_key is not None else version.character_key
@@ -152,6 +180,7 @@ class NinjaSageWorkflow:
             login_request.to_body(),
             SystemLoginResponse.from_content,
         )
+        yield "login", login
 
         get_characters_request = GetAllCharactersRequest(server_id=self.config.server_id)
         characters = self._call(
@@ -159,6 +188,7 @@ class NinjaSageWorkflow:
             get_characters_request.to_body(login),
             GetAllCharactersResponse.from_content,
         )
+        yield "characters", characters
 
         # Pick a character index for getCharacterData
         char_data: GetCharacterDataResponse | None = None
@@ -170,21 +200,16 @@ class NinjaSageWorkflow:
                 [[selected.char_id, login.sessionkey]],
                 GetCharacterDataResponse.from_content,
             )
-        print(char_data.inventory.skills)
-
-        return WorkflowResult(
-            version=version,
-            analytics=analytics,
-            events=events,
-            login=login,
-            characters=characters,
-            character_data=char_data,
-        )
+
+        yield "character_data", char_data
 
 
 def print_summary(result: WorkflowResult) -> None:
     """Pretty print the workflow result to the console."""
 
+    # rich is only needed here; keep it out of ``import ninja_sage.workflow``.
+    from rich.console import Console
+
     console = Console()
     console.rule("[bold cyan]SystemLogin.checkVersion[/bold cyan]")
     console.print(result.version)
@@ -11,11 +11,16 @@ from rich.console import Console
 from ninja_sage import (
     AnalyticsService,
     EventsService,
+    HttpTransport,
     NinjaSageClient,
+    RecordingTransport,
+    ReplayTransport,
     SystemLoginService,
     WorkflowConfig,
+    set_asset_transport,
 )
 from ninja_sage.models import WorkflowResult
+from ninja_sage.warmup import Warmup
 
 
 def parse_args() -> argparse.Namespace:
@@ -27,13 +32,44 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--username", help="Override username from config (if any)")
     parser.add_argument("--password", help="Override password from config (if any)")
+    capture = parser.add_mutually_exclusive_group()
+    capture.add_argument("--record", metavar="DIR", help="Simpan semua request/response AMF & asset ke DIR")
+    capture.add_argument("--replay", metavar="DIR", help="Jalankan offline dari rekaman di DIR")
+    parser.add_argument(
+        "--emulate-latency",
+        action="store_true",
+        help="Saat --replay, tunggu selama latensi yang terekam untuk tiap request",
+    )
+    parser.add_argument(
+        "--warmup",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Siapkan asset, payload analytics, codec AMF dan koneksi di background selagi kredensial diisi",
+    )
     return parser.parse_args()
 
 
+def build_client(args: argparse.Namespace, config: WorkflowConfig) -> NinjaSageClient:
+    """Buat client dengan transport sesuai flag --record/--replay."""
+
+    client = NinjaSageClient(base_url=config.base_url)
+    if args.replay:
+        client.transport = ReplayTransport(args.replay, emulate_latency=args.emulate_latency)
+    elif args.record:
+        client.transport = RecordingTransport(HttpTransport(client.sessions), args.record)
+    else:
+        return client
+    set_asset_transport(client.transport)
+    return client
+
+
 def main() -> None:
     args = parse_args()
     config = WorkflowConfig.from_file(args.config)
     console = Console()
+    client = build_client(args, config)
+    # Warm-up berjalan selagi kredensial diketik; ditunggu sebelum request pertama.
+    warmup = Warmup(config, client).start() if args.warmup else None
 
     # ------------------------------------------------------------------
     # Input kredensial
@@ -46,7 +82,14 @@ def main() -> None:
     if not password:
         password = getpass.getpass("Password: ").strip()
 
-    client = NinjaSageClient(base_url=config.base_url)
+    if warmup is not None:
+        warmup.wait()
+        if warmup.report is not None:
+            for step in warmup.report.steps:
+                if not step.ok:
+                    console.print(f"[yellow]Warm-up {step.name} gagal: {step.error}[/yellow]")
+            console.print(f"[dim]Warm-up selesai dalam {warmup.report.elapsed:.2f}s[/dim]")
+
     sys_login = SystemLoginService(client, loader=config.loader, library_url=config.library_url)
     analytics = AnalyticsService(client, base_url=config.analytics_base_url)
     events_service = EventsService(client)
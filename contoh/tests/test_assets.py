@@ -0,0 +1,115 @@
+"""Asset registry: single downloads, CDN version changes and the shared store."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from ninja_sage.assets import AssetRegistry, AssetStore, default_registry, set_default_registry
+
+URL = "https://ns-assets.ninjasage.id/static/lib/library.bin"
+
+
+class _Loader:
+    def __init__(self, value, delay: float = 0.0) -> None:
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+def _concurrently(count, target):
+    threads = [threading.Thread(target=target, daemon=True) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+
+def test_concurrent_misses_share_one_download():
+    registry = AssetRegistry()
+    loader = _Loader({"hair_10000_1": 3}, delay=0.05)
+    results = []
+    _concurrently(8, lambda: results.append(registry.get("levels", URL, loader)))
+    assert loader.calls == 1
+    assert results == [{"hair_10000_1": 3}] * 8
+
+
+def test_a_new_cdn_version_drops_cached_values():
+    registry = AssetRegistry()
+    loader = _Loader(1)
+    assert not registry.observe_version("cdn-1")
+    registry.get("levels", URL, loader)
+    assert not registry.observe_version("cdn-1")
+    assert not registry.observe_version(None)
+    registry.get("levels", URL, loader)
+    assert loader.calls == 1
+
+    assert registry.observe_version("cdn-2")
+    registry.get("levels", URL, loader)
+    assert loader.calls == 2
+    assert registry.stats()["invalidations"] == 1
+
+
+def test_store_shares_values_between_registries(tmp_path):
+    loader = _Loader({"a": 1})
+    AssetRegistry(store=AssetStore(tmp_path)).get("levels", URL, loader)
+    other = AssetRegistry(store=AssetStore(tmp_path))
+    assert other.get("levels", URL, _Loader("tidak dipakai")) == {"a": 1}
+    assert other.stats()["store_hits"] == 1
+
+    blob = b"\x00\x01zlib"
+    AssetRegistry(store=AssetStore(tmp_path)).get("payload", URL, _Loader(blob))
+    assert AssetRegistry(store=AssetStore(tmp_path)).get("payload", URL, _Loader(b"")) == blob
+
+
+def test_store_entries_expire_and_follow_versions(tmp_path):
+    now = [1000.0]
+    clock = lambda: now[0]  # noqa: E731
+    writer = AssetRegistry(ttl=60, store=AssetStore(tmp_path), clock=clock)
+    writer.observe_version("cdn-1")
+    writer.get("levels", URL, _Loader("lama"))
+
+    reader = AssetRegistry(ttl=60, store=AssetStore(tmp_path), clock=clock)
+    reader.observe_version("cdn-2")
+    assert reader.get("levels", URL, _Loader("baru")) == "baru"
+
+    now[0] += 61
+    late = AssetRegistry(ttl=60, store=AssetStore(tmp_path), clock=clock)
+    assert late.get("levels", URL, _Loader("segar")) == "segar"
+
+    # invalidate() also ignores store entries written before it.
+    now[0] += 1
+    late.invalidate()
+    assert late.get("levels", URL, _Loader("setelah")) == "setelah"
+
+
+def test_values_that_are_not_json_stay_in_memory(tmp_path):
+    value = {1, 2}
+    registry = AssetRegistry(store=AssetStore(tmp_path))
+    assert registry.get("set", URL, _Loader(value)) is value
+    assert not list(tmp_path.glob("*.asset"))
+
+
+def test_store_lock_lets_one_registry_download(tmp_path):
+    loader = _Loader([1, 2, 3], delay=0.05)
+    results = []
+    _concurrently(4, lambda: results.append(AssetRegistry(store=AssetStore(tmp_path)).get("lengths", URL, loader)))
+    assert loader.calls == 1
+    assert results == [[1, 2, 3]] * 4
+
+
+def test_default_registry_can_be_swapped():
+    mine = AssetRegistry()
+    previous = set_default_registry(mine)
+    try:
+        assert default_registry() is mine
+    finally:
+        set_default_registry(previous)
+    assert default_registry() is previous
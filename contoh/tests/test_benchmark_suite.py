@@ -0,0 +1,80 @@
+"""Benchmark suite: every case runs, and baseline comparison verdicts."""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+import pytest
+
+from benchmarks.login_payload import DEFAULT_SAGE_DATA
+from benchmarks.suite import DEFAULT_BASELINE, build_cases, compare
+from ninja_sage.assets import AssetRegistry, set_default_registry
+from ninja_sage.transport import set_asset_transport
+
+
+@pytest.fixture
+def cases(tmp_path):
+    # The suite installs its offline asset transport; keep it out of other tests.
+    transport, registry = set_asset_transport(None), set_default_registry(AssetRegistry())
+    (tmp_path / "one.amf").write_bytes(b"\x00\x03rusak")
+    args = argparse.Namespace(sage_data=DEFAULT_SAGE_DATA, captures=tmp_path, filter=None)
+    try:
+        yield build_cases(args)
+    finally:
+        set_asset_transport(transport)
+        set_default_registry(registry)
+
+
+@pytest.mark.skipif(not DEFAULT_SAGE_DATA.is_dir(), reason="sage_data is not available")
+def test_every_case_runs_and_the_baseline_names_real_cases(cases):
+    for case in cases:
+        case.func()
+    names = {case.name for case in cases}
+    assert "codec.decode_captures[1 file]" in names
+    baseline = json.loads(DEFAULT_BASELINE.read_text(encoding="utf-8"))
+    assert set(baseline["results"]) <= names
+    assert set(baseline["thresholds"]) <= set(baseline["results"])
+
+
+def _result(us, reference_us=10.0, median_us=None):
+    return {"us": us, "median_us": median_us or us, "reference_us": reference_us}
+
+
+def test_compare_verdicts():
+    baseline = {
+        "results": {
+            "ok": _result(100),
+            "slow": _result(100),
+            "fast": _result(100),
+            "noisy": _result(100, median_us=150),
+            "loose": _result(100),
+        },
+        "thresholds": {"loose": 1.0},
+    }
+    results = {
+        "ok": _result(110),
+        "slow": _result(140),
+        "fast": _result(70),
+        "noisy": _result(160),
+        "loose": _result(190),
+        "baru": _result(5),
+    }
+    verdicts = compare(results, baseline, 0.25)
+    assert {name: verdict["status"] for name, verdict in verdicts.items()} == {
+        "ok": "ok",
+        "slow": "regression",
+        "fast": "faster",
+        "noisy": "ok",
+        "loose": "ok",
+        "baru": "new",
+    }
+    assert verdicts["loose"]["threshold"] == 1.0
+
+
+def test_compare_normalises_for_machine_speed():
+    baseline = {"results": {"case": _result(100, reference_us=10.0)}}
+    # Twice as slow on a machine that is twice as slow: no regression.
+    slower_machine = {"case": _result(200, reference_us=20.0)}
+    assert compare(slower_machine, baseline, 0.25)["case"]["status"] == "ok"
+    assert compare(slower_machine, baseline, 0.25, normalize=False)["case"]["status"] == "regression"
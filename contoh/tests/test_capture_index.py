@@ -0,0 +1,71 @@
+"""Capture index: incremental builds, pruning and search."""
+
+from __future__ import annotations
+
+import os
+
+from pyamf import remoting
+
+from ninja_sage.amf_utils import build_envelope, encode_envelope
+from ninja_sage.capture_index import build_index, connect, search
+
+
+def _write_request(path, target: str) -> None:
+    path.write_bytes(encode_envelope(build_envelope(target, body=["x"])))
+
+
+def _index(conn, directory):
+    return build_index(conn, directory, workers=1)
+
+
+def test_sibling_directories_do_not_prune_each_other(tmp_path):
+    # "a_b" as a LIKE pattern also matches "aXb".
+    for name in ("aXb", "a_b"):
+        (tmp_path / name).mkdir()
+        _write_request(tmp_path / name / "one.amf", "SystemLogin.checkVersion")
+        _write_request(tmp_path / name / "two.amf", "EventsService.get")
+    conn = connect(tmp_path / "index.sqlite")
+
+    first = _index(conn, tmp_path / "aXb")
+    second = _index(conn, tmp_path / "a_b")
+
+    assert (first.indexed, first.removed) == (2, 0)
+    assert (second.indexed, second.removed) == (2, 0)
+    assert len(search(conn, path=f"{tmp_path / 'aXb'}{os.sep}%")) == 2
+    assert len(search(conn, path=f"{tmp_path / 'a_b'}{os.sep}%")) == 2
+
+
+def test_incremental_rebuild_and_prune(tmp_path):
+    _write_request(tmp_path / "one.amf", "SystemLogin.checkVersion")
+    _write_request(tmp_path / "two.amf", "EventsService.get")
+    conn = connect(tmp_path / "index.sqlite")
+    assert _index(conn, tmp_path).indexed == 2
+
+    again = _index(conn, tmp_path)
+    assert (again.indexed, again.skipped) == (0, 2)
+
+    (tmp_path / "two.amf").unlink()
+    pruned = _index(conn, tmp_path)
+    assert pruned.removed == 1
+    assert [row["target"] for row in search(conn)] == ["SystemLogin.checkVersion"]
+
+
+def test_search_treats_underscore_literally(tmp_path):
+    _write_request(tmp_path / "one.amf", "SystemLogin.checkVersion")
+    _write_request(tmp_path / "two.amf", "SystemLoginXcheckVersion")
+    conn = connect(tmp_path / "index.sqlite")
+    _index(conn, tmp_path)
+
+    assert len(search(conn, target="SystemLogin.%")) == 1
+    assert search(conn, target="SystemLogin_%") == []
+    assert len(search(conn, target="SystemLogin%")) == 2
+
+
+def test_envelope_without_messages_is_listed(tmp_path):
+    (tmp_path / "empty.amf").write_bytes(encode_envelope(remoting.Envelope(3)))
+    conn = connect(tmp_path / "index.sqlite")
+    report = _index(conn, tmp_path)
+
+    assert (report.indexed, report.failed, report.messages) == (1, 0, 0)
+    (row,) = search(conn)
+    assert row["kind"] is None and row["error"] is None
@@ -0,0 +1,159 @@
+"""Character data diffs: applying the patch must reproduce the new view."""
+
+from __future__ import annotations
+
+import copy
+import json
+import random
+
+import pytest
+
+from ninja_sage import mock_data
+from ninja_sage.character_diff import (
+    CharacterRevisions,
+    character_view,
+    diff_character_data,
+    parse_inventory,
+    revision_of,
+)
+from ninja_sage.models import GetCharacterDataResponse
+
+CHAR_ID = 1004260
+BASE = mock_data.character_data(CHAR_ID)
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def apply_patch(document, patch):
+    """Minimal RFC 6902 ``add``/``remove``/``replace`` on objects, for checking diffs."""
+
+    document = copy.deepcopy(document)
+    for op in patch:
+        *parents, leaf = [_unescape(token) for token in op["path"].split("/")[1:]]
+        node = document
+        for token in parents:
+            node = node[token]
+        if op["op"] == "add":
+            assert leaf not in node, op
+            node[leaf] = op["value"]
+        elif op["op"] == "replace":
+            assert leaf in node, op
+            node[leaf] = op["value"]
+        elif op["op"] == "remove":
+            del node[leaf]
+        else:  # pragma: no cover - the differ emits nothing else
+            raise AssertionError(op)
+    return document
+
+
+def _inventory(rng: random.Random, value):
+    if value is None or rng.random() < 0.1:
+        return rng.choice([None, "", "wpn_1"])
+    counts = parse_inventory(value)
+    for _ in range(rng.randint(1, 3)):
+        item = rng.choice(list(counts) or ["material_1"])
+        action = rng.random()
+        if action < 0.4:
+            counts[item] = rng.randint(1, 999)
+        elif action < 0.7:
+            counts.pop(item, None)
+        else:
+            counts[f"material_{rng.randint(1000, 2000)}"] = rng.randint(1, 5)
+    return ",".join(f"{item}:{count}" if count != 1 else item for item, count in counts.items())
+
+
+def _mutate(rng: random.Random, content):
+    content = copy.deepcopy(content)
+    character = content["character_data"]
+    for _ in range(rng.randint(1, 4)):
+        choice = rng.randrange(9)
+        if choice == 0:
+            character["character_xp"] += rng.randint(1, 5000)
+        elif choice == 1:
+            character["character_gold"] = rng.randint(0, 10**8)
+            character["character_element_2"] = rng.choice([None, 1, 5])
+        elif choice == 2:
+            name = rng.choice(list(content["character_inventory"]))
+            content["character_inventory"][name] = _inventory(rng, content["character_inventory"][name])
+        elif choice == 3:
+            pet = content.get("pet_data")
+            if pet is None or rng.random() < 0.2:
+                content["pet_data"] = rng.choice([None, {"pet_id": rng.randint(1, 9)}])
+            elif rng.random() < 0.5:
+                pet[rng.choice(["pet/skill", "pet~name", "pet_level"])] = rng.randint(1, 60)
+            elif pet:
+                pet.pop(rng.choice(list(pet)))
+        elif choice == 4:
+            events = content["events"]
+            key = rng.choice(list(events) + ["event/baru"])
+            if key in events and rng.random() < 0.3:
+                del events[key]
+            else:
+                events[key] = [{"id": f"e{rng.randint(0, 9)}", "active": rng.random() < 0.5}]
+        elif choice == 5:
+            content["clan"] = rng.choice([None, {"id": 7, "name": "Klan Baru", "banner": None}])
+        elif choice == 6:
+            content["features"] = content["features"] + [f"feature_{rng.randint(100, 200)}"]
+        elif choice == 7:
+            content["character_sets"]["weapon"] = f"wpn_{rng.randint(1, 600)}"
+            content["announcements"] = rng.choice([None, "Maintenance jam 10"])
+        else:
+            character["character_level"] += 1
+    return content
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_patch_turns_old_view_into_new_view(seed):
+    rng = random.Random(seed)
+    old_content = _mutate(rng, BASE) if seed % 3 else BASE
+    new_content = _mutate(rng, old_content)
+    old = GetCharacterDataResponse.from_content(old_content)
+    new = GetCharacterDataResponse.from_content(new_content)
+
+    patch = diff_character_data(old, new)
+    # Patches travel as JSON.
+    patch = json.loads(json.dumps(patch))
+    assert apply_patch(character_view(old), patch) == json.loads(json.dumps(character_view(new)))
+    assert diff_character_data(new, new) == []
+
+
+def test_inventory_count_change_is_one_replace():
+    content = copy.deepcopy(BASE)
+    counts = parse_inventory(content["character_inventory"]["char_materials"])
+    item = next(iter(counts))
+    counts[item] += 5
+    content["character_inventory"]["char_materials"] = ",".join(f"{k}:{v}" for k, v in counts.items())
+    patch = diff_character_data(
+        GetCharacterDataResponse.from_content(BASE), GetCharacterDataResponse.from_content(content)
+    )
+    assert patch == [{"op": "replace", "path": f"/inventory/materials/{item}", "value": counts[item]}]
+
+
+def test_parse_inventory():
+    assert parse_inventory("wpn_01, material_02:40,,wpn_01,bad:x") == {"wpn_01": 2, "material_02": 40, "bad:x": 1}
+    assert parse_inventory("") == {}
+    assert parse_inventory(None) is None
+
+
+def test_revisions_answer_with_patches_or_full_views():
+    revisions = CharacterRevisions(max_revisions=2)
+    rng = random.Random(1)
+    contents = [BASE]
+    for _ in range(3):
+        contents.append(_mutate(rng, contents[-1]))
+    responses = [GetCharacterDataResponse.from_content(content) for content in contents]
+
+    base = revisions.record(responses[0])
+    assert base == revision_of(GetCharacterDataResponse.from_content(copy.deepcopy(BASE)))
+    delta = revisions.delta(responses[1], base)
+    assert delta["mode"] == "patch" and delta["base"] == base
+    assert apply_patch(character_view(responses[0]), delta["patch"]) == character_view(responses[1])
+    assert revisions.delta(responses[1], delta["revision"])["patch"] == []
+
+    # Only the last two revisions are kept: the first one now gets the full view.
+    revisions.delta(responses[2], None)
+    stale = revisions.delta(responses[3], base)
+    assert stale["mode"] == "full" and stale["data"] == character_view(responses[3])
+    assert revisions.delta(responses[3], "tidak-ada")["mode"] == "full"
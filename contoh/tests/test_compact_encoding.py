@@ -0,0 +1,80 @@
+"""encode_amf3 output must decode to the same values with an independent AMF3 reader."""
+
+from __future__ import annotations
+
+import datetime as dt
+import struct
+
+from pyamf import amf3, util
+
+from ninja_sage import mock_data
+from ninja_sage.compact_encoding import encode_amf3
+from ninja_sage.get_character_data_models import GetCharacterDataResponse
+from ninja_sage.models_characters import GetAllCharactersResponse
+from ninja_sage.serialization import to_builtins
+
+
+def _decode(data: bytes):
+    stream = util.BufferedByteStream(data)
+    value = amf3.Decoder(stream).readElement()
+    assert stream.at_eof()
+    return value
+
+
+def _plain(value):
+    """pyamf ASObjects/lists -> dicts/lists for comparison."""
+
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def test_doubles_are_big_endian():
+    data = encode_amf3(1.5)
+    assert data == b"\x05" + struct.pack(">d", 1.5)
+    assert _decode(data) == 1.5
+
+
+def test_scalars_round_trip():
+    values = [0, 1, -1, 127, 128, 16383, 16384, 2**21, 2**28 - 1, -(2**28), 3.25, -0.5, 1e300, True, False, None, "", "ninja"]
+    for value in values:
+        assert _decode(encode_amf3(value)) == value, value
+
+
+def test_ints_outside_29_bits_become_doubles():
+    for value in (2**28, -(2**28) - 1, 2**31, 1_792_440_849_123):
+        data = encode_amf3(value)
+        assert data[0] == 0x05
+        assert _decode(data) == value
+
+
+def test_dates_round_trip():
+    moment = dt.datetime(2026, 10, 19, 8, 30, 15, 250000, tzinfo=dt.timezone.utc)
+    decoded = _decode(encode_amf3(moment))
+    assert decoded.replace(tzinfo=dt.timezone.utc) == moment
+    naive = dt.datetime(2001, 2, 3, 4, 5, 6)
+    assert _decode(encode_amf3(naive)) == naive
+
+
+def test_string_and_trait_references():
+    records = [{"id": f"wpn_{i % 3}", "name": "Kunai", "level": i, "price": i * 1.5} for i in range(20)]
+    data = encode_amf3({"items": records, "title": "Kunai"})
+    assert data.count(b"Kunai") == 1
+    assert data.count(b"price") == 1
+    assert _plain(_decode(data)) == {"items": records, "title": "Kunai"}
+
+
+def test_bytes_and_nested_lists():
+    value = {"blob": b"\x00\x01\xff", "grid": [[1, 2.5], [], ["a", None]]}
+    decoded = _plain(_decode(encode_amf3(value)))
+    assert bytes(decoded["blob"]) == b"\x00\x01\xff"
+    assert decoded["grid"] == value["grid"]
+
+
+def test_models_match_json_builtins():
+    characters = GetAllCharactersResponse.from_content(mock_data.all_characters(1001))
+    detail = GetCharacterDataResponse.from_content(mock_data.character_data(1004260))
+    for model in (characters, detail):
+        assert _plain(_decode(encode_amf3(model, exclude_raw=True))) == to_builtins(model, exclude_raw=True)
@@ -0,0 +1,175 @@
+"""EventsService change detection, the shared events file and SSE fan-out."""
+
+from __future__ import annotations
+
+import copy
+import socket
+import threading
+import time
+
+from ninja_sage import mock_data
+from ninja_sage.events_feed import EventsFeed, SharedEventsFile, SseHub, sse_message
+from ninja_sage.models_common import EventsServiceGetResponse
+
+BASE = mock_data.events(seed=1)
+
+
+def _response(content=BASE) -> EventsServiceGetResponse:
+    return EventsServiceGetResponse.from_content(copy.deepcopy(content))
+
+
+class _Upstream:
+    def __init__(self) -> None:
+        self.content = copy.deepcopy(BASE)
+        self.error: Exception | None = None
+
+    def __call__(self) -> EventsServiceGetResponse:
+        if self.error is not None:
+            raise self.error
+        return _response(self.content)
+
+
+def _wait_for(condition) -> None:
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_only_changed_collections_are_published():
+    upstream = _Upstream()
+    feed = EventsFeed(upstream, clock=iter(range(100)).__next__)
+    seen = []
+    unsubscribe = feed.subscribe(seen.append)
+
+    assert feed.poll()
+    first = feed.current()
+    assert (first.version, first.changed) == (1, ("seasonal", "permanent", "features", "packages"))
+
+    assert not feed.poll()
+    assert feed.current().fetched_at > first.fetched_at
+    assert feed.current().changed_at == first.changed_at
+
+    upstream.content["events"]["packages"] = upstream.content["events"]["packages"][:-1]
+    assert feed.poll()
+    assert (feed.current().version, feed.current().changed) == (2, ("packages",))
+    assert [snapshot.version for snapshot in seen] == [1, 2]
+
+    unsubscribe()
+    upstream.content["events"]["features"] = []
+    assert feed.poll()
+    assert len(seen) == 2
+    assert feed.stats()["changes"] == 3
+
+
+def test_failures_keep_the_last_good_snapshot():
+    upstream = _Upstream()
+    feed = EventsFeed(upstream)
+    feed.poll()
+    good = feed.current()
+
+    upstream.content = {"status": 0, "error": 5, "events": {}}
+    assert not feed.poll()
+    upstream.error = ConnectionError("timeout")
+    assert not feed.poll()
+    assert feed.current() is good
+    assert feed.stats()["errors"] == 2
+    assert feed.last_error == "ConnectionError: timeout"
+
+
+def test_wait_for_change_wakes_on_a_new_fingerprint():
+    upstream = _Upstream()
+    feed = EventsFeed(upstream)
+    feed.poll()
+    fingerprint = feed.current().fingerprint
+    assert feed.wait_for_change(fingerprint, timeout=0.01).fingerprint == fingerprint
+
+    upstream.content["events"]["seasonal"] = []
+    threading.Timer(0.05, feed.poll).start()
+    assert feed.wait_for_change(fingerprint, timeout=5).fingerprint != fingerprint
+
+
+def test_shared_file_round_trips_and_rereads_only_on_replace(tmp_path):
+    upstream = _Upstream()
+    leader = EventsFeed(upstream)
+    shared = SharedEventsFile(tmp_path / "events.json")
+    leader.subscribe(shared.publish)
+    leader.poll()
+
+    follower = EventsFeed(shared.read)
+    follower.poll()
+    assert follower.current().fingerprint == leader.current().fingerprint
+    assert shared.read() is shared.read()
+
+    upstream.content["events"]["seasonal"] = []
+    leader.poll()
+    assert follower.poll()
+    assert follower.current().fingerprint == leader.current().fingerprint
+
+
+def _read_frame(sock: socket.socket) -> bytes:
+    sock.settimeout(5)
+    data = b""
+    while not data.endswith(b"\n\n"):
+        data += sock.recv(65536)
+    return data
+
+
+def test_hub_pushes_changes_to_every_subscriber():
+    upstream = _Upstream()
+    feed = EventsFeed(upstream)
+    feed.poll()
+    hub = SseHub(feed, keepalive=60).start()
+    try:
+        clients = []
+        for last_event_id in (None, feed.current().fingerprint):
+            server, client = socket.socketpair()
+            assert hub.add(server, last_event_id)
+            clients.append(client)
+        # Only the subscriber without the current fingerprint gets it up front.
+        assert _read_frame(clients[0]) == sse_message(feed.current())
+
+        upstream.content["events"]["features"] = []
+        feed.poll()
+        expected = sse_message(feed.current())
+        assert [_read_frame(client) for client in clients] == [expected, expected]
+
+        clients[0].close()
+        _wait_for(lambda: hub.stats()["disconnected"] == 1)
+        assert hub.stats()["subscribers"] == 1
+    finally:
+        hub.close()
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_hub_drops_stalled_subscribers_and_enforces_the_limit():
+    upstream = _Upstream()
+    feed = EventsFeed(upstream)
+    feed.poll()
+    frame = sse_message(feed.current())
+    hub = SseHub(feed, max_subscribers=2, keepalive=60, max_buffer=len(frame) * 2).start()
+    try:
+        stalled, stalled_client = socket.socketpair()
+        stalled.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        assert hub.add(stalled)
+        healthy, healthy_client = socket.socketpair()
+        assert hub.add(healthy, feed.current().fingerprint)
+        extra, _ = socket.socketpair()
+        assert not hub.add(extra)
+
+        # The stalled client never reads; the healthy one keeps up.
+        for index in range(50):
+            upstream.content["events"]["features"] = [f"feature_{index}"]
+            feed.poll()
+            _read_frame(healthy_client)
+            if hub.stats()["dropped"]:
+                break
+        assert hub.stats()["dropped"] == 1
+        assert hub.stats()["subscribers"] == 1
+        upstream.content["events"]["features"] = ["akhir"]
+        feed.poll()
+        assert b"akhir" in _read_frame(healthy_client)
+    finally:
+        hub.close()
+        stalled_client.close()
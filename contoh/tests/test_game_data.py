@@ -0,0 +1,101 @@
+"""Game data tables: filters, cursors, binary pages and shared buffers."""
+
+from __future__ import annotations
+
+import json
+
+from pyamf import amf3, util
+
+from ninja_sage.game_data import GameData, GameTable, TableSpec
+
+SPEC = TableSpec(
+    "items",
+    "library.json",
+    exact=("type",),
+    flags=("premium",),
+    ranges=("level", "price"),
+    sorts=("id", "name", "level"),
+)
+
+RECORDS = [
+    {"id": "wpn_1", "name": "Kunai", "type": "wpn", "premium": False, "level": 1, "price": 100},
+    {"id": "wpn_2", "name": "Katana Petir", "type": "wpn", "premium": True, "level": 20, "price": 2500.5},
+    {"id": "wpn_10", "name": "Kipas", "type": "wpn", "premium": False, "level": 10, "price": 900},
+    {"id": "back_1", "name": "Gulungan", "type": "back", "premium": True, "level": 5, "price": "500"},
+    {"id": "back_2", "name": "Sayap", "type": "back", "premium": False, "level": 15, "price": True},
+    {"id": "set_1", "name": "Jubah Kage", "type": ["set", "back"], "premium": False},
+]
+
+
+def _table() -> GameTable:
+    return GameTable(SPEC, RECORDS, min_size=1 << 20)
+
+
+def _page(table, binary=False, **params):
+    body = table.page({name: [str(value)] for name, value in params.items()}, binary=binary).body
+    if binary:
+        return amf3.Decoder(util.BufferedByteStream(body)).readElement()
+    return json.loads(body)
+
+
+def _ids(page):
+    return [record["id"] for record in page["results"]]
+
+
+def _all_ids(table, **params):
+    ids, cursor = [], None
+    while True:
+        page = _page(table, **params, **({"cursor": cursor} if cursor else {}))
+        ids += _ids(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_cursor_pages_cover_the_sorted_listing():
+    table = _table()
+    assert _all_ids(table, limit=2) == ["back_1", "back_2", "set_1", "wpn_1", "wpn_2", "wpn_10"]
+    assert _all_ids(table, sort="-name", limit=4) == ["back_2", "wpn_1", "wpn_10", "wpn_2", "set_1", "back_1"]
+    # Records without the field come last.
+    assert _all_ids(table, sort="level", limit=5) == ["wpn_1", "back_1", "wpn_10", "back_2", "wpn_2", "set_1"]
+
+
+def test_filters():
+    table = _table()
+    assert sorted(_ids(_page(table, type="back"))) == ["back_1", "back_2", "set_1"]
+    assert sorted(_ids(_page(table, type="set,wpn", premium="true"))) == ["wpn_2"]
+    # Strings, booleans and missing values never fall inside a range.
+    assert _ids(_page(table, sort="level", min_price=0)) == ["wpn_1", "wpn_10", "wpn_2"]
+    assert _ids(_page(table, min_price=200, max_price=1000)) == ["wpn_10"]
+    assert _ids(_page(table, sort="level", min_level=5, max_level=15)) == ["back_1", "wpn_10", "back_2"]
+
+
+def test_text_search_stays_within_one_record():
+    table = _table()
+    assert sorted(_ids(_page(table, q="KA"))) == ["set_1", "wpn_2"]
+    # The text buffer holds "kunai" directly followed by "katana petir".
+    assert _ids(_page(table, q="ikat")) == []
+    assert _ids(_page(table, q="petir", type="wpn")) == ["wpn_2"]
+
+
+def test_binary_pages_and_records_match_json():
+    table = _table()
+    for params in ({}, {"type": "back"}, {"sort": "-level", "limit": 2}):
+        assert _page(table, binary=True, **params) == _page(table, **params)
+    body = table.record("wpn_10", binary=True).body
+    assert amf3.Decoder(util.BufferedByteStream(body)).readElement() == RECORDS[2]
+    assert json.loads(table.record("set_1").body) == RECORDS[5]
+    assert table.record("nope") is None
+
+
+def test_shared_tables_serve_identical_bodies_without_records():
+    fresh, shared = _table(), _table()
+    data = GameData({"items": shared})
+    assert data.share() > 0
+    assert not hasattr(shared, "_records")
+    for params in ({}, {"type": "back", "sort": "-name"}, {"q": "a", "min_price": 1}, {"limit": 1}):
+        for binary in (False, True):
+            assert _page(shared, binary, **params) == _page(fresh, binary, **params)
+    for record in RECORDS:
+        assert shared.record(record["id"]).body == fresh.record(record["id"]).body
+    assert len(shared) == len(RECORDS)
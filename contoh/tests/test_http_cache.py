@@ -0,0 +1,92 @@
+"""ETags, content negotiation and the compressed body caches."""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+
+import pytest
+
+from ninja_sage.http_cache import (
+    CompressedBodyCache,
+    PrecompressedBody,
+    body_digest,
+    etag_matches,
+    make_etag,
+    negotiate_encoding,
+)
+
+BODY = b'{"status":1,"result":"' + b"ninja " * 400 + b'"}'
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", "gzip"),
+        ("deflate", "deflate"),
+        ("deflate;q=1, gzip;q=0.5", "deflate"),
+        ("gzip;q=0, deflate", "deflate"),
+        ("*;q=0.3", "gzip"),
+        ("*, gzip;q=0", "deflate"),
+        ("GZIP", "gzip"),
+        ("gzip;q=abc", None),
+        ("br, identity", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_etag_matches_any_representation():
+    digest = body_digest(BODY)
+    assert etag_matches(make_etag(digest), digest)
+    assert etag_matches(make_etag(digest, "gzip"), digest)
+    assert etag_matches(f'"lama", W/{make_etag(digest, "deflate")}', digest)
+    assert etag_matches("*", digest)
+    assert not etag_matches('"lama"', digest)
+    assert not etag_matches(None, digest)
+    assert not etag_matches(make_etag(body_digest(b"lain")), digest)
+
+
+@pytest.mark.parametrize("encoding, decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)])
+def test_cache_round_trips_and_reuses_compressed_bodies(encoding, decompress):
+    cache = CompressedBodyCache()
+    first = cache.encode(BODY, encoding)
+    second = cache.encode(BODY, f"{encoding}, identity")
+    assert first.encoding == encoding
+    assert decompress(first.body) == BODY
+    assert second.body is first.body
+    assert first.etag == make_etag(body_digest(BODY), encoding)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_gzip_output_is_deterministic():
+    assert CompressedBodyCache().encode(BODY, "gzip").body == CompressedBodyCache().encode(BODY, "gzip").body
+
+
+def test_small_bodies_are_sent_as_is():
+    encoded = CompressedBodyCache(min_size=1024).encode(b"{}", "gzip")
+    assert (encoded.body, encoded.encoding, encoded.etag) == (b"{}", None, make_etag(body_digest(b"{}")))
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CompressedBodyCache(max_entries=2, min_size=0)
+    bodies = [BODY + bytes([index]) for index in range(3)]
+    for body in bodies:
+        cache.encode(body, "gzip")
+    cache.encode(bodies[0], "gzip")
+    cache.encode(bodies[2], "gzip")
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_precompressed_body_compresses_each_encoding_once():
+    body = PrecompressedBody(BODY)
+    body.warm()
+    gzipped = body.encode("gzip")
+    assert gzip.decompress(gzipped.body) == BODY
+    assert body.encode("gzip").body is gzipped.body
+    assert zlib.decompress(body.encode("deflate").body) == BODY
+    assert body.encode(None).body is BODY
+    assert PrecompressedBody(b"{}").encode("gzip").encoding is None
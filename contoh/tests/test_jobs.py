@@ -0,0 +1,125 @@
+"""Background job queue: deduplication, priorities, retention and shutdown."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ninja_sage.jobs import FAILED, MAX_PRIORITY, QUEUED, SUCCEEDED, JobQueue, QueueFullError
+
+
+def _blocked_queue(**kwargs):
+    """A one-worker queue whose worker is held by a gate job until released."""
+
+    jobs = JobQueue(workers=1, **kwargs)
+    started, release = threading.Event(), threading.Event()
+
+    def gate():
+        started.set()
+        release.wait(5)
+
+    jobs.submit("gate", gate)
+    assert started.wait(5)
+    return jobs, release
+
+
+def test_duplicate_keys_share_the_pending_job():
+    jobs, release = _blocked_queue()
+    first, created = jobs.submit("akun-1", lambda: "hasil")
+    again, created_again = jobs.submit("akun-1", lambda: "lain")
+    running, created_running = jobs.submit("gate", lambda: None)
+    assert (created, created_again, created_running) == (True, False, False)
+    assert again is first and first.status == QUEUED
+
+    release.set()
+    assert first.done.wait(5)
+    assert (first.status, first.result) == (SUCCEEDED, "hasil")
+    # Finished jobs no longer absorb submissions.
+    fresh, created = jobs.submit("akun-1", lambda: "baru")
+    assert created and fresh is not first
+    jobs.shutdown(5)
+
+
+def test_higher_priority_runs_first_and_fifo_within_a_priority():
+    jobs, release = _blocked_queue()
+    order = []
+    submitted = [
+        jobs.submit(name, lambda name=name: order.append(name), priority=priority)[0]
+        for name, priority in (("rendah", -5), ("biasa-1", 0), ("tinggi", 10), ("biasa-2", 0), ("maks", 10**9))
+    ]
+    assert submitted[-1].priority == MAX_PRIORITY
+
+    release.set()
+    jobs.shutdown(5)
+    assert order == ["maks", "tinggi", "biasa-1", "biasa-2", "rendah"]
+    assert all(job.status == SUCCEEDED for job in submitted)
+
+
+def test_failures_are_recorded():
+    jobs = JobQueue(workers=1)
+
+    def boom():
+        raise ValueError("karakter tidak ditemukan")
+
+    job, _ = jobs.submit("x", boom)
+    assert job.done.wait(5)
+    assert (job.status, job.error) == (FAILED, "karakter tidak ditemukan")
+    assert jobs.stats()[FAILED] == 1
+    jobs.shutdown(5)
+
+
+def test_pending_limit():
+    jobs, release = _blocked_queue(max_pending=2)
+    jobs.submit("a", lambda: None)
+    jobs.submit("b", lambda: None)
+    with pytest.raises(QueueFullError):
+        jobs.submit("c", lambda: None)
+    release.set()
+    jobs.shutdown(5)
+
+
+def test_shutdown_drains_accepted_jobs():
+    jobs, release = _blocked_queue()
+    queued = [jobs.submit(index, lambda index=index: index)[0] for index in range(3)]
+    threading.Timer(0.05, release.set).start()
+    jobs.shutdown(5)
+    assert [(job.status, job.result) for job in queued] == [(SUCCEEDED, 0), (SUCCEEDED, 1), (SUCCEEDED, 2)]
+    with pytest.raises(QueueFullError):
+        jobs.submit("terlambat", lambda: None)
+
+
+def test_shutdown_timeout_fails_jobs_left_queued():
+    jobs, release = _blocked_queue()
+    queued, _ = jobs.submit("antre", lambda: "tidak pernah")
+    jobs.shutdown(0.05)
+    assert queued.done.is_set()
+    assert queued.status == FAILED and queued.error
+    release.set()
+    # The running job still finishes, and the cancelled one is never run.
+    assert jobs.get(queued.id).result is None
+
+
+def test_finished_jobs_expire_after_retention():
+    jobs = JobQueue(workers=1, retention=0.05)
+    job, _ = jobs.submit("x", lambda: 1)
+    assert job.done.wait(5)
+    assert jobs.get(job.id) is job
+    time.sleep(0.1)
+    assert jobs.get(job.id) is None
+    jobs.shutdown(5)
+
+
+def test_spooled_jobs_are_visible_to_other_queues(tmp_path):
+    owner = JobQueue(workers=1, spool_dir=tmp_path)
+    other = JobQueue(workers=1, spool_dir=tmp_path)
+    job, _ = owner.submit("x", lambda: {"level": 80})
+    assert job.done.wait(5)
+
+    seen = other.get(job.id)
+    assert seen is not job
+    assert (seen.status, seen.result) == (SUCCEEDED, {"level": 80})
+    assert seen.done.is_set()
+    assert other.get("../../etc/passwd") is None
+    owner.shutdown(5)
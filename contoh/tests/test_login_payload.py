@@ -0,0 +1,34 @@
+"""Login payload: the cached-key factory against the one-shot cipher."""
+
+from __future__ import annotations
+
+from ninja_sage.login_payload import (
+    LoaderInfo,
+    LoginPayloadFactory,
+    encrypt_password,
+    get_random_n_seed,
+    get_specific_item,
+    warm_crypto,
+)
+from ninja_sage.warmup import warm_start
+from ninja_sage.workflow import Credentials, WorkflowConfig
+
+LEVELS = {"hair_10000_1": 3, "hair_10000_0": 7, "accessory_2003": 11}
+SEED, KEY = 123456789, "abcdefghijklmnop"
+
+
+def test_factory_matches_per_login_computation():
+    loader = LoaderInfo()
+    factory = LoginPayloadFactory(SEED, KEY, loader=loader, levels=LEVELS)
+    for password in ("", "hunter22", "p" * 16, "panjang sekali " * 5):
+        components = factory.components("ninja", password)
+        assert components["encrypted_password"] == encrypt_password(password, KEY, SEED)
+        assert components["password_length"] == len(password)
+    assert components["specific_item"] == get_specific_item(loader, SEED, LEVELS)
+    assert components["random_seed"] == get_random_n_seed(SEED, loader)
+
+
+def test_codec_warmup_step_uses_the_public_hook():
+    warm_crypto()
+    report = warm_start(WorkflowConfig(credentials=Credentials("ninja", "rahasia")), steps=("codec",))
+    assert report.ok and [step.name for step in report.steps] == ["codec"]
@@ -0,0 +1,65 @@
+"""ResponseCache must only store successful game answers."""
+
+from __future__ import annotations
+
+from pyamf import remoting
+
+from ninja_sage import mock_data
+from ninja_sage.amf_utils import encode_envelope
+from ninja_sage.middleware import AmfCall, ResponseCache
+
+
+def _response(body) -> bytes:
+    envelope = remoting.Envelope(amfVersion=3)
+    envelope["/1/onResult"] = remoting.Response(body)
+    return encode_envelope(envelope)
+
+
+def _call(target: str = "SystemLogin.checkVersion") -> AmfCall:
+    return AmfCall(url="http://upstream/amf", target=target, payload=b"req", headers={}, timeout=5.0)
+
+
+def _upstream(*bodies):
+    calls = []
+
+    def _handler(call: AmfCall) -> bytes:
+        calls.append(call)
+        return _response(bodies[min(len(calls), len(bodies)) - 1])
+
+    return _handler, calls
+
+
+def test_successful_body_is_cached():
+    handler, calls = _upstream(mock_data.check_version())
+    cache = ResponseCache()
+    first = cache(_call(), handler)
+    assert cache(_call(), handler) == first
+    assert len(calls) == 1
+
+
+def test_error_body_is_not_cached():
+    maintenance = {"status": 0, "error": 1, "result": "Server sedang maintenance"}
+    handler, calls = _upstream(maintenance, mock_data.check_version())
+    cache = ResponseCache()
+    cache(_call(), handler)
+    cache(_call(), handler)
+    assert len(calls) == 2
+    # The good answer that followed is the one kept.
+    cache(_call(), handler)
+    assert len(calls) == 2
+
+
+def test_error_status_message_is_not_cached():
+    envelope = remoting.Envelope(amfVersion=3)
+    envelope["/1/onStatus"] = remoting.Response({"status": 1}, status=remoting.STATUS_ERROR)
+    content = encode_envelope(envelope)
+    calls = []
+
+    def _handler(call: AmfCall) -> bytes:
+        calls.append(call)
+        return content
+
+    cache = ResponseCache()
+    cache(_call("EventsService.get"), _handler)
+    cache(_call("EventsService.get"), _handler)
+    assert len(calls) == 2
@@ -0,0 +1,9 @@
+"""ninja_sage.models must re-export exactly what the model modules export."""
+
+from __future__ import annotations
+
+from benchmarks.import_time import lazy_export_problems
+
+
+def test_lazy_model_map_matches_module_all():
+    assert lazy_export_problems() == []
@@ -0,0 +1,61 @@
+"""Sparse fieldsets over the response models."""
+
+from __future__ import annotations
+
+import pytest
+
+from ninja_sage import mock_data
+from ninja_sage.models import GetAllCharactersResponse, WorkflowResult
+from ninja_sage.projection import ProjectionError, compile_projection
+
+
+def _characters() -> GetAllCharactersResponse:
+    return GetAllCharactersResponse.from_content(mock_data.all_characters(1001, count=3))
+
+
+def test_paths_traverse_lists():
+    response = _characters()
+    projected = compile_projection("tokens, characters.name,characters.level", GetAllCharactersResponse).apply(response)
+    assert projected == {
+        "tokens": response.tokens,
+        "characters": [{"name": char.name, "level": char.level} for char in response.characters],
+    }
+
+
+def test_a_parent_path_selects_the_whole_value():
+    response = _characters()
+    projection = compile_projection("characters,characters.name", GetAllCharactersResponse)
+    assert projection.apply(response)["characters"] is response.characters
+
+
+def test_select_narrows_to_one_top_level_field():
+    projection = compile_projection("characters.characters.name,login.status", WorkflowResult)
+    characters = projection.select("characters")
+    assert characters.apply(_characters()) == {"characters": [{"name": c.name} for c in _characters().characters]}
+    assert projection.select("events") is None
+    # A field selected without sub-paths is passed through untouched.
+    response = _characters()
+    assert compile_projection("characters", WorkflowResult).select("characters").apply(response) is response
+
+
+@pytest.mark.parametrize(
+    "fields, message",
+    [
+        ("characters.characters.nama", "characters.characters.nama"),
+        ("character_data.character.xpp", "character_data.character.xpp"),
+        ("versi", "versi"),
+    ],
+)
+def test_unknown_paths_are_rejected_with_the_full_path(fields, message):
+    with pytest.raises(ProjectionError, match=message):
+        compile_projection(fields, WorkflowResult)
+
+
+@pytest.mark.parametrize("fields", ["", " , ", "characters..name", "characters."])
+def test_malformed_expressions_are_rejected(fields):
+    with pytest.raises(ProjectionError):
+        compile_projection(fields, WorkflowResult)
+
+
+def test_compiled_plans_are_cached():
+    assert compile_projection("login.status", WorkflowResult) is compile_projection("login.status", WorkflowResult)
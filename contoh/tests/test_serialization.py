@@ -0,0 +1,70 @@
+"""JSON serialisation of the response models without ``dataclasses.asdict``."""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime as dt
+import json
+
+import pytest
+from pyamf import ASObject, amf3
+
+from ninja_sage import mock_data
+from ninja_sage.models import GetAllCharactersResponse, GetCharacterDataResponse
+from ninja_sage.serialization import dumps, dumps_bytes, to_builtins
+
+
+def _models():
+    return [
+        GetAllCharactersResponse.from_content(mock_data.all_characters(1001)),
+        GetCharacterDataResponse.from_content(mock_data.character_data(1004260)),
+    ]
+
+
+def _has_raw(value) -> bool:
+    if isinstance(value, dict):
+        return "raw" in value or any(_has_raw(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_raw(item) for item in value)
+    return False
+
+
+@pytest.mark.parametrize("model", _models(), ids=lambda model: type(model).__name__)
+def test_matches_asdict(model):
+    assert json.loads(dumps(model)) == json.loads(json.dumps(dataclasses.asdict(model), default=str))
+    assert json.loads(dumps_bytes(model).decode("utf-8")) == to_builtins(model)
+
+
+@pytest.mark.parametrize("model", _models(), ids=lambda model: type(model).__name__)
+def test_exclude_raw_drops_raw_at_every_level(model):
+    assert _has_raw(to_builtins(model))
+    assert not _has_raw(to_builtins(model, exclude_raw=True))
+    assert json.loads(dumps(model, exclude_raw=True)) == to_builtins(model, exclude_raw=True)
+
+
+def test_amf_leftovers_are_converted():
+    byte_array = amf3.ByteArray()
+    byte_array.write(b"\x00\x01")
+    value = {
+        "bytes": b"\xff",
+        "byte_array": byte_array,
+        "when": dt.datetime(2026, 1, 2, 3, 4, 5),
+        "object": ASObject({"nama": "Naruto"}),
+        "tuple": (1, 2),
+        "set": frozenset({3}),
+    }
+    expected = {
+        "bytes": "/w==",
+        "byte_array": "AAE=",
+        "when": "2026-01-02T03:04:05",
+        "object": {"nama": "Naruto"},
+        "tuple": [1, 2],
+        "set": [3],
+    }
+    assert json.loads(dumps(value)) == expected
+    assert to_builtins(value) == expected
+
+
+def test_unknown_objects_are_rejected():
+    with pytest.raises(TypeError):
+        dumps({"x": object()})
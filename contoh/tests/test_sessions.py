@@ -0,0 +1,81 @@
+"""Session pool strategies and one client shared across threads."""
+
+from __future__ import annotations
+
+import threading
+
+import requests
+from pyamf import remoting
+
+from ninja_sage.amf_utils import decode_amf_bytes, encode_envelope
+from ninja_sage.client import NinjaSageClient
+from ninja_sage.response_utils import extract_first_body
+from ninja_sage.sessions import SessionPool
+
+
+def _on_thread(fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start()
+    thread.join(5)
+    return result[0]
+
+
+def test_shared_strategy_hands_out_one_session():
+    pool = SessionPool()
+    assert pool.current() is pool.current()
+    assert _on_thread(pool.current) is pool.current()
+    assert pool.current().verify is False
+
+
+def test_per_thread_sessions_share_the_adapter():
+    pool = SessionPool(per_thread=True, pool_maxsize=8, max_retries=2)
+    mine, other = pool.current(), _on_thread(pool.current)
+    assert mine is pool.current() and mine is not other
+    assert mine.get_adapter("https://play.ninjasage.id") is other.get_adapter("http://x") is pool.adapter
+    assert pool.adapter.max_retries.connect == 2 and pool.adapter.max_retries.read == 0
+
+
+def test_a_given_session_is_used_as_is():
+    session = requests.Session()
+    pool = SessionPool(session=session, per_thread=True, verify=True)
+    assert not pool.per_thread
+    assert _on_thread(pool.current) is session and session.verify is True
+
+
+def test_close_closes_every_session_handed_out():
+    pool = SessionPool(per_thread=True)
+    sessions = [pool.current(), _on_thread(pool.current)]
+    closed = []
+    for session in sessions:
+        session.close = lambda session=session: closed.append(session)
+    pool.close()
+    assert all(any(session is seen for seen in closed) for session in sessions)
+
+
+class _EchoTransport:
+    def post(self, url, payload, *, target, headers, timeout):
+        request = extract_first_body(decode_amf_bytes(payload))
+        envelope = remoting.Envelope(amfVersion=3)
+        envelope["/1/onResult"] = remoting.Response({"status": 1, "echo": request})
+        return encode_envelope(envelope)
+
+    def fetch(self, url):  # pragma: no cover - not used
+        raise AssertionError(url)
+
+
+def test_one_client_serves_many_threads():
+    client = NinjaSageClient(transport=_EchoTransport())
+    answers = {}
+
+    def worker(index):
+        for call in range(20):
+            body = extract_first_body(client.invoke("CharacterDAO.getCharacterData", [index, call]))
+            answers.setdefault(index, []).append(body["echo"])
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert answers == {index: [[index, call] for call in range(20)] for index in range(8)}
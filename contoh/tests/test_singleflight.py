@@ -0,0 +1,174 @@
+"""Single-flight coalescing and the TTL cache."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ninja_sage.singleflight import SingleFlight, TTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _start(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_for(condition) -> None:
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "hasil"
+
+    threads = [_start(lambda: results.append(flight.do("k", slow)))]
+    _wait_for(lambda: flight.in_flight("k"))
+    threads += [_start(lambda: results.append(flight.do("k", slow))) for _ in range(4)]
+    _wait_for(lambda: flight._calls["k"].waiters == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert sorted(results) == [("hasil", False)] + [("hasil", True)] * 4
+    assert not flight.in_flight("k")
+    # Once finished, the next call runs again.
+    assert flight.do("k", lambda: "baru") == ("baru", False)
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError("upstream mati")
+
+    def call():
+        try:
+            flight.do("k", failing)
+        except RuntimeError as exc:
+            errors.append(str(exc))
+
+    threads = [_start(call)]
+    _wait_for(lambda: flight.in_flight("k"))
+    threads += [_start(call) for _ in range(2)]
+    _wait_for(lambda: flight._calls["k"].waiters == 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ["upstream mati"] * 3
+    assert not flight.in_flight("k")
+
+
+def test_fresh_then_stale_then_expired():
+    clock = _Clock()
+    cache = TTLCache(ttl=5, stale_ttl=10, clock=clock)
+    loads = []
+
+    def loader():
+        loads.append(clock.now)
+        return len(loads)
+
+    assert cache.get_or_load("k", loader) == 1
+    clock.now = 4
+    assert cache.get_or_load("k", loader) == 1
+    assert cache.stats.hits == 1
+
+    # Stale: the old value is served while one refresh runs in the background.
+    clock.now = 6
+    assert cache.get_or_load("k", loader) == 1
+    _wait_for(lambda: cache.stats.refreshes == 1)
+    assert cache.peek("k") == 2
+
+    clock.now = 100
+    assert cache.peek("k") is None
+    assert cache.get_or_load("k", loader) == 3
+    assert cache.stats.misses == 2
+
+
+def test_failed_load_is_not_cached():
+    cache = TTLCache(ttl=5)
+
+    def failing():
+        raise RuntimeError("gagal")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", failing)
+    assert len(cache) == 0
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
+
+
+def test_zero_ttl_only_coalesces():
+    cache = TTLCache(ttl=0)
+    cache.put("k", "v")
+    assert cache.peek("k") is None
+    assert cache.get_or_load("k", lambda: "baru") == "baru"
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("key", ["k", None])
+def test_invalidate_drops_a_load_already_in_flight(key):
+    cache = TTLCache(ttl=60)
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def old_loader():
+        started.set()
+        release.wait(5)
+        return "lama"
+
+    thread = _start(lambda: results.append(cache.get_or_load("k", old_loader)))
+    assert started.wait(5)
+    cache.invalidate(key)
+    release.set()
+    thread.join(5)
+
+    # The caller still gets its value, but it is not stored.
+    assert results == ["lama"]
+    assert cache.peek("k") is None
+    assert cache.get_or_load("k", lambda: "baru") == "baru"
+    assert cache.peek("k") == "baru"
+
+
+def test_invalidating_another_key_keeps_the_load():
+    cache = TTLCache(ttl=60)
+    started, release = threading.Event(), threading.Event()
+
+    def loader():
+        started.set()
+        release.wait(5)
+        return "nilai"
+
+    thread = _start(cache.get_or_load, "k", loader)
+    assert started.wait(5)
+    cache.invalidate("lain")
+    release.set()
+    thread.join(5)
+
+    assert cache.peek("k") == "nilai"
+    assert not cache._loading and not cache._invalidated
@@ -0,0 +1,109 @@
+"""Character snapshot history: delta encoding, reconstruction and compaction."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from ninja_sage import mock_data
+from ninja_sage.models import GetCharacterDataResponse
+from ninja_sage.serialization import to_builtins
+from ninja_sage.snapshots import SnapshotStore, flatten, unflatten
+
+CHAR_ID = 1004260
+BASE = mock_data.character_data(CHAR_ID)
+
+
+def _response(step: int) -> GetCharacterDataResponse:
+    content = copy.deepcopy(BASE)
+    content["character_data"]["character_xp"] += 100 * (step // 2)
+    content["character_data"]["character_gold"] += 7 * step
+    if step % 5 == 3:
+        # Paths that disappear and come back exercise the "del" part of a delta.
+        content.pop("clan", None)
+    return GetCharacterDataResponse.from_content(content)
+
+
+def _expected(response: GetCharacterDataResponse):
+    return unflatten(flatten(to_builtins(response, exclude_raw=True)))
+
+
+def _store(tmp_path, **kwargs) -> SnapshotStore:
+    return SnapshotStore(tmp_path / "snapshots.sqlite", clock=lambda: 20_000.0, **kwargs)
+
+
+def _fill(store, times):
+    responses = {}
+    for step, taken_at in enumerate(times):
+        responses[taken_at] = _response(step)
+        store.append(responses[taken_at], taken_at=taken_at)
+    return responses
+
+
+def test_flatten_round_trip():
+    value = {"a": {"b": 1, "c": {"d": [1, 2]}}, "e": {}, "f": None}
+    assert flatten(value) == {"a.b": 1, "a.c.d": [1, 2], "e": {}, "f": None}
+    assert unflatten(flatten(value)) == value
+
+
+def test_append_stores_keyframes_deltas_and_skips_unchanged(tmp_path):
+    store = _store(tmp_path, keyframe_interval=3)
+    kinds = [store.append(_response(step), taken_at=float(t)) for t, step in enumerate((0, 1, 1, 2, 3, 4))]
+    assert kinds == ["keyframe", "delta", "unchanged", "delta", "keyframe", "delta"]
+    assert store.stats()["snapshots"] == 5
+    assert store.stats()["keyframes"] == 2
+    assert store.series(CHAR_ID, ("gold",))[1] == {"t": 1.0, "until": 2.0, "gold": _response(1).character.gold}
+
+
+def test_state_at_rebuilds_every_point(tmp_path):
+    store = _store(tmp_path, keyframe_interval=4)
+    responses = _fill(store, [float(t) for t in range(0, 1000, 100)])
+    for taken_at, response in responses.items():
+        state = store.state_at(CHAR_ID, taken_at + 50)
+        assert state == {"taken_at": taken_at, "data": _expected(response)}
+    assert store.state_at(CHAR_ID, -1) is None
+    assert store.state_at(CHAR_ID)["taken_at"] == 900.0
+
+
+def test_other_writers_continue_the_delta_chain(tmp_path):
+    first = _store(tmp_path)
+    _fill(first, [0.0, 1.0])
+    second = _store(tmp_path)
+    assert second.append(_response(7), taken_at=2.0) == "delta"
+    assert first.append(_response(8), taken_at=3.0) == "delta"
+    assert first.state_at(CHAR_ID, 2.0)["data"] == _expected(_response(7))
+    assert second.state_at(CHAR_ID)["data"] == _expected(_response(8))
+
+
+def test_compaction_keeps_the_last_snapshot_per_bucket(tmp_path):
+    store = _store(tmp_path, keyframe_interval=5)
+    times = [float(t) for t in range(0, 12_000, 600)]
+    responses = _fill(store, times)
+    # The first row after the cutoff is a delta: the rewritten rows must keep its base state.
+    assert store.stats()["keyframes"] == 4 and times[12] == 7_200
+
+    report = store.compact(older_than=20_000 - 7_200, resolution=3_600)
+    # Rows before 7200 s: one survivor per hour (3000 s and 6600 s).
+    assert (report.characters, report.removed, report.kept) == (1, 10, 2)
+    remaining = [point["t"] for point in store.series(CHAR_ID, ("xp",))]
+    assert remaining == [3_000.0, 6_600.0] + [t for t in times if t >= 7_200]
+
+    for taken_at in remaining:
+        assert store.state_at(CHAR_ID, taken_at)["data"] == _expected(responses[taken_at])
+    # Removed points now resolve to the survivor before them.
+    assert store.state_at(CHAR_ID, 4_000)["taken_at"] == 3_000.0
+    # Appending after compaction builds on the rewritten chain.
+    store.append(_response(99), taken_at=12_000.0)
+    assert store.state_at(CHAR_ID)["data"] == _expected(_response(99))
+    assert store.compact(older_than=20_000 - 7_200, resolution=3_600).removed == 0
+
+
+def test_series_buckets_and_validates_metrics(tmp_path):
+    store = _store(tmp_path)
+    _fill(store, [float(t) for t in range(0, 1000, 100)])
+    points = store.series(CHAR_ID, ("level", "gold"), step=500)
+    assert [point["t"] for point in points] == [400.0, 900.0]
+    assert store.series(CHAR_ID, since=300, until=500, limit=5)[0]["t"] == 300.0
+    with pytest.raises(ValueError):
+        store.series(CHAR_ID, ("hp",))
@@ -0,0 +1,118 @@
+"""Record/replay transports and the asset transport switch."""
+
+from __future__ import annotations
+
+import pytest
+from pyamf import remoting
+
+from ninja_sage import mock_data
+from ninja_sage.amf_utils import encode_envelope
+from ninja_sage.client import NinjaSageClient
+from ninja_sage.response_utils import extract_first_body
+from ninja_sage.transport import (
+    RecordingTransport,
+    ReplayMissError,
+    ReplayTransport,
+    fetch_asset,
+    load_manifest,
+    set_asset_transport,
+)
+
+URL = "https://play.ninjasage.id/amf"
+
+
+class _Upstream:
+    """Answers every call with a numbered body."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def post(self, url, payload, *, target, headers, timeout):
+        self.calls.append((target, payload))
+        return f"{target}#{len(self.calls)}".encode()
+
+    def fetch(self, url):
+        self.calls.append((None, url))
+        return b"asset:" + url.encode()
+
+
+def _post(transport, payload: bytes, target: str | None) -> bytes:
+    return transport.post(URL, payload, target=target, headers={}, timeout=5)
+
+
+def _record(capture_dir):
+    recorder = RecordingTransport(_Upstream(), capture_dir)
+    _post(recorder, b"versi", "SystemLogin.checkVersion")
+    _post(recorder, b"char-1", "CharacterDAO.getCharacterData")
+    _post(recorder, b"char-2", "CharacterDAO.getCharacterData")
+    recorder.fetch("https://ns-assets.ninjasage.id/static/lib/library.bin")
+    return recorder
+
+
+def test_recording_writes_manifest_and_bodies(tmp_path):
+    _record(tmp_path)
+    entries = load_manifest(tmp_path)
+    assert [(entry.seq, entry.kind, entry.target) for entry in entries] == [
+        (1, "amf", "SystemLogin.checkVersion"),
+        (2, "amf", "CharacterDAO.getCharacterData"),
+        (3, "amf", "CharacterDAO.getCharacterData"),
+        (4, "asset", None),
+    ]
+    assert (tmp_path / entries[1].request_file).read_bytes() == b"char-1"
+    assert (tmp_path / entries[1].response_file).read_bytes() == b"CharacterDAO.getCharacterData#2"
+
+    # A second recorder appends after the existing sequence numbers.
+    recorder = RecordingTransport(_Upstream(), tmp_path)
+    _post(recorder, b"lagi", "EventsService.get")
+    assert [entry.seq for entry in load_manifest(tmp_path)] == [1, 2, 3, 4, 5]
+
+
+def test_replay_matches_exact_requests_then_cycles_by_target(tmp_path):
+    _record(tmp_path)
+    replay = ReplayTransport(tmp_path)
+
+    assert _post(replay, b"char-2", "CharacterDAO.getCharacterData") == b"CharacterDAO.getCharacterData#3"
+    # Unknown bytes fall back to the target's recordings in order, wrapping around.
+    bodies = [_post(replay, b"lain", "CharacterDAO.getCharacterData") for _ in range(3)]
+    assert bodies == [
+        b"CharacterDAO.getCharacterData#2",
+        b"CharacterDAO.getCharacterData#3",
+        b"CharacterDAO.getCharacterData#2",
+    ]
+    assert replay.fetch("https://ns-assets.ninjasage.id/static/lib/library.bin").startswith(b"asset:")
+
+
+def test_replay_misses_raise(tmp_path):
+    _record(tmp_path)
+    replay = ReplayTransport(tmp_path)
+    with pytest.raises(ReplayMissError):
+        _post(replay, b"versi", "EventsService.get")
+    with pytest.raises(ReplayMissError):
+        replay.fetch("https://ns-assets.ninjasage.id/static/lib/skills.bin")
+
+
+def test_asset_transport_can_be_swapped_and_restored(tmp_path):
+    _record(tmp_path)
+    previous = set_asset_transport(ReplayTransport(tmp_path))
+    try:
+        assert fetch_asset("https://ns-assets.ninjasage.id/static/lib/library.bin").startswith(b"asset:")
+    finally:
+        replay = set_asset_transport(previous)
+    assert isinstance(replay, ReplayTransport)
+
+
+class _AmfUpstream(_Upstream):
+    def post(self, url, payload, *, target, headers, timeout):
+        super().post(url, payload, target=target, headers=headers, timeout=timeout)
+        envelope = remoting.Envelope(amfVersion=3)
+        envelope["/1/onResult"] = remoting.Response(mock_data.check_version())
+        return encode_envelope(envelope)
+
+
+def test_client_session_replays_offline(tmp_path):
+    upstream = _AmfUpstream()
+    recorded = NinjaSageClient(transport=RecordingTransport(upstream, tmp_path)).invoke("SystemLogin.checkVersion")
+
+    replayed = NinjaSageClient(transport=ReplayTransport(tmp_path)).invoke("SystemLogin.checkVersion")
+    assert extract_first_body(replayed) == extract_first_body(recorded) == mock_data.check_version()
+    assert len(upstream.calls) == 1
@@ -35,6 +35,12 @@ class Amf3 {
     return _readBody(reader);
   }
 
+  /// Decode a single bare AMF3 value (e.g. an `application/x-amf` response
+  /// from `contoh/api_server.py`).
+  static Object? decodeValue(Uint8List data) {
+    return _Amf3Reader(data).readObject();
+  }
+
   static void _readHeader(_Amf3Reader reader) {
     reader.readUtf(); // name
     reader.read(); // mustUnderstand
@@ -398,9 +404,9 @@ class _Amf3Reader {
     final b5 = read();
     final b6 = read();
     final b7 = read();
-    final bytes = Uint8List.fromList([b7, b6, b5, b4, b3, b2, b1, b0]);
-    final bd = ByteData.view(bytes.buffer);
-    return bd.getFloat64(0, Endian.big);
+    // AMF writes IEEE 754 doubles big-endian: keep the stream order.
+    final bytes = Uint8List.fromList([b0, b1, b2, b3, b4, b5, b6, b7]);
+    return ByteData.sublistView(bytes).getFloat64(0, Endian.big);
   }
 
   Object? _readDate() {
@@ -465,8 +471,9 @@ class _Amf3Reader {
       case Amf3.trueType:
         return true;
       case Amf3.integerType:
+        // Signed 29-bit U29: bit 28 is the sign bit.
         final temp = readUInt29();
-        return (temp << 3) >> 3;
+        return temp >= 0x10000000 ? temp - 0x20000000 : temp;
       case Amf3.doubleType:
         return _readDouble();
       case Amf3.undefinedType:
@@ -1,6 +1,7 @@
 import 'dart:convert';
 
 import 'package:http/http.dart' as http;
+import 'package:panel_app/amf/amf3.dart';
 import 'package:panel_app/services/ninja_sage_client.dart';
 
 /// Implementasi NinjaSageClient yang berkomunikasi dengan
@@ -8,8 +9,13 @@ import 'package:panel_app/services/ninja_sage_client.dart';
 class HttpNinjaSageClient implements NinjaSageClient {
   final Uri baseUri;
 
+  /// Minta response AMF3 (`Accept: application/x-amf`) alih-alih JSON;
+  /// lebih kecil dan lebih cepat di-parse untuk list besar.
+  final bool useAmf3;
+
   HttpNinjaSageClient({
     String baseUrl = 'http://127.0.0.1:8080',
+    this.useAmf3 = false,
   }) : baseUri = Uri.parse(baseUrl);
 
   @override
@@ -21,13 +27,21 @@ class HttpNinjaSageClient implements NinjaSageClient {
     // sehingga semua pemanggilan diarahkan ke /api/characters.
     if (target == 'SystemLogin.getAllCharacters') {
       final uri = baseUri.replace(path: '/api/characters');
-      final resp = await http.get(uri);
+      final resp = await http.get(
+        uri,
+        headers: useAmf3 ? const {'Accept': 'application/x-amf'} : null,
+      );
       if (resp.statusCode != 200) {
         throw Exception(
           'Gagal memuat karakter (status ${resp.statusCode})',
         );
       }
-      final decoded = json.decode(resp.body);
+      final isAmf3 =
+          resp.headers['content-type']?.startsWith('application/x-amf') ??
+              false;
+      final decoded = isAmf3
+          ? Amf3.decodeValue(resp.bodyBytes)
+          : json.decode(resp.body);
       if (decoded is Map<String, dynamic>) {
         return decoded;
       }